@@ -1,7 +1,6 @@
 # Author(s): Dr. Patrick Lemoine
 # Sun Tzu Military Campaign Simulator
 
-import random
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter.scrolledtext import ScrolledText
@@ -9,6 +8,9 @@ from datetime import datetime
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import openpyxl
+from mcs_core.eras import ANCIENT
+from mcs_core.rng import CampaignRNG
+from mcs_core.logsink import TextLogSink
 
 class CampaignSimulatorGUI:
     def __init__(self, root):
@@ -18,6 +20,8 @@ class CampaignSimulatorGUI:
         # Scrollable text area for logs
         self.log_text = ScrolledText(root, state='disabled', width=100, height=20, wrap='word')
         self.log_text.pack(padx=10, pady=5)
+        # The campaign runs inside the button callback: let the sink process input on every flush
+        self.log_sink = TextLogSink(root, self.log_text, process_events=True)
 
         # Plot area
         self.fig = Figure(figsize=(8, 4), dpi=100)
@@ -47,23 +51,23 @@ class CampaignSimulatorGUI:
         self.export_button = tk.Button(control_frame, text="Export Excel Report", command=self.export_excel, state='disabled')
         self.export_button.grid(row=0, column=4, padx=5)
 
+        tk.Label(control_frame, text="Seed (optional):").grid(row=1, column=0, padx=5)
+        self.seed_var = tk.StringVar(value="")
+        self.seed_entry = tk.Entry(control_frame, width=12, textvariable=self.seed_var)
+        self.seed_entry.grid(row=1, column=1)
+        self.rng = CampaignRNG()
+
         self.logs = []  # Log messages list
         self.sim_data = []  # Simulation data per turn
     
     def log(self, message):
         """Append a message to the log area."""
         self.logs.append(message)
-        self.log_text.configure(state='normal')
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.configure(state='disabled')
-        self.root.update()
+        self.log_sink.write(message)
     
     def clear_logs_graph(self):
         """Clear log messages and reset the graph."""
-        self.log_text.configure(state='normal')
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.configure(state='disabled')
+        self.log_sink.clear()
         self.logs.clear()
         self.sim_data.clear()
         self.ax.clear()
@@ -173,26 +177,8 @@ class CampaignSimulatorGUI:
 
     def terrain_types_actions(self, terrain):
         self.log("\n--- V. Terrain Types & Actions ---")
-        terrain_actions = {
-            "accessible": "Occupy heights before enemy, protect supply.",
-            "entangling": "Exit if enemy caught off guard.",
-            "temporizing": "Do not camp, feign retreat.",
-            "narrow passes": "Occupy positions, avoid enemy pursuit.",
-            "distant positions": "Disadvantageous combat.",
-            "dispersive": "Do not fight, unity of heart.",
-            "easy": "No camp, maintain communication.",
-            "contentious": "Attack if first possession, defend actively, use tricks.",
-            "open": "Ally, maintain goodwill of neighbors.",
-            "serious": "Ensure continuous supply.",
-            "difficult": "No camping, rapid movement.",
-            "hemmed-in": "Use stratagems, block exits, force fight to death.",
-            "desperate": "Fight without hesitation, show desperation.",
-            "salt marshes": "Quick passage near water.",
-            "flat dry land": "Good position, danger ahead, safety behind.",
-            "night battle": "Use fire and drum signals.",
-            "day battle": "Use flags and banners."
-        }
-        act = terrain_actions.get(terrain.lower(), "Unknown terrain or no specific action.")
+        # Advice per terrain from the rule file of the ancient era (mcs_core/data/ancient_rules.json)
+        act = ANCIENT.rules.advice.get(terrain.lower(), "Unknown terrain or no specific action.")
         self.log(f"Terrain '{terrain}': {act}")
         return [act]
 
@@ -241,9 +227,7 @@ class CampaignSimulatorGUI:
 
     def run_simulation(self):
         # Reset logs and data
-        self.log_text.configure(state='normal')
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.configure(state='disabled')
+        self.log_sink.clear()
         self.logs.clear()
         self.sim_data.clear()
         self.export_button.config(state='disabled')
@@ -256,7 +240,17 @@ class CampaignSimulatorGUI:
             messagebox.showerror("Error", "Invalid number of turns, enter a positive integer.")
             return
 
-        self.log("=== Starting Advanced Military Campaign Simulation ===")
+        seed = self.seed_var.get().strip()
+        try:
+            seed = int(seed) if seed else None
+            if seed is not None and seed < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Invalid seed, enter a non-negative integer or leave it empty.")
+            return
+        self.rng.seed(seed)
+        env, ai, combat = self.rng.environment, self.rng.ai, self.rng.combat
+        self.log(f"=== Starting Advanced Military Campaign Simulation (seed entropy {self.rng.entropy}) ===")
 
         # Initial states
         morale = 0.7
@@ -264,7 +258,7 @@ class CampaignSimulatorGUI:
         fatigue = 0.0
         supply = 1.0
         enemy_forces = 9500
-        terrain = random.choice([
+        terrain = env.choice([
             "accessible", "entangling", "temporizing", "contentious",
             "hemmed-in", "desperate", "difficult", "open"
         ])
@@ -277,8 +271,8 @@ class CampaignSimulatorGUI:
         for turn in range(1, turns + 1):
             self.log(f"\n--- Turn {turn} ---")
 
-            heaven = random.choice([True, False])
-            fatigue += random.uniform(0.05, 0.15)
+            heaven = env.choice([True, False])
+            fatigue += env.uniform(0.05, 0.15)
             fatigue = min(fatigue, 1.0)
 
             if supply < 0.5:
@@ -300,8 +294,8 @@ class CampaignSimulatorGUI:
             }
             victory_prev, actions_I = self.general_planning_preparation(factors, military)
 
-            enemy_confident = random.choice([True, False])
-            enemy_angry = random.choice([True, False])
+            enemy_confident = ai.choice([True, False])
+            enemy_angry = ai.choice([True, False])
             enemy_force_superior = enemy_forces > forces
 
             actions_II = self.strategic_engagement_deception(enemy_force_superior, enemy_confident, enemy_angry)
@@ -309,33 +303,33 @@ class CampaignSimulatorGUI:
             force_ratio = forces / enemy_forces if enemy_forces > 0 else float('inf')
             actions_III = self.numerical_superiority_response(force_ratio)
 
-            general_faults = random.choice([True, False])
+            general_faults = ai.choice([True, False])
             notes_IV = self.generals_authority_soldier_morale(sovereign_interfering, fatigue > 0.6, general_competent, general_faults)
 
             actions_V = self.terrain_types_actions(terrain)
 
             prepared = supply > 0.4 and fatigue < 0.7
             season_favorable = heaven
-            wind_favorable = random.choice([True, False])
+            wind_favorable = env.choice([True, False])
             attack_fire_done, actions_VI = self.attack_by_fire(prepared, season_favorable, wind_favorable)
 
             spying_done, actions_VII = self.use_of_spies(spy_budget, enemy_info, spy_classes)
 
             # Logistics: supply consumption and fatigue effect
-            supply_expense = random.uniform(0.07, 0.15) + fatigue * 0.05
+            supply_expense = env.uniform(0.07, 0.15) + fatigue * 0.05
             supply -= supply_expense
             supply = max(0, min(supply, 1))
 
             # Simulate losses and morale changes
             if victory_prev and not enemy_force_superior:
-                enemy_losses = random.randint(300, 700)
+                enemy_losses = combat.randint(300, 700)
                 enemy_forces = max(0, enemy_forces - enemy_losses)
                 morale_gain = 0.05 + (supply - 0.5) * 0.1
                 morale = min(1, morale + max(0, morale_gain - fatigue * 0.2))
                 self.log(f"Your army inflicted {enemy_losses} losses on the enemy.")
                 self.log(f"Morale rises to {morale:.2f}.")
             else:
-                losses = random.randint(400, 900)
+                losses = combat.randint(400, 900)
                 forces = max(0, forces - losses)
                 morale_loss = 0.1 + fatigue * 0.2
                 morale = max(0, morale - morale_loss)
@@ -371,6 +365,7 @@ class CampaignSimulatorGUI:
         else:
             self.log("Campaign lost or suspended.")
         
+        self.log_sink.flush()
         self.export_button.config(state='normal')
 
 
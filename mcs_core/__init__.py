@@ -0,0 +1,8 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - headless simulation core
+
+from .state import UnitType, EnhancedEnemyAI, CampaignState
+from .advisors import ChessSunTzuAI, GoSunTzuAI
+from .rules import Rules, load_rules
+from .eras import Era, ANCIENT, MODERN, ERAS
+from .engine import CampaignEngine, parse_recruit_dist, advisor_names, UNIT_ORDER, DEFAULT_RECRUIT_DIST
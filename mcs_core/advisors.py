@@ -0,0 +1,130 @@
+# Author(s): Dr. Patrick Lemoine AI/Go/Chess integration:
+# Sun Tzu Campaign Simulator - Chess & Go strategic advisors
+
+import random
+
+from .lookahead import TurnModel, ExpectimaxSearch, Position, DEFENSIVE_ACTIONS
+from .territory import TerritoryGrid
+
+class Recommendation(str):
+    """Advice text that also carries the searched action, its expected value and the search statistics."""
+
+    def __new__(cls, text, action=None, value=None, stats=None):
+        rec = super().__new__(cls, text)
+        rec.action = action
+        rec.value = value
+        rec.stats = stats or {}
+        return rec
+
+class ChessSunTzuAI:
+    ACTION_ADVICE = {
+        "concentrate": "Concentrate your forces in central or open areas to dominate the battlefield and control the terrain.",
+        "fortify": "Protect vulnerable units and fortify positions to absorb the enemy's attack.",
+        "retreat": "Avoid direct confrontation and prepare a strategic retreat to preserve your forces.",
+        "feint": "Feign a retreat or sacrifice a small force to lure the enemy into a trap and shift the balance of power.",
+        "coordinated_attack": "Launch coordinated attacks on enemy weaknesses, focusing units for a decisive breakthrough.",
+    }
+
+    def __init__(self, max_depth=2, max_nodes=2000, budget_ms=None, close_margin=0.01):
+        # Two turns ahead cost well under a millisecond per call; each extra turn multiplies it by about three
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes  # positions searched per call; deeper iterations that do not fit are dropped
+        self.budget_ms = budget_ms  # optional time limit per call, at the cost of reproducible advice
+        self.close_margin = close_margin
+        self.last_search = None
+
+    def recommend(self, player_forces, enemy_forces, morale, terrain, weather, time, last_actions,
+                  enemy_morale=0.5, fatigue=0.0, supply=1.0, enemy_personality="deceptive",
+                  player_power=None, enemy_power=None, original_forces=None, enemy_original_forces=None,
+                  leadership=0.85):
+        """Advice backed by an expectimax search over the next turns (see mcs_core.lookahead).
+
+        The first recommendation is the best action; a second action is added when
+        its expected value is within `close_margin`. Each one is a Recommendation
+        carrying the action, its expected value and the search statistics (kept
+        out of the advice text, which only depends on the seeded state).
+        player_power/enemy_power (battle powers) give the attack per unit; the
+        force totals are used when they are missing. With no forces left there is
+        nothing to search: the advice is to fortify.
+        """
+        if player_forces <= 0:
+            self.last_search = None
+            return [Recommendation(self.ACTION_ADVICE["fortify"], "fortify")]
+        model = TurnModel(
+            (player_power if player_power is not None else player_forces) / max(1, player_forces),
+            (enemy_power if enemy_power is not None else enemy_forces) / max(1, enemy_forces),
+            original_forces or player_forces, enemy_original_forces or enemy_forces,
+            terrain, weather, time, enemy_personality, leadership)
+        search = ExpectimaxSearch(model, max_depth=self.max_depth, max_nodes=self.max_nodes, budget_ms=self.budget_ms)
+        result = search.run(Position(player_forces, enemy_forces, morale, enemy_morale, fatigue, supply))
+        self.last_search = result
+        stats = {"depth": result.depth, "nodes": result.nodes, "tt_hits": result.tt_hits,
+                 "ms": result.ms, "complete": result.complete, "values": result.values}
+        ranked = sorted(result.values, key=lambda a: (result.values[a], a in DEFENSIVE_ACTIONS), reverse=True)
+        recommendations = []
+        for action in ranked[:2]:
+            value = result.values[action]
+            if recommendations and result.value - value > self.close_margin:
+                break
+            text = f"{self.ACTION_ADVICE[action]} (expected value {value:+.3f})"
+            recommendations.append(Recommendation(text, action, value, stats))
+        if time == "night" or weather == "foggy":
+            recommendations.append("Ensure the safety of your headquarters/command, and avoid surprise attacks at night or in poor weather.")
+        return recommendations
+
+class GoSunTzuAI:
+    """Go-style advice read from a territory board that follows the campaign (see mcs_core.territory)."""
+
+    def __init__(self, rng=None, grid_size=(12, 12), max_sectors=2):
+        self.rng = rng or random.Random()
+        self.grid_size = grid_size
+        self.max_sectors = max_sectors
+        self.grid = None
+        self.last_analysis = None
+
+    def reset(self):
+        """Forget the board; the next recommendation deploys a new one."""
+        self.grid = None
+        self.last_analysis = None
+
+    def recommend(self, player_state, enemy_state, terrain, morale, last_actions):
+        if self.grid is None:
+            self.grid = TerritoryGrid(*self.grid_size, rng=self.rng)
+        grid = self.grid
+        grid.update(player_state["forces_total"], enemy_state["forces_total"])
+        analysis = self.last_analysis = grid.analyse()
+        recommendations = []
+        for cell in self.identify_weak_sectors(analysis):
+            recommendations.append(f"Infiltrate and consolidate weak enemy sector {grid.sector_name(cell)} to disrupt supplies and begin encirclement.")
+        groups = self.detect_disconnected_groups(analysis)
+        if groups:
+            recommendations.append(f"Connect isolated friendly detachments ({groups} groups) to prevent defeat in detail and bolster overall defense.")
+        target = self.opportunity_to_encircle(analysis, enemy_state, player_state)
+        if target:
+            _, cell, liberties = target
+            recommendations.append(f"Attempt encirclement of the enemy group around sector {grid.sector_name(cell)} "
+                                   f"({liberties} liberties left) to cut enemy retreat lines and force surrender, using indirect approaches.")
+        if analysis["player_territory"] < analysis["enemy_territory"] or (morale < 0.5 and "supply" in terrain):
+            recommendations.append("Shift from confrontation to territorial control and adapt rapidly to opportunities.")
+        if analysis["frontier"]:
+            # Frontier sector where the enemy influence is the weakest
+            cell = max(analysis["frontier"], key=lambda c: analysis["influence"][c])
+            recommendations.append(f"Send specialist teams to make fast raids into enemy territory at {grid.sector_name(cell)} (rapid invasion tactic).")
+        if player_state["forces_total"] > 1.1 * enemy_state["forces_total"]:
+            recommendations.append("Maintain a mobile reserve to create latent threats (aji) and disrupt enemy focus.")
+        return recommendations
+
+    def identify_weak_sectors(self, analysis):
+        """Enemy-held sectors already dominated by the player's influence."""
+        return analysis["weak_sectors"][:self.max_sectors]
+
+    def detect_disconnected_groups(self, analysis):
+        """Number of separate friendly groups when the army is split, else 0."""
+        groups = analysis["player_groups"]
+        return groups if groups > 1 else 0
+
+    def opportunity_to_encircle(self, analysis, enemy_state, player_state):
+        """(group, sector, liberties) of the enemy group shortest of liberties, when the player can close it."""
+        if analysis["encirclable"] and player_state["forces_total"] > 0.8 * enemy_state["forces_total"]:
+            return analysis["encirclable"][0]
+        return None
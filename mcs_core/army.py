@@ -0,0 +1,173 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - compact army representation
+#
+# An Army is a fixed-order array of unit counts plus a reference to a shared,
+# immutable Roster holding the per-type attack/defense/speed/special tables.
+# Millions of armies therefore cost a few dozen bytes each, and hot loops work
+# on `army.counts` directly. Dict-style access (army["tank"].count,
+# .items(), .values()) is kept for the GUI, save/load and older code.
+#
+# The army total is maintained incrementally: counts must be changed through
+# set_count/add/remove_fraction (or a slot's .count), never by writing to
+# `counts` directly. Set MCS_CHECK_TOTALS=1 to verify the cached total against
+# a full sum on every read.
+
+import os
+from array import array
+
+CHECK_TOTALS = os.environ.get("MCS_CHECK_TOTALS", "") not in ("", "0")
+
+class UnitType:
+    __slots__ = ("name", "count", "attack", "defense", "speed", "special")
+
+    def __init__(self, name, count, attack, defense, speed, special=None):
+        self.name = name
+        self.count = count
+        self.attack = attack
+        self.defense = defense
+        self.speed = speed
+        self.special = special or {}
+
+class Roster:
+    """Static description of the unit types of one side, in a fixed order."""
+
+    __slots__ = ("keys", "names", "attack", "defense", "speed", "special", "index")
+
+    def __init__(self, unit_types):
+        # unit_types: list of (key, name, attack, defense, speed, special)
+        self.keys = tuple(u[0] for u in unit_types)
+        self.names = tuple(u[1] for u in unit_types)
+        self.attack = tuple(u[2] for u in unit_types)
+        self.defense = tuple(u[3] for u in unit_types)
+        self.speed = tuple(u[4] for u in unit_types)
+        self.special = tuple(u[5] or {} for u in unit_types)
+        self.index = {k: i for i, k in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.keys)
+
+class UnitSlot:
+    """Dict-style view of one unit type of an Army; `count` reads and writes the army array."""
+
+    __slots__ = ("army", "i")
+
+    def __init__(self, army, i):
+        self.army = army
+        self.i = i
+
+    @property
+    def count(self):
+        return self.army.counts[self.i]
+
+    @count.setter
+    def count(self, value):
+        self.army.set_count(self.i, value)
+
+    @property
+    def name(self):
+        return self.army.roster.names[self.i]
+
+    @property
+    def attack(self):
+        return self.army.roster.attack[self.i]
+
+    @property
+    def defense(self):
+        return self.army.roster.defense[self.i]
+
+    @property
+    def speed(self):
+        return self.army.roster.speed[self.i]
+
+    @property
+    def special(self):
+        return self.army.roster.special[self.i]
+
+class Army:
+    __slots__ = ("roster", "counts", "_total")
+
+    def __init__(self, roster, counts):
+        self.roster = roster
+        self.counts = array("q", counts)
+        self._total = sum(self.counts)
+
+    def set_count(self, i, value):
+        self._total += value - self.counts[i]
+        self.counts[i] = value
+
+    def add(self, i, delta):
+        self.counts[i] += delta
+        self._total += delta
+
+    def remove_fraction(self, ratio):
+        """Lose int(count * ratio) units of every type (ratio in [0, 1]); returns the units lost."""
+        counts = self.counts
+        lost = 0
+        for i, count in enumerate(counts):
+            n = int(count * ratio)
+            counts[i] = count - n
+            lost += n
+        self._total -= lost
+        return lost
+
+    def total(self):
+        if CHECK_TOTALS:
+            self.check()
+        return self._total
+
+    def check(self):
+        actual = sum(self.counts)
+        if actual != self._total:
+            raise AssertionError(f"Army total out of sync: cached {self._total}, actual {actual}")
+
+    def copy(self):
+        return Army(self.roster, self.counts)
+
+    def as_dict(self):
+        return dict(zip(self.roster.keys, self.counts))
+
+    # Mapping interface
+    def __getitem__(self, key):
+        return UnitSlot(self, self.roster.index[key])
+
+    def __contains__(self, key):
+        return key in self.roster.index
+
+    def __iter__(self):
+        return iter(self.roster.keys)
+
+    def __len__(self):
+        return len(self.roster.keys)
+
+    def keys(self):
+        return self.roster.keys
+
+    def values(self):
+        return [UnitSlot(self, i) for i in range(len(self.roster))]
+
+    def items(self):
+        return [(k, UnitSlot(self, i)) for i, k in enumerate(self.roster.keys)]
+
+INFANTRY, MECH, TANK, ARTILLERY, MISSILES, AIRCRAFT, SPIES = range(7)
+
+MODERN_UNIT_TYPES = [
+    ("infantry", "Infantry", 6, 5, 4, None),
+    ("mechanized_infantry", "Mechanized Infantry", 8, 6, 6, None),
+    ("tank", "Tank", 15, 12, 5, None),
+    ("artillery", "Artillery", 10, 3, 2, {"indirect_fire": True}),
+    ("missiles", "Missiles", 20, 1, 8, {"long_range": True}),
+    ("aircraft", "Aircraft", 18, 7, 12, {"air_superiority": True}),
+    ("spies", "Spies", 0, 1, 6, {"espionage": 9}),
+]
+MODERN_ROSTER = Roster(MODERN_UNIT_TYPES)
+# The enemy's spies are slightly less skilled than the player's.
+MODERN_ENEMY_ROSTER = Roster(MODERN_UNIT_TYPES[:-1] + [("spies", "Spies", 0, 1, 6, {"espionage": 8})])
+
+ANCIENT_UNIT_TYPES = [
+    ("infantry", "Infantry", 5, 5, 3, None),
+    ("cavalry", "Cavalry", 8, 4, 7, None),
+    ("archers", "Archers", 6, 3, 4, None),
+    ("spies", "Spies", 0, 1, 6, {"espionage": 9}),
+]
+ANCIENT_ROSTER = Roster(ANCIENT_UNIT_TYPES)
+ANCIENT_ENEMY_ROSTER = Roster(ANCIENT_UNIT_TYPES[:-1] + [("spies", "Spies", 0, 1, 6, {"espionage": 8})])
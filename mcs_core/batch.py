@@ -0,0 +1,92 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - Monte Carlo batch runner
+#
+# Usage: python -m mcs_core.batch --campaigns 2000 --turns 50 --recruit 40/20/10/10/10/5/5 --seed 1 --workers 0
+
+import argparse
+import json
+
+from .engine import CampaignEngine, parse_recruit_dist, DEFAULT_RECRUIT_DIST
+from .parallel import run_sharded, SHARD_BACKENDS, DEFAULT_SHARD_SIZE
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+def run_campaign(turns, recruit_dist, seed):
+    engine = CampaignEngine(recruit_dist=recruit_dist, advisors=False, seed=seed)
+    won = engine.run(turns)
+    return won, engine.sim_data
+
+def run_batch(n_campaigns, turns, recruit_dist=None, seed=None, percentiles=PERCENTILES, backend="numpy",
+              workers=1, shard_size=DEFAULT_SHARD_SIZE):
+    """Play n_campaigns independent campaigns and return outcome statistics.
+
+    backend "numpy" runs the vectorized kernel, "engine" plays each campaign
+    through CampaignEngine. Campaigns are split into shards of `shard_size`
+    played by `workers` processes (0 = one per core); the result only depends
+    on the seed, not on the number of workers. Campaigns that end early keep
+    their final values for the remaining turns so every trajectory has
+    exactly `turns` points.
+    """
+    if isinstance(recruit_dist, str):
+        recruit_dist = parse_recruit_dist(recruit_dist)
+    recruit_dist = list(recruit_dist or DEFAULT_RECRUIT_DIST)
+    total, root = run_sharded(n_campaigns, turns, recruit_dist, seed, backend, workers, shard_size)
+    traj = total.trajectories
+    last = turns - 1
+    return {
+        "n_campaigns": n_campaigns,
+        "turns": turns,
+        "recruit_dist": recruit_dist,
+        "seed": seed,
+        "entropy": root.entropy,
+        "backend": backend,
+        "wins": total.wins,
+        "win_probability": total.wins / total.n,
+        "campaign_length": total.length.summary(percentiles, index=0),
+        "final_forces": traj["forces_total"].summary(percentiles, index=last),
+        "final_enemy_forces": traj["enemy_forces_total"].summary(percentiles, index=last),
+        "final_morale": traj["morale"].summary(percentiles, index=last),
+        "final_supply": traj["supply"].summary(percentiles, index=last),
+        "trajectories": {k: stats.summary(percentiles) for k, stats in traj.items()},
+    }
+
+def format_report(result):
+    lines = [
+        f"Campaigns: {result['n_campaigns']}  Turns: {result['turns']}  "
+        f"Recruitment: {'/'.join(str(x) for x in result['recruit_dist'])}  Seed: {result['seed']}  Backend: {result['backend']}",
+        f"Win probability: {result['win_probability']:.3f} ({result['wins']} wins)",
+    ]
+    for key, label in [("final_forces", "Final forces"), ("final_enemy_forces", "Final enemy forces"),
+                       ("final_morale", "Final morale"), ("final_supply", "Final supply"),
+                       ("campaign_length", "Campaign length")]:
+        s = result[key]
+        pct = "  ".join(f"{k}={v:.2f}" for k, v in s.items() if k.startswith("p"))
+        lines.append(f"{label}: mean={s['mean']:.2f}  {pct}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo batch of Sun Tzu campaigns")
+    parser.add_argument("--campaigns", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--recruit", default="40/20/10/10/10/5/5")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--backend", choices=sorted(SHARD_BACKENDS), default="numpy")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per core)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--json", dest="json_path", default=None, help="write the full result to this JSON file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if args.campaigns <= 0 or args.turns <= 0 or args.shard_size <= 0:
+        parser.error("--campaigns, --turns and --shard-size must be positive integers")
+    result = run_batch(args.campaigns, args.turns, parse_recruit_dist(args.recruit), args.seed,
+                       backend=args.backend, workers=args.workers, shard_size=args.shard_size)
+    if args.json_path == "-":
+        print(json.dumps(result))
+        return result
+    print(format_report(result))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f)
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - benchmark suite
+#
+# Times the hot paths of a turn of CampaignEngine for the modern era
+# (MCS_003.py to MCS_005.py) and the ancient one (MCS_002.py): resolve_battle,
+# apply_losses, resource_management and advanced_spy_operations per call, the Chess and Go recommenders per call,
+# headless campaigns played back to back for 10, 1,000 and 100,000 turns
+# (advisors off, they are timed on their own) and the batch throughput in
+# campaigns per second. Every result keeps the best of several repeats.
+#
+# The results can be saved as a JSON baseline and later runs compared against
+# it; a result worse than the baseline by more than the tolerance is reported
+# as a regression and the command exits with status 1.
+#
+# Usage: python -m mcs_core.bench --save bench_baseline.json
+#        python -m mcs_core.bench --compare bench_baseline.json --tolerance 0.25
+
+import argparse
+import json
+import platform
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .army import Army
+from .batch import run_batch
+from .engine import CampaignEngine
+from .eras import ANCIENT, MODERN
+
+BENCH_FORMAT = "mcs-bench"
+BENCH_VERSION = 1
+CAMPAIGN_TURNS = (10, 1000, 100000)
+DEFAULT_TOLERANCE = 0.25
+
+def best_time(setup, number, repeat):
+    """Best time of one call over `repeat` runs of `number` calls; setup() returns the call (fresh state per run)."""
+    best = float("inf")
+    for _ in range(repeat):
+        call = setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def per_call(setup, number, repeat):
+    return {"value": best_time(setup, number, repeat) * 1e6, "unit": "us/call", "higher_is_better": False}
+
+def rate(count, seconds, unit):
+    return {"value": count / seconds, "unit": unit, "higher_is_better": True}
+
+# --- per-era engine benchmarks -----------------------------------------------
+
+def era_engine(era=MODERN, advisors=True, turns=5):
+    """Engine a few turns into a seeded campaign, so the calls see a realistic state."""
+    engine = CampaignEngine(advisors=advisors, seed=1, era=era)
+    engine.start()
+    for _ in range(turns):
+        engine.step()
+    return engine
+
+def bench_apply_losses(era):
+    """A battle's worth of losses (a fifth of the army) on a fresh copy of the army every call."""
+    engine = era_engine(era, advisors=False)
+    roster, counts = engine.state.units.roster, list(engine.state.units.counts)
+    losses = max(1, sum(counts) // 5)
+    return lambda: engine.apply_losses(Army(roster, counts), losses)
+
+def bench_resource_management(era):
+    engine = era_engine(era, advisors=False)
+    resources = engine.state.resources
+    gold = resources["gold"]
+
+    def call():
+        resources["gold"] = gold
+        engine.resource_management(engine.recruit_dist)
+    return call
+
+def play_campaigns(era, turns, seed=1):
+    """Play campaigns back to back until `turns` turns were played; returns the seconds taken."""
+    engine = CampaignEngine(advisors=False, seed=seed, era=era)
+    played = 0
+    start = time.perf_counter()
+    while played < turns:
+        engine.reset(seed=seed + played)
+        engine.start()
+        while not engine.finished and played < turns:
+            engine.step()
+            played += 1
+        engine.finish()
+    return time.perf_counter() - start
+
+def modern_batch(backend, n, repeat):
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_batch(n, 50, seed=1, backend=backend)
+        seconds = min(seconds, time.perf_counter() - start)
+    return rate(n, seconds, "campaigns/s")
+
+def era_benchmarks(era, number, repeat, campaign_turns):
+    """[(name, function returning the result)] of the turn rules and campaigns of one era."""
+    engine = lambda: era_engine(era, advisors=False)
+    benchmarks = [
+        (f"{era.name}.resolve_battle", lambda: per_call(lambda: engine().resolve_battle, number, repeat)),
+        (f"{era.name}.apply_losses", lambda: per_call(lambda: bench_apply_losses(era), number, repeat)),
+        (f"{era.name}.resource_management", lambda: per_call(lambda: bench_resource_management(era), number, repeat)),
+        (f"{era.name}.advanced_spy_operations", lambda: per_call(lambda: engine().advanced_spy_operations, number, repeat)),
+    ]
+    for turns in campaign_turns:
+        runs = repeat if turns < 10000 else 1
+        benchmarks.append((f"{era.name}.campaign_{turns}",
+                           lambda turns=turns, runs=runs: rate(turns, min(play_campaigns(era, turns) for _ in range(runs)), "turns/s")))
+    return benchmarks
+
+def modern_benchmarks(number, repeat, campaign_turns, batch_campaigns):
+    """[(name, function returning the result)] for the modern campaign: era rules, advisors and batches."""
+    advised = max(1, number // 20)
+    benchmarks = era_benchmarks(MODERN, number, repeat, campaign_turns)
+    benchmarks[4:4] = [
+        ("modern.chess_recommend", lambda: per_call(lambda: era_engine().chess_advice, advised, repeat)),
+        ("modern.go_recommend", lambda: per_call(lambda: era_engine().go_advice, advised, repeat)),
+    ]
+    benchmarks.append(("modern.batch_numpy", lambda: modern_batch("numpy", batch_campaigns, repeat)))
+    benchmarks.append(("modern.batch_engine", lambda: modern_batch("engine", max(1, batch_campaigns // 20), repeat)))
+    return benchmarks
+
+# --- baseline ---------------------------------------------------------------
+
+def run_benchmarks(only=None, number=2000, repeat=5, campaign_turns=CAMPAIGN_TURNS, batch_campaigns=2000):
+    """{name: {"value", "unit", "higher_is_better"}} of every benchmark whose name matches `only` (a regex)."""
+    benchmarks = modern_benchmarks(number, repeat, campaign_turns, batch_campaigns)
+    benchmarks += era_benchmarks(ANCIENT, number, repeat, campaign_turns)
+    results = {}
+    for name, bench in benchmarks:
+        if only and not re.search(only, name):
+            continue
+        results[name] = result = bench()
+        print(f"{name:34s} {result['value']:14.2f} {result['unit']}", flush=True)
+    return results
+
+def baseline_document(results):
+    return {
+        "format": BENCH_FORMAT,
+        "version": BENCH_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+
+def load_baseline(path):
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("format") != BENCH_FORMAT:
+        raise ValueError(f"{path} is not a benchmark baseline.")
+    return document
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Rows (name, baseline, current, change, status) for the benchmarks in both; change > 0 is better."""
+    rows = []
+    for name, result in results.items():
+        reference = baseline["results"].get(name)
+        if reference is None or reference["unit"] != result["unit"]:
+            continue
+        old, new = reference["value"], result["value"]
+        speedup = new / old if result["higher_is_better"] else old / new
+        status = "REGRESSION" if speedup < 1 / (1 + tolerance) else ("faster" if speedup > 1 + tolerance else "ok")
+        rows.append((name, old, new, speedup - 1, status))
+    return rows
+
+def format_comparison(rows, unit_of):
+    lines = [f"{'benchmark':34s} {'baseline':>14s} {'current':>14s} {'change':>8s}"]
+    for name, old, new, change, status in rows:
+        lines.append(f"{name:34s} {old:14.2f} {new:14.2f} {change:+8.1%}  {unit_of[name]}  {status}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the campaign turn engines and compare against a baseline")
+    parser.add_argument("--save", default=None, help="write the results as a JSON baseline")
+    parser.add_argument("--compare", default=None, help="compare the results against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="slowdown reported as a regression (0.25 = 25%%)")
+    parser.add_argument("--only", default=None, help="regular expression selecting the benchmarks (e.g. 'modern.campaign')")
+    parser.add_argument("--number", type=int, default=2000, help="calls per repeat of the per-call benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--turns", default="/".join(str(t) for t in CAMPAIGN_TURNS), help="campaign lengths, e.g. 10/1000/100000")
+    parser.add_argument("--campaigns", type=int, default=2000, help="campaigns of the batch benchmark")
+    args = parser.parse_args(argv)
+    try:
+        turns = [int(t) for t in args.turns.split("/")]
+    except ValueError:
+        parser.error("--turns must look like 10/1000/100000")
+    if args.number <= 0 or args.repeat <= 0 or args.campaigns <= 0 or min(turns) <= 0:
+        parser.error("--number, --repeat, --campaigns and --turns must be positive")
+    baseline = load_baseline(args.compare) if args.compare else None
+    results = run_benchmarks(args.only, args.number, args.repeat, turns, args.campaigns)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(baseline_document(results), f, indent=2)
+    if baseline is not None:
+        rows = compare(results, baseline, args.tolerance)
+        print(format_comparison(rows, {name: r["unit"] for name, r in results.items()}))
+        if any(status == "REGRESSION" for *_, status in rows):
+            raise SystemExit(1)
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - checkpoints, resume and forks
+#
+# A CheckpointStore watches an engine and keeps an in-memory snapshot every K
+# turns. The history and the event log only grow during a campaign, so each
+# checkpoint stores just the rows and events added since the previous one and
+# the earlier part is shared. Checkpoint arrays are read-only: any number of
+# forks can be made from the same turn, each one copying the shared arrays into
+# its own engine and only owning what it plays afterwards.
+#
+# "What if we changed recruitment at turn 30?" without replaying turns 1-30:
+#
+#   store = CheckpointStore(engine, every=10); engine.run(30)
+#   futures = store.fork(30, n=100, recruit_dist=[20, 20, 20, 10, 10, 10, 10], seed=1)
+#
+# Usage: python -m mcs_core.checkpoint --at 30 --turns 50 --forks 200 --recruit 20/20/20/10/10/10/10 --seed 1
+
+import argparse
+import json
+
+import numpy as np
+
+from .engine import CampaignEngine, parse_recruit_dist, DEFAULT_RECRUIT_DIST
+from .rng import as_seed_sequence
+from .snapshot import capture, restore, engine_for
+
+APPEND_ONLY = ("events_codes", "events_values", "events_texts")
+
+def append_only(key):
+    return key.startswith("history_") or key in APPEND_ONLY
+
+class CheckpointStore:
+    """Engine observer keeping a snapshot every `every` turns of the current campaign."""
+
+    def __init__(self, engine, every=10):
+        if every <= 0:
+            raise ValueError("Checkpoint interval must be a positive number of turns.")
+        self.engine = engine
+        self.every = every
+        self.clear()
+        engine.add_observer(self)
+
+    def clear(self):
+        self.turns = []
+        self.headers = []
+        self.segments = []  # per checkpoint: small arrays whole, append-only arrays from the previous checkpoint on
+        self.lengths = {}  # length of every append-only array at the last checkpoint
+
+    def on_turn(self, record):
+        engine = self.engine
+        if self.turns and engine.turn <= self.turns[-1]:
+            self.clear()  # a new campaign was started
+        # No checkpoint on a turn that ends the campaign
+        if engine.turn % self.every == 0 and engine.state.units.total() > 0 and engine.state.enemy_units.total() > 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Checkpoint the engine now; returns the turn."""
+        engine = self.engine
+        if self.turns and engine.turn <= self.turns[-1]:
+            self.truncate(engine.turn - 1)
+        header, arrays = capture(engine)
+        segment = {}
+        for key, values in arrays.items():
+            if append_only(key):
+                start = self.lengths.get(key, 0)
+                self.lengths[key] = len(values)
+                values = values[start:]
+            values = np.array(values)  # copy: capture() returns views of the live buffers
+            values.flags.writeable = False
+            segment[key] = values
+        self.turns.append(engine.turn)
+        self.headers.append(json.loads(json.dumps(header)))
+        self.segments.append(segment)
+        return engine.turn
+
+    def truncate(self, turn):
+        """Drop the checkpoints after `turn`."""
+        k = len([t for t in self.turns if t <= turn])
+        del self.turns[k:], self.headers[k:], self.segments[k:]
+        self.lengths = {key: len(values) for key, values in self.arrays(k - 1).items() if append_only(key)} if k else {}
+
+    def index(self, turn, exact=True):
+        """Position of the checkpoint of `turn` (exact=False: of the last one at or before it)."""
+        k = len([t for t in self.turns if t <= turn]) - 1
+        if k < 0 or (exact and self.turns[k] != turn):
+            raise KeyError(f"No checkpoint at turn {turn} (available: {self.turns}).")
+        return k
+
+    def arrays(self, k):
+        arrays = dict(self.segments[k])
+        for key in arrays:
+            if append_only(key) and k > 0:
+                arrays[key] = np.concatenate([segment[key] for segment in self.segments[:k + 1]])
+        return arrays
+
+    def resume(self, turn):
+        """Rewind the watched engine to the checkpoint of `turn`; later checkpoints are dropped."""
+        k = self.index(turn)
+        restore(self.engine, self.headers[k], self.arrays(k))
+        self.truncate(turn)
+        return self.engine
+
+    def fork(self, turn, n=1, recruit_dist=None, seed=None):
+        """n independent engines continuing the checkpoint of `turn`.
+
+        seed=None keeps the saved random streams, so every fork meets the same
+        chance and only the changed recruitment differs; a seed gives each fork
+        its own child streams (n different futures).
+        """
+        k = self.index(turn)
+        header, arrays = self.headers[k], self.arrays(k)
+        children = as_seed_sequence(seed).spawn(n) if seed is not None else [None] * n
+        forks = []
+        for child in children:
+            engine = restore(engine_for(header), header, arrays)
+            if child is not None:
+                engine.rng.seed(child)
+            if recruit_dist is not None:
+                engine.recruit_dist = list(recruit_dist)
+            forks.append(engine)
+        return forks
+
+def fork_outcomes(forks, turns):
+    """Play every fork `turns` more turns; win probability and mean final forces."""
+    wins = 0
+    forces = []
+    for engine in forks:  # forks have no observers, so their logs are never formatted
+        wins += engine.run(turns)
+        forces.append(engine.state.units.total())
+    return {"forks": len(forks), "win_probability": wins / len(forks), "mean_final_forces": float(np.mean(forces))}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a campaign to a turn, then compare alternative futures from there")
+    parser.add_argument("--at", type=int, default=30, help="turn to fork from")
+    parser.add_argument("--turns", type=int, default=50, help="turns played by every fork")
+    parser.add_argument("--forks", type=int, default=100)
+    parser.add_argument("--base", default="/".join(str(x) for x in DEFAULT_RECRUIT_DIST), help="recruitment before the fork")
+    parser.add_argument("--recruit", action="append", default=None, help="recruitment after the fork (repeatable)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.at <= 0 or args.turns <= 0 or args.forks <= 0:
+        parser.error("--at, --turns and --forks must be positive")
+    engine = CampaignEngine(recruit_dist=parse_recruit_dist(args.base), advisors=False, seed=args.seed)
+    store = CheckpointStore(engine, every=args.at)
+    engine.start()
+    for _ in range(args.at):
+        engine.step()
+    if not store.turns:
+        print(f"The campaign ended before turn {args.at}.")
+        return None
+    fork_seed = engine.rng.seed_seq.spawn(1)[0]  # a sibling of the campaign's own streams
+    results = {}
+    for dist in args.recruit or [args.base]:
+        dist = parse_recruit_dist(dist)
+        # Same fork seed for every plan: each plan meets the same futures
+        result = fork_outcomes(store.fork(args.at, args.forks, dist, fork_seed), args.turns)
+        results["/".join(str(x) for x in dist)] = result
+        print(f"Recruitment {'/'.join(str(x) for x in dist)} from turn {args.at}: "
+              f"win probability {result['win_probability']:.3f}, mean final forces {result['mean_final_forces']:.0f} "
+              f"({result['forks']} forks, {args.turns} turns)")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - headless turn engine
+#
+# The engine owns a CampaignState and plays the campaign turn by turn without
+# any tkinter or matplotlib dependency. Front ends (the Tk GUI, batch runners)
+# attach observers to receive log lines and per-turn records. The rules that
+# differ between the ancient and the modern campaign come from the state's era
+# (mcs_core.eras), and the strategic advisors consulted every turn are chosen
+# by name among CampaignEngine.ADVISORS.
+
+from operator import mul
+
+from .events import EventLog, EVENT_CODES, describe
+from .history import TurnHistory
+from .state import CampaignState
+from .advisors import ChessSunTzuAI, GoSunTzuAI
+from .eras import MODERN
+
+# Modern era (the NumPy kernel and the optimizer play it)
+UNIT_ORDER = list(MODERN.roster.keys)
+MESSAGE = EVENT_CODES["message"]
+DEFAULT_RECRUIT_DIST = list(MODERN.recruit_dist)
+
+class NullProfiler:
+    """Profiler hooks doing nothing (the default of CampaignEngine.profiler)."""
+
+    def start_turn(self, turn):
+        pass
+
+    def phase(self, name):
+        pass
+
+    def enter(self, name):
+        pass
+
+    def leave(self):
+        pass
+
+    def end_turn(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+def parse_recruit_dist(dist, era=MODERN):
+    n = len(era.roster)
+    try:
+        result = [int(x) for x in dist.strip().split('/')][:n]
+    except (ValueError, AttributeError):
+        result = list(era.recruit_dist)
+    total = sum(result)
+    if total != 100 and total > 0:
+        ratio = [x*100//total for x in result]
+        return ratio + [0]*(n - len(ratio))
+    return result + [0]*(n - len(result))
+
+def advisor_names(advisors):
+    """Advisors to consult: True for all of them, False/None for none, or an iterable of names."""
+    if advisors is True:
+        return tuple(CampaignEngine.ADVISORS)
+    if not advisors:
+        return ()
+    names = tuple(advisors)
+    for name in names:
+        if name not in CampaignEngine.ADVISORS:
+            raise ValueError(f"Unknown advisor '{name}', expected one of {', '.join(CampaignEngine.ADVISORS)}")
+    return names
+
+class CampaignEngine:
+    """Turn engine of the campaign, for any era (modern seven-unit campaign by default).
+
+    Observers may implement any of on_log(message, event_type),
+    on_turn(record) and on_finish(engine); missing hooks are skipped.
+    Messages are kept as typed events in `logs` (an EventLog) and only
+    formatted when an observer listens or someone reads them.
+    Setting `profiler` to a mcs_core.profiler.PhaseProfiler times the phases
+    of every turn.
+
+    `advisors` names the advisors consulted every turn (see advisor_names).
+    ADVISORS maps each name to the engine method returning its advice and the
+    event its recommendations are logged as (an era may log them as another
+    event, Era.advice_events); a subclass may add its own.
+    """
+
+    ADVISORS = {"chess": ("chess_advice", "chess_advice"), "go": ("go_advice", "go_advice")}
+
+    def __init__(self, state=None, recruit_dist=None, advisors=True, seed=None, enemy_ai_factory=None, era=None):
+        self.state = state or CampaignState(seed=seed, enemy_ai_factory=enemy_ai_factory, era=era)
+        self.era = self.state.era
+        self.rng = self.state.rng
+        self.recruit_dist = list(recruit_dist or self.era.recruit_dist)
+        self.advisors = advisor_names(advisors)
+        self.chess_ia = ChessSunTzuAI()
+        self.go_ia = GoSunTzuAI(rng=self.rng.advisors)
+        self.observers = []
+        self.quiet = False  # events are only recorded, not formatted for on_log observers (fast-forward)
+        self.logs = EventLog()
+        self.sim_data = TurnHistory()
+        self.turn = 0
+        self.finished = False
+        self.profiler = NULL_PROFILER
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def _notify(self, hook, *args):
+        for obs in self.observers:
+            fn = getattr(obs, hook, None)
+            if fn is not None:
+                fn(*args)
+
+    def log(self, message, event_type="info"):
+        """Free-form message (GUI notices); engine phases use emit()."""
+        self.logs.record(MESSAGE, (message,), event_type)
+        if self.observers and not self.quiet:
+            self._notify("on_log", message, event_type)
+
+    def emit(self, name, *payload):
+        logs = self.logs
+        logs.record(EVENT_CODES[name], payload)
+        if self.observers and not self.quiet:
+            k = len(logs) - 1
+            self._notify("on_log", logs.format(k), logs.category(k))
+
+    def reset(self, recruit_dist=None, seed=None, **state_kwargs):
+        """Start a new campaign; a seed makes it reproducible, None keeps the current streams."""
+        if recruit_dist is not None:
+            self.recruit_dist = list(recruit_dist)
+        if seed is not None:
+            self.rng.seed(seed)
+        self.state.init_state(**state_kwargs)
+        self.go_ia.reset()
+        self.logs.clear()
+        self.sim_data.clear()
+        self.turn = 0
+        self.finished = False
+
+    def start(self):
+        self.emit(self.era.start_event, self.state.enemy_ai.personality)
+
+    def run(self, turns):
+        if self.turn == 0:
+            self.start()
+        for _ in range(turns):
+            if self.finished:
+                break
+            self.step()
+        return self.finish()
+
+    def step(self):
+        if self.finished:
+            return None
+        self.turn += 1
+        turn = self.turn
+        state = self.state
+        prof = self.profiler
+        prof.start_turn(turn)
+        prof.phase("environment")
+        self.logs.start_turn(turn)
+        self.emit("turn_start", turn)
+
+        # Randomly update weather and time, and possibly terrain to simulate a dynamic campaign
+        env = self.rng.environment
+        if turn % 3 == 0:
+            state.current_weather = env.choice(state.weather_conditions)
+        if turn % 2 == 0:
+            state.current_time = "day" if state.current_time == "night" else "night"
+        if env.random() < 0.1:
+            state.current_terrain = env.choice(state.terrain_types)
+
+        # 1. Apply environment effects (weather, time, terrain)
+        for e in self.environment_effects():
+            self.emit(e)
+
+        # 2. Supply line disruption possible event
+        prof.phase("supply_line")
+        fatigue_penalty = self.supply_line_event()
+        if fatigue_penalty is not None:
+            self.emit("supply_disrupted", fatigue_penalty)
+
+        # 3. Sun Tzu advanced tactics actions
+        prof.phase("tactics")
+        advanced_actions, state.enemy_morale, new_enemy_forces = self.sun_tzu_advanced_tactics(
+            turn, state.enemy_morale, state.enemy_units.total(), state.units.total()
+        )
+        state.enemy_units_total = new_enemy_forces
+        for aa in advanced_actions:
+            self.emit(aa)
+
+        # 4. Spy operations (potentially sabotage or misinformation)
+        prof.phase("spies")
+        spy_actions = self.advanced_spy_operations()
+        for sa in spy_actions:
+            self.emit(sa)
+
+        # 5. Resource management (recruitment, fortification upkeep, gold)
+        prof.phase("resources")
+        self.resource_management(self.recruit_dist)
+
+        # 6. Morale recalculation for player side
+        prof.phase("morale")
+        state.morale = self.calculate_morale()
+
+        # 7. Compute battle outcomes
+        prof.phase("battle")
+        player_power, enemy_power = self.resolve_battle()
+        prof.enter("enemy_ai")
+        enemy_behavior = state.enemy_ai.adjust_behavior(player_power, enemy_power, state.enemy_morale)
+        prof.leave()
+        if enemy_behavior["avoid"]:
+            self.emit("enemy_avoids")
+            enemy_power *= 0.8
+        if enemy_behavior["feint"]:
+            self.emit("enemy_feint")
+            player_power *= 0.9
+
+        # 8. Apply losses
+        prof.phase("losses")
+        if player_power > enemy_power:
+            enemy_losses = int((player_power - enemy_power) * 0.1)
+            player_losses = int(enemy_power * 0.05)
+            self.emit("inflicted_losses", enemy_losses)
+            self.emit("player_losses", player_losses)
+        else:
+            player_losses = int((enemy_power - player_power) * 0.1)
+            enemy_losses = int(player_power * 0.05)
+            self.emit("player_losses", player_losses)
+            self.emit("enemy_losses", enemy_losses)
+        self.apply_losses(state.units, player_losses)
+        self.apply_losses(state.enemy_units, enemy_losses)
+
+        # 9. Fatigue and supply consumption increase from battle
+        prof.phase("fatigue")
+        fatigue_gain = 0.05 + player_losses / self.era.loss_fatigue
+        state.fatigue = min(1, state.fatigue + fatigue_gain)
+        supply_consumption = 0.1 + fatigue_gain * 0.5
+        state.supply = max(0, state.supply - supply_consumption)
+
+        # 10. Battle aftermath (recruit points and gold affected by civilian support changes)
+        prof.phase("aftermath")
+        self.battle_aftermath(player_losses, enemy_losses)
+
+        # 11. Enemy AI learns/adapts
+        prof.phase("ai_learning")
+        self.update_enemy_ai(player_losses, enemy_losses)
+
+        # 12. Strategic AI recommendations (Chess & Go principles)
+        prof.phase("recommendations")
+        if self.advisors:
+            self.strategic_recommendations()
+
+        # 13. Log summary and stats for this turn
+        prof.phase("logging")
+        resources = state.resources
+        self.emit("turn_end", turn)
+        unit_counts, enemy_unit_counts = self.era.unit_counts_events
+        self.emit(unit_counts, *state.units.counts)
+        self.emit(enemy_unit_counts, *state.enemy_units.counts)
+        self.emit("morale", state.morale, state.enemy_morale)
+        self.emit("fatigue_supply", state.fatigue, state.supply)
+        self.emit("resources", resources["gold"], resources["recruit_points"], resources["fortification"])
+        self.emit("environment", state.current_terrain, state.current_weather, state.current_time)
+
+        player_total = state.units.total()
+        enemy_total = state.enemy_units.total()
+        record = {
+            "turn": turn,
+            "forces_total": player_total,
+            "enemy_forces_total": enemy_total,
+            "morale": state.morale,
+            "enemy_morale": state.enemy_morale,
+            "fatigue": state.fatigue,
+            "supply": state.supply,
+            "resources": state.resources.copy(),
+            "terrain": state.current_terrain,
+            "weather": state.current_weather,
+            "time": state.current_time,
+            "actions": [describe(a) for a in advanced_actions + spy_actions],
+            "special_actions": len(advanced_actions + spy_actions),
+            "enemy_ai": state.enemy_ai.personality
+        }
+        prof.enter("history")
+        self.sim_data.append(record)
+        prof.leave()
+        prof.enter("observers")
+        self._notify("on_turn", record)
+        prof.leave()
+        if player_total == 0:
+            self.emit("army_destroyed")
+            self.finished = True
+        elif enemy_total == 0:
+            self.emit("enemy_destroyed")
+            self.finished = True
+        prof.end_turn()
+        return record
+
+    def finish(self):
+        self.finished = True
+        self.emit("campaign_end")
+        player_forces_left = self.state.units.total()
+        enemy_forces_left = self.state.enemy_units.total()
+        self.emit("final_forces", player_forces_left, enemy_forces_left)
+        won = player_forces_left > enemy_forces_left
+        if won:
+            self.emit("campaign_won")
+        else:
+            self.emit("campaign_lost")
+        self._notify("on_finish", self)
+        return won
+
+    def reopen(self):
+        """Allow more turns after finish() (e.g. a loaded campaign) unless an army was destroyed."""
+        if self.state.units.total() > 0 and self.state.enemy_units.total() > 0:
+            self.finished = False
+        return not self.finished
+
+    def chess_advice(self):
+        state = self.state
+        last_logs = self.logs[-5:] if len(self.logs) >= 5 else self.logs
+        player_power, enemy_power = self.resolve_battle()
+        return self.chess_ia.recommend(
+            state.units.total(), state.enemy_units.total(), state.morale,
+            state.current_terrain, state.current_weather, state.current_time, last_logs,
+            enemy_morale=state.enemy_morale, fatigue=state.fatigue, supply=state.supply,
+            enemy_personality=state.enemy_ai.personality, player_power=player_power, enemy_power=enemy_power,
+            original_forces=state.player_original_forces, enemy_original_forces=state.enemy_original_forces,
+            leadership=state.leadership_quality
+        )
+
+    def go_advice(self):
+        state = self.state
+        last_logs = self.logs[-5:] if len(self.logs) >= 5 else self.logs
+        player_state = {
+            "forces_total": state.units.total(),
+            "morale": state.morale,
+            "supply": state.supply,
+            "original_forces": state.player_original_forces
+        }
+        enemy_state = {
+            "forces_total": state.enemy_units.total(),
+            "morale": state.enemy_morale,
+            "original_forces": state.enemy_original_forces
+        }
+        return self.go_ia.recommend(player_state, enemy_state, state.current_terrain, state.morale, last_logs)
+
+    def strategic_recommendations(self):
+        """{advisor name: recommendations} of every advisor in `advisors`, logged in that order."""
+        prof = self.profiler
+        advice = {}
+        for name in self.advisors:
+            prof.enter(name)
+            advice[name] = getattr(self, self.ADVISORS[name][0])()
+            prof.leave()
+        for name, recs in advice.items():
+            event = self.era.advice_events.get(name, self.ADVISORS[name][1])
+            for r in recs:
+                self.emit(event, r)
+        return advice
+
+    def environment_effects(self):
+        state = self.state
+        effects = []
+        if state.current_time == "night":
+            effects.append("night")
+        if state.current_weather == "rainy":
+            effects.append(self.era.rain_event)
+        if state.current_weather == "windy":
+            effects.append("wind")
+        # Fatigue and attrition of the rule file (night fatigue, rain losses)
+        cell = self.era.rules.cell(state.current_terrain, state.current_weather, state.current_time)
+        if cell.fatigue:
+            state.fatigue += cell.fatigue
+        units, enemy_units = state.units, state.enemy_units
+        for i, player_loss, enemy_loss in cell.losses:
+            units.set_count(i, max(0, units.counts[i] - player_loss))
+            enemy_units.set_count(i, max(0, enemy_units.counts[i] - enemy_loss))
+        return effects
+
+    def supply_line_event(self):
+        state = self.state
+        fatigue_penalty = None
+        enemy_spy_effectiveness = state.enemy_units.counts[self.era.spies] / 2000
+        disruption_chance = 0.1 + enemy_spy_effectiveness
+        espionage = self.rng.espionage
+        if espionage.random() < disruption_chance and state.supply < 0.6:
+            fatigue_penalty = espionage.uniform(0.1, 0.2)
+            state.fatigue += fatigue_penalty
+            state.fatigue = min(state.fatigue, 1.0)
+        return fatigue_penalty
+
+    def sun_tzu_advanced_tactics(self, turn, enemy_morale, enemy_forces, player_forces):
+        actions = []
+        if enemy_morale > 0.7 and turn % 3 == 0:
+            actions.append("distract")
+            enemy_morale -= 0.1
+        if player_forces > enemy_forces * 1.2 and enemy_morale < 0.4:
+            actions.append("retreat_route")
+            enemy_morale += 0.05
+        if enemy_forces > player_forces and turn % 4 == 0:
+            actions.append("target_supply")
+            enemy_forces -= int(enemy_forces * 0.05)
+        if enemy_forces > player_forces and enemy_morale > 0.5 and turn % 5 == 0:
+            actions.append("feign_retreat")
+            if self.rng.combat.random() > 0.5:
+                actions.append("ambush_success")
+                enemy_forces -= int(enemy_forces * 0.1)
+            else:
+                actions.append("ambush_failed")
+        return actions, max(0, min(enemy_morale, 1)), max(0, enemy_forces)
+
+    def apply_losses(self, units, losses):
+        total = units.total()
+        if total == 0 or losses == 0:
+            return
+        loss_ratio = min(1, losses / total)
+        units.remove_fraction(loss_ratio)
+
+    def advanced_spy_operations(self):
+        state = self.state
+        espionage = self.rng.espionage
+        actions = []
+        spies = state.units.counts[self.era.spies]
+        if spies > 0:
+            sabotage_chance = 0.2 * (spies / 100)
+            if espionage.random() < sabotage_chance:
+                supply_damage = espionage.uniform(0.05, 0.15)
+                state.supply = max(0, state.supply - supply_damage)
+                actions.append("spy_sabotage")
+                state.enemy_morale = max(0, state.enemy_morale - 0.05)
+            misinformation_chance = 0.25 * (spies / 100)
+            if espionage.random() < misinformation_chance:
+                actions.append("spy_misinformation")
+                state.enemy_morale = max(0, state.enemy_morale - 0.07)
+        else:
+            actions.append("no_spies")
+        state.spy_effectiveness = min(1.0, spies / 150)
+        return actions
+
+    def resource_management(self, recruit_dist):
+        state = self.state
+        era = self.era
+        recruit_gain = int(state.resources["recruit_points"] * 0.1)
+        gold_spent = int(recruit_gain * era.recruit_cost)  # Modern units cost more gold
+        if state.resources["gold"] >= gold_spent and recruit_gain > 0:
+            state.resources["gold"] -= gold_spent
+            units = state.units
+            for i, typ in enumerate(units.roster.keys):
+                rcount = int(recruit_gain * recruit_dist[i] / 100)
+                units.add(i, rcount)
+                if rcount > 0:
+                    self.emit("recruited", rcount, typ.replace('_', ' '))
+        else:
+            self.emit("no_gold")
+        if state.resources["fortification"] > 0:
+            fort_maintenance_cost = era.fort_cost
+            if state.resources["gold"] >= fort_maintenance_cost:
+                state.resources["gold"] -= fort_maintenance_cost
+                state.fatigue = max(0, state.fatigue - 0.05)
+                self.emit("fort_maintained")
+            else:
+                state.fatigue += 0.05
+                self.emit("fort_failed")
+
+    def calculate_morale(self):
+        state = self.state
+        leadership_bonus = (state.leadership_quality - 0.5) * 0.3
+        spy_bonus = (state.spy_effectiveness - 0.5) * 0.2
+        weather_penalty = -0.1 if state.current_weather in ["stormy", "foggy"] else 0
+        morale = state.morale - state.fatigue * 0.5 + (state.supply - 0.5) * 0.4 + leadership_bonus + spy_bonus + weather_penalty
+        return max(0, min(morale, 1))
+
+    def resolve_battle(self):
+        state = self.state
+        morale_power = self.era.morale_power
+        factor = 1 - state.fatigue * 0.5
+        # Attack weights of the current terrain, weather and time (air superiority, attack lost to the terrain)
+        cell = self.era.rules.cell(state.current_terrain, state.current_weather, state.current_time)
+        lost = cell.lost or (None, None)
+        powers = []
+        for side, (army, morale) in enumerate(((state.units, state.morale), (state.enemy_units, state.enemy_morale))):
+            counts = army.counts
+            power = sum(map(mul, cell.weights[side], counts)) * factor
+            if morale_power:
+                power *= 1 + morale * morale_power
+            if lost[side] is not None:
+                power -= sum(map(mul, lost[side], counts))
+            powers.append(max(0, int(power)))
+        return powers[0], powers[1]
+
+    def battle_aftermath(self, player_losses, enemy_losses):
+        state = self.state
+        pop_support_change = (enemy_losses - player_losses) / 10000
+        state.resources["recruit_points"] += int(pop_support_change * 50)
+        state.resources["recruit_points"] = max(50, state.resources["recruit_points"])
+        if pop_support_change > 0:
+            self.emit("support_up")
+        else:
+            self.emit("support_down")
+        if state.fatigue > 0.8:
+            self.emit("unrest")
+            state.resources["gold"] = max(0, state.resources["gold"] - self.era.unrest_gold)
+
+    def update_enemy_ai(self, player_losses, enemy_losses):
+        player_win = player_losses < enemy_losses
+        recruit_dist = list(self.state.units.counts)
+        total = sum(recruit_dist)
+        player_dist = [x / total if total > 0 else 0 for x in recruit_dist]
+        self.state.enemy_ai.observe_outcome(player_win, player_dist)
+        self.emit(self.era.ai_shift_event, self.state.enemy_ai.personality)
@@ -0,0 +1,98 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - campaign eras
+#
+# An Era holds everything that differs between the ancient campaign (MCS_002:
+# infantry, cavalry, archers and spies) and the modern one (MCS_003 to
+# MCS_005: the seven-type roster): rosters and starting armies, resources,
+# the costs and rates of the turn rules, and the event names of the
+# era-specific messages. Terrains and the terrain, weather and time rules come
+# from the era's rule file (mcs_core/data/<era>_rules.json, see mcs_core.rules).
+# CampaignState and CampaignEngine take an era and play the same turn loop for
+# every era, so an optimization of the engine benefits every variant.
+#
+#   engine = CampaignEngine(era=ANCIENT, advisors=(), seed=1)
+
+import copy
+
+from .army import ANCIENT_ROSTER, ANCIENT_ENEMY_ROSTER, MODERN_ROSTER, MODERN_ENEMY_ROSTER
+from .rules import Rules, load_rules
+
+class Era:
+    """Static description of one era of the campaign."""
+
+    def __init__(self, name, roster, enemy_roster, units, enemy_units, resources, rules,
+                 recruit_dist, ai_distribution, morale_power, recruit_cost,
+                 fort_cost, loss_fatigue, unrest_gold, rain_event, ai_shift_event, unit_counts_events,
+                 force_scale, colors, recruit_label, kernel=False, start_event="campaign_start", advice_events=None):
+        self.name = name
+        self.roster = roster
+        self.enemy_roster = enemy_roster
+        self.units = tuple(units)  # starting counts, in roster order
+        self.enemy_units = tuple(enemy_units)
+        self.resources = dict(resources)
+        self.rules = rules  # compiled terrain, weather and time rules (mcs_core.rules.Rules)
+        self.terrain_types = rules.terrain_types
+        self.recruit_dist = tuple(recruit_dist)  # default recruitment split (%)
+        self.ai_distribution = tuple(ai_distribution)  # enemy AI's guess of the player's split before any battle
+        self.morale_power = morale_power  # battle power multiplied by 1 + morale * morale_power
+        self.recruit_cost = recruit_cost  # gold per recruit point
+        self.fort_cost = fort_cost
+        self.loss_fatigue = loss_fatigue  # losses adding 1.0 fatigue
+        self.unrest_gold = unrest_gold
+        self.rain_event = rain_event
+        self.ai_shift_event = ai_shift_event
+        self.unit_counts_events = unit_counts_events  # (player, enemy)
+        self.start_event = start_event
+        self.advice_events = dict(advice_events or {})  # advisor name -> event, replacing CampaignEngine.ADVISORS'
+        self.force_scale = force_scale  # forces plotted as 1.0 in the GUI graph
+        self.colors = tuple(colors)  # composition graph colors, in roster order
+        self.recruit_label = recruit_label  # unit abbreviations of the GUI recruitment field
+        self.kernel = kernel  # the NumPy kernel (batch runs, MCTS rollouts) plays this era
+        self.spies = roster.index["spies"]
+
+    def variant(self, **changes):
+        """Copy of the era with some attributes changed, e.g. the wording of a launcher's messages."""
+        era = copy.copy(self)
+        for name, value in changes.items():
+            if not hasattr(era, name):
+                raise AttributeError(f"Era has no attribute '{name}'.")
+            setattr(era, name, value)
+        return era
+
+    def with_rules(self, rules):
+        """Copy of the era playing other rules (a Rules, or a rule file compiled for the era's rosters)."""
+        if not isinstance(rules, Rules):
+            rules = load_rules(rules, self.roster, self.enemy_roster)
+        # the kernel plays the built-in modern rules only
+        return self.variant(rules=rules, terrain_types=rules.terrain_types, kernel=False)
+
+    def __repr__(self):
+        return f"Era({self.name!r})"
+
+ANCIENT = Era(
+    "ancient", ANCIENT_ROSTER, ANCIENT_ENEMY_ROSTER,
+    units=(5000, 3000, 2000, 100), enemy_units=(4800, 2800, 2200, 90),
+    resources={"gold": 1000, "recruit_points": 150, "fortification": 0},
+    rules=load_rules("ancient_rules.json", ANCIENT_ROSTER, ANCIENT_ENEMY_ROSTER),
+    recruit_dist=(70, 15, 10, 5), ai_distribution=(0.7, 0.15, 0.1, 0.05),
+    morale_power=0.3, recruit_cost=2, fort_cost=20, loss_fatigue=20000, unrest_gold=50,
+    rain_event="rain_archers", ai_shift_event="enemy_ai_adjusts",
+    unit_counts_events=("ancient_unit_counts", "ancient_enemy_unit_counts"), start_event="ancient_campaign_start",
+    force_scale=20000, colors=('#559966', '#9763a6', '#e6d44a', '#555555'), recruit_label="Inf/Cav/Arch/Spy",
+)
+
+MODERN = Era(
+    "modern", MODERN_ROSTER, MODERN_ENEMY_ROSTER,
+    units=(3000, 1500, 500, 300, 100, 200, 100), enemy_units=(2800, 1400, 450, 320, 90, 180, 90),
+    resources={"gold": 2000, "recruit_points": 300, "fortification": 0},
+    rules=load_rules("modern_rules.json", MODERN_ROSTER, MODERN_ENEMY_ROSTER),
+    recruit_dist=(40, 20, 10, 10, 10, 5, 5), ai_distribution=(0.7, 0.15, 0.1, 0.05, 0, 0, 0),
+    morale_power=0.0, recruit_cost=5, fort_cost=50, loss_fatigue=30000, unrest_gold=100,
+    rain_event="rain", ai_shift_event="enemy_ai_shift",
+    unit_counts_events=("unit_counts", "enemy_unit_counts"),
+    force_scale=30000, colors=('#559966', '#9763a6', '#e6d44a', '#ffa500', '#4a90e2', '#c04adb', '#555555'),
+    recruit_label="Inf/MechIn/Tank/Artillery/Missiles/Aircraft/Spy",
+    kernel=True,
+)
+
+ERAS = {era.name: era for era in (ANCIENT, MODERN)}
@@ -0,0 +1,217 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - structured event log
+#
+# Engine messages are recorded as typed events (turn, category, code, numeric
+# payload) in a columnar buffer of flat arrays, and only turned into text when
+# somebody reads them (the GUI log window, an export). Batch runs therefore
+# never build the message strings, and the events can be counted and filtered
+# by code, category or turn.
+#
+# Each event code has a category (the GUI color tag), a str.format template and
+# a payload spec with one letter per value: "i" int, "f" float, "s" string.
+# Numbers go to one flat float array and strings to one flat list.
+
+from array import array
+from bisect import bisect_right
+
+EVENT_TYPES = [
+    # code, category, template, payload spec
+    ("message", "info", "{0}", "s"),
+    ("campaign_start", "info", "=== Starting Simulation (Enemy AI: {0}) ===", "s"),
+    ("turn_start", "info", "\n--- Turn {0} ---", "i"),
+    ("night", "event", "Combat effectiveness reduced due to night time.", ""),
+    ("rain", "event", "Rain reduces artillery and aircraft effectiveness.", ""),
+    ("wind", "event", "Wind affects projectile weapons unpredictably.", ""),
+    ("supply_disrupted", "sabotage", "Supply line disrupted! Fatigue increased by {0:.2f}.", "f"),
+    ("distract", "event", "Distract enemy before battle to reduce focus.", ""),
+    ("retreat_route", "event", "Allow enemy a retreat route to avoid desperate combat.", ""),
+    ("target_supply", "event", "Target enemy supply lines to weaken them.", ""),
+    ("feign_retreat", "event", "Feign a retreat to lure enemy into an ambush.", ""),
+    ("ambush_success", "event", "Ambush successful! Enemy suffers heavy losses.", ""),
+    ("ambush_failed", "event", "Ambush failed, troops confused.", ""),
+    ("spy_sabotage", "spy", "Spies sabotaged enemy supply lines successfully.", ""),
+    ("spy_misinformation", "spy", "Spies spread misinformation, confusing enemy command.", ""),
+    ("no_spies", "spy", "No spies available for operations.", ""),
+    ("recruited", "recruitment", "Recruited {0} {1}.", "is"),
+    ("no_gold", "defeat", "Not enough gold to recruit new troops.", ""),
+    ("fort_maintained", "event", "Fortifications maintained, reducing fatigue.", ""),
+    ("fort_failed", "defeat", "Failed to maintain fortifications, fatigue increases.", ""),
+    ("enemy_avoids", "event", "Enemy chooses to avoid direct confrontation.", ""),
+    ("enemy_feint", "spy", "Enemy performs feints and misdirection.", ""),
+    ("inflicted_losses", "victory", "Your army inflicted {0} losses to the enemy.", "i"),
+    ("player_losses", "defeat", "Your army suffered {0} losses.", "i"),
+    ("enemy_losses", "victory", "Enemy suffered {0} losses.", "i"),
+    ("support_up", "victory", "Local population support increased! Recruit points grew.", ""),
+    ("support_down", "defeat", "Population fearful of losses, recruit points declined.", ""),
+    ("unrest", "defeat", "High fatigue causing political unrest! Reduced resource gains.", ""),
+    ("enemy_ai_shift", "spy", "Enemy AI shifts to {0} strategy based on battle outcomes.", "s"),
+    ("chess_advice", "event", "Chess AI Recommendation: {0}", "s"),
+    ("go_advice", "event", "Go AI Recommendation: {0}", "s"),
+    ("turn_end", "info", "End of turn {0}:", "i"),
+    ("unit_counts", "info", "  Your unit counts: Infantry={0}, Mechanized Infantry={1}, Tanks={2}, Artillery={3}, Missiles={4}, Aircraft={5}, Spies={6}", "iiiiiii"),
+    ("enemy_unit_counts", "info", "  Enemy unit counts: Infantry={0}, Mechanized Infantry={1}, Tanks={2}, Artillery={3}, Missiles={4}, Aircraft={5}, Spies={6}", "iiiiiii"),
+    ("morale", "info", "  Morale: You={0:.2f}, Enemy={1:.2f}", "ff"),
+    ("fatigue_supply", "info", "  Fatigue: {0:.2f}, Supply level: {1:.2f}", "ff"),
+    ("resources", "info", "  Resources: Gold={0}, Recruit Points={1}, Fortifications={2}", "iii"),
+    ("environment", "info", "  Terrain: {0}, Weather: {1}, Time: {2}", "sss"),
+    ("army_destroyed", "defeat", "Your army has been destroyed! Campaign lost.", ""),
+    ("enemy_destroyed", "victory", "Enemy army defeated! Campaign won!", ""),
+    ("campaign_end", "event", "\n=== Simulation Ended ===", ""),
+    ("final_forces", "info", "Final forces - You: {0}, Enemy: {1}", "ii"),
+    ("campaign_won", "victory", "Campaign successful! Congratulations!", ""),
+    ("campaign_lost", "defeat", "Campaign lost or suspended.", ""),
+    # Ancient era variants (appended: codes are stored in snapshots)
+    ("rain_archers", "event", "Rain reduces archer effectiveness.", ""),
+    ("enemy_ai_adjusts", "spy", "Enemy AI adjusts strategy to {0} based on battle outcomes.", "s"),
+    ("ancient_unit_counts", "info", "  Your force counts: Infantry={0}, Cavalry={1}, Archers={2}, Spies={3}", "iiii"),
+    ("ancient_enemy_unit_counts", "info", "  Enemy force counts: Infantry={0}, Cavalry={1}, Archers={2}, Spies={3}", "iiii"),
+    # Wording of the MCS_002 to MCS_004 scripts
+    ("ancient_campaign_start", "info", "=== Starting Advanced Military Campaign Simulation (Enemy AI: {0}) ===", "s"),
+    ("modern_campaign_start", "info", "=== Starting Modern Military Campaign Simulation (Enemy AI: {0}) ===", "s"),
+    ("ai_advice", "event", "AI Recommendation: {0}", "s"),
+]
+EVENT_CODES = {name: code for code, (name, _, _, _) in enumerate(EVENT_TYPES)}
+CATEGORIES = ["info", "victory", "defeat", "recruitment", "sabotage", "spy", "event"]
+CODE_CATEGORY = [CATEGORIES.index(category) for _, category, _, _ in EVENT_TYPES]
+
+def describe(name):
+    """Text of an event without payload."""
+    return EVENT_TYPES[EVENT_CODES[name]][2]
+
+def category_id(category):
+    if category not in CATEGORIES:
+        CATEGORIES.append(category)
+    return CATEGORIES.index(category)
+
+# Payload layout per code: "n" all numbers, "s" all strings, else the spec itself (mixed)
+PAYLOAD_LAYOUT = ["s" if spec and set(spec) == {"s"} else "n" if "s" not in spec else spec
+                  for _, _, _, spec in EVENT_TYPES]
+
+class EventLog:
+    """Columnar event buffer. Indexing and iteration yield the formatted messages,
+    so it can stand in for the former list of log strings.
+
+    Recording is kept to a couple of array appends: turns are marked once with
+    start_turn() (turn_starts/turn_numbers), categories are stored only when they
+    differ from the code's default, and payload offsets are rebuilt when the log
+    is read.
+    """
+
+    def __init__(self):
+        self.codes = array("h")
+        self.values = array("d")  # numeric payloads back to back
+        self.texts = []  # string payloads back to back
+        self.turn_starts = array("q", [0])  # index of the first event of each turn
+        self.turn_numbers = array("i", [0])
+        self.category_overrides = {}
+        self._offsets = [(0, 0)]
+
+    def start_turn(self, turn):
+        """Following events belong to `turn` (the log starts at turn 0)."""
+        if self.turn_starts[-1] == len(self.codes):
+            self.turn_numbers[-1] = turn
+        else:
+            self.turn_starts.append(len(self.codes))
+            self.turn_numbers.append(turn)
+
+    def record(self, code, payload=(), category=None):
+        """Append one event; `category` overrides the default category of the code."""
+        if category is not None and category_id(category) != CODE_CATEGORY[code]:
+            self.category_overrides[len(self.codes)] = category_id(category)
+        self.codes.append(code)
+        if payload:
+            layout = PAYLOAD_LAYOUT[code]
+            if layout == "n":
+                self.values.extend(payload)
+            elif layout == "s":
+                self.texts.extend(payload)
+            else:
+                for kind, value in zip(layout, payload):
+                    if kind == "s":
+                        self.texts.append(value)
+                    else:
+                        self.values.append(value)
+
+    def clear(self):
+        self.__init__()
+
+    def __len__(self):
+        return len(self.codes)
+
+    def offsets(self):
+        """(numeric, string) payload offsets of every event, extended since the last read."""
+        offsets = self._offsets
+        n, t = offsets[-1]
+        for code in self.codes[len(offsets) - 1:]:
+            spec = EVENT_TYPES[code][3]
+            strings = spec.count("s")
+            n += len(spec) - strings
+            t += strings
+            offsets.append((n, t))
+        return offsets
+
+    def turn(self, k):
+        return self.turn_numbers[bisect_right(self.turn_starts, k) - 1]
+
+    def payload(self, k):
+        spec = EVENT_TYPES[self.codes[k]][3]
+        offsets = self.offsets()
+        (n, t), (n_end, t_end) = offsets[k], offsets[k + 1]
+        numbers = iter(self.values[n:n_end])
+        texts = iter(self.texts[t:t_end])
+        return tuple(next(texts) if kind == "s" else int(next(numbers)) if kind == "i" else next(numbers)
+                     for kind in spec)
+
+    def category(self, k):
+        return CATEGORIES[self.category_overrides.get(k, CODE_CATEGORY[self.codes[k]])]
+
+    def format(self, k):
+        return EVENT_TYPES[self.codes[k]][2].format(*self.payload(k))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.format(k) for k in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event index out of range")
+        return self.format(index)
+
+    def __iter__(self):
+        return (self.format(k) for k in range(len(self)))
+
+    def select(self, code=None, category=None, turn=None):
+        """Indices of the events matching every given filter (code and category by name)."""
+        if turn is not None:
+            if turn not in self.turn_numbers:
+                return []
+            t = self.turn_numbers.index(turn)
+            stop = self.turn_starts[t + 1] if t + 1 < len(self.turn_starts) else len(self)
+            candidates = range(self.turn_starts[t], stop)
+        else:
+            candidates = range(len(self))
+        code = EVENT_CODES[code] if code is not None else None
+        return [k for k in candidates
+                if (code is None or self.codes[k] == code)
+                and (category is None or self.category(k) == category)]
+
+    def records(self, **filters):
+        """(turn, category, code name, payload) of the matching events."""
+        return [(self.turn(k), self.category(k), EVENT_TYPES[self.codes[k]][0], self.payload(k))
+                for k in self.select(**filters)]
+
+    def category_counts(self, start=0):
+        """Number of events per category from event `start` on."""
+        result = {}
+        for k in range(start, len(self)):
+            category = self.category(k)
+            result[category] = result.get(category, 0) + 1
+        return result
+
+    def counts(self):
+        """Number of events per code name."""
+        result = {}
+        for code in self.codes:
+            name = EVENT_TYPES[code][0]
+            result[name] = result.get(name, 0) + 1
+        return result
@@ -0,0 +1,157 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - streaming report export
+#
+# Rows are written as they are produced, so the memory used does not grow with
+# the size of the report: Excel through openpyxl's write-only mode, CSV through
+# the csv module and Parquet through pyarrow (optional, written in row groups).
+# A whole Monte Carlo batch can be exported as campaign x turn rows; campaigns
+# are played one after the other and only the current one is held in memory.
+#
+# Usage: python -m mcs_core.export --campaigns 1000 --turns 100 --seed 1 --out runs.parquet
+
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from .engine import CampaignEngine, parse_recruit_dist, DEFAULT_RECRUIT_DIST
+
+HEADERS = ["Turn", "Total Forces", "Enemy Total Forces", "Morale", "Enemy Morale",
+           "Fatigue", "Supply", "Resources Gold", "Recruit Points", "Fortifications",
+           "Terrain", "Weather", "Time", "Key Actions", "Special Actions", "Enemy AI Personality"]
+FORMATS = ("xlsx", "csv", "parquet")
+
+def history_rows(history, campaign=None):
+    """Report rows of a TurnHistory, read column by column; `campaign` prepends a campaign id."""
+    n = len(history)
+    if n == 0:
+        return
+    numbers = [history[name].tolist() for name in ("turn", "forces_total", "enemy_forces_total")]
+    rounded = [[round(x, 2) for x in history[name].tolist()] for name in ("morale", "enemy_morale", "fatigue", "supply")]
+    resources = [history[name].tolist() for name in ("gold", "recruit_points", "fortification")]
+    labels = [history.labels(name) for name in ("terrain", "weather", "time")]
+    special = history["special_actions"].tolist()
+    enemy_ai = history.labels("enemy_ai")
+    prefix = [] if campaign is None else [campaign]
+    for k in range(n):
+        yield prefix + [numbers[0][k], numbers[1][k], numbers[2][k],
+                        rounded[0][k], rounded[1][k], rounded[2][k], rounded[3][k],
+                        resources[0][k], resources[1][k], resources[2][k],
+                        labels[0][k], labels[1][k], labels[2][k],
+                        "; ".join(history.actions(k)), special[k], enemy_ai[k]]
+
+class ExcelWriter:
+    def __init__(self, path, headers, title="Campaign Simulation"):
+        import openpyxl
+        self.path = path
+        self.wb = openpyxl.Workbook(write_only=True)
+        self.ws = self.wb.create_sheet(title)
+        self.ws.append(headers)
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.ws.append(row)
+
+    def close(self):
+        self.wb.save(self.path)
+
+class CsvWriter:
+    def __init__(self, path, headers):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """Buffers `row_group` rows, then writes them as one Parquet row group."""
+
+    def __init__(self, path, headers, row_group=65536):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow).")
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.headers = headers
+        self.row_group = row_group
+        self.buffer = []
+        self.writer = None
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.buffer.append(row)
+            if len(self.buffer) >= self.row_group:
+                self._flush()
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        table = self.pa.Table.from_arrays([self.pa.array(col) for col in zip(*self.buffer)], names=self.headers)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.buffer = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+WRITERS = {"xlsx": ExcelWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+def open_writer(path, headers=HEADERS, fmt=None):
+    """Writer for `path`; the format defaults to the file extension."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {', '.join(FORMATS)}.")
+    return WRITERS[fmt](path, headers)
+
+def export_history(history, path, fmt=None):
+    writer = open_writer(path, HEADERS, fmt)
+    try:
+        writer.write_rows(history_rows(history))
+    finally:
+        writer.close()
+    return len(history)
+
+def export_batch(path, n_campaigns, turns, recruit_dist=None, seed=None, fmt=None):
+    """Play n_campaigns campaigns and stream every (campaign, turn) row to `path`; returns the row count."""
+    root = np.random.SeedSequence(seed)
+    engine = CampaignEngine(recruit_dist=recruit_dist, advisors=False)
+    writer = open_writer(path, ["Campaign"] + HEADERS, fmt)
+    rows = 0
+    try:
+        for campaign in range(n_campaigns):
+            engine.reset(seed=root.spawn(1)[0])
+            engine.run(turns)
+            writer.write_rows(history_rows(engine.sim_data, campaign))
+            rows += len(engine.sim_data)
+    finally:
+        writer.close()
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the per-turn history of a batch of campaigns")
+    parser.add_argument("--campaigns", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--recruit", default="/".join(str(x) for x in DEFAULT_RECRUIT_DIST))
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", required=True, help="output file (.xlsx, .csv or .parquet)")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="overrides the file extension")
+    args = parser.parse_args(argv)
+    if args.campaigns <= 0 or args.turns <= 0:
+        parser.error("--campaigns and --turns must be positive")
+    rows = export_batch(args.out, args.campaigns, args.turns, parse_recruit_dist(args.recruit), args.seed, args.format)
+    print(f"Exported {rows} rows ({args.campaigns} campaigns) to {args.out}")
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - Tk front end shared by the launchers
+#
+# The window of MCS_002.py to MCS_005.py: log, live graph and controls around a
+# CampaignEngine of the launcher's era, with the advisors it asks for. The
+# engine runs in a worker thread (CampaignRunner); campaigns can be paused,
+# stepped, cancelled, fast-forwarded, saved as snapshots, rewound to a
+# checkpoint and, for eras played by the NumPy kernel, fought against a
+# planning (MCTS) enemy. A fast-forward plays its turns without log lines or
+# graph updates and shows one condensed log and one graph when it ends.
+# This is the only module of the package that needs tkinter and matplotlib;
+# it is not imported by mcs_core itself.
+#
+#   CampaignSimulatorGUI(tk.Tk(), era=ANCIENT, advisors=(), title="...")
+
+import tkinter as tk
+from tkinter import messagebox, filedialog, simpledialog
+from tkinter.scrolledtext import ScrolledText
+from datetime import datetime
+import time
+import queue
+from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import json
+import zipfile
+import numpy as np
+from .engine import CampaignEngine, parse_recruit_dist
+from .eras import MODERN
+from .state import EnhancedEnemyAI
+from .export import export_history
+from .logsink import TextLogSink
+from .mcts import mcts_enemy_factory
+from .runner import CampaignRunner
+from .checkpoint import CheckpointStore
+from .snapshot import save_snapshot, load_snapshot, SNAPSHOT_EXTENSION
+
+class CampaignSimulatorGUI:
+    """Campaign window for one era; `advisors` as for CampaignEngine."""
+
+    LOG_COLORS = {'info': 'black', 'victory': 'blue', 'defeat': 'red', 'recruitment': 'green',
+        'sabotage': 'orange', 'spy': 'purple', 'event': 'brown'
+    }
+    # (key, label, color, linestyle) of the per-turn curves
+    GRAPH_LINES = [("forces", 'Your Forces (Normalized)', 'blue', '-'), ("enemy", 'Enemy Forces (Normalized)', 'red', '-'),
+        ("morale", 'Morale', 'darkgreen', '-'), ("fatigue", 'Fatigue', 'brown', '-'), ("supply", 'Supply', 'orange', '-'),
+        ("actions", 'Special Actions', 'purple', '-'), ("ai", 'Enemy AI Personality (1=Agg,0.5=Dec,0=Def)', 'm', '--')
+    ]
+    PERSONALITY_LEVEL = {"aggressive": 1.0, "deceptive": 0.5, "defensive": 0.0}
+    GRAPH_FPS = 10  # at most this many graph redraws per second while a campaign runs
+    POLL_MS = 30  # period of the event queue polling
+    POLL_BUDGET = 0.02  # seconds of GUI work per poll, the rest waits for the next one
+    MCTS_BUDGET_MS = 20  # search time of the planning enemy per turn
+    
+    def __init__(self, root, era=MODERN, advisors=True, title="Modern Campaign Simulator - Sun Tzu, Chess & Go AI"):
+        self.root = root
+        self.root.title(title)
+        self.fullscreen = False
+        self.era = era
+        self.engine = CampaignEngine(era=era, advisors=advisors)
+        self.runner = CampaignRunner(self.engine)  # the engine runs in a worker thread, events come back through a queue
+        self.resume_loaded = False  # Run continues a loaded snapshot instead of starting over
+        self.fast_forward_from = None  # (first event, first turn) of the running fast-forward
+        self.checkpoints = CheckpointStore(self.engine, every=10)
+        self.poll_id = None
+        self.log_text = ScrolledText(root, state='disabled', width=120, height=22, wrap='word'); self.log_text.pack(padx=10, pady=5)
+        self.log_sink = TextLogSink(root, self.log_text, self.LOG_COLORS)
+        self.fig = Figure(figsize=(12, 4), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=root)
+        self.canvas.get_tk_widget().pack(padx=10, pady=5)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.reset_graph()
+        control_frame = tk.Frame(root); control_frame.pack(pady=5)
+        tk.Label(control_frame, text="Number of Turns:").grid(row=0, column=0, padx=5)
+        self.turns_var = tk.IntVar(value=10)
+        self.turns_entry = tk.Entry(control_frame, width=5, textvariable=self.turns_var); self.turns_entry.grid(row=0, column=1)
+        default_dist = "/".join(str(x) for x in era.recruit_dist)
+        tk.Label(control_frame, text=f"Recruitment % - {era.recruit_label} (e.g. {default_dist}):").grid(row=1, column=0, padx=5)
+        self.recruit_dist_var = tk.StringVar(value=default_dist)
+        self.recruit_dist_entry = tk.Entry(control_frame, width=20, textvariable=self.recruit_dist_var); self.recruit_dist_entry.grid(row=1, column=1)
+        self.run_button = tk.Button(control_frame, text="Run Simulation", command=self.run_simulation)
+        self.run_button.grid(row=0, column=2, padx=5)
+        self.clear_button = tk.Button(control_frame, text="Clear Logs and Graphs", command=self.clear_logs_graph)
+        self.clear_button.grid(row=0, column=3, padx=5)
+        self.export_button = tk.Button(control_frame, text="Export Excel Report", command=self.export_excel, state='disabled')
+        self.export_button.grid(row=0, column=4, padx=5)
+        self.save_button = tk.Button(control_frame, text="Save", command=self.save_campaign)
+        self.save_button.grid(row=1, column=2, padx=5)
+        self.load_button = tk.Button(control_frame, text="Load", command=self.load_campaign)
+        self.load_button.grid(row=1, column=3, padx=5)
+        self.full_button = tk.Button(control_frame, text="Full Screen", command=self.toggle_fullscreen)
+        self.full_button.grid(row=1, column=4, padx=5)
+        tk.Label(control_frame, text="Seed (optional, for reproducible runs):").grid(row=2, column=0, padx=5)
+        self.seed_var = tk.StringVar(value="")
+        self.seed_entry = tk.Entry(control_frame, width=20, textvariable=self.seed_var); self.seed_entry.grid(row=2, column=1)
+        self.pause_button = tk.Button(control_frame, text="Pause", command=self.toggle_pause, state='disabled')
+        self.pause_button.grid(row=2, column=2, padx=5)
+        self.step_button = tk.Button(control_frame, text="Step", command=self.step_turn)
+        self.step_button.grid(row=2, column=3, padx=5)
+        self.cancel_button = tk.Button(control_frame, text="Cancel", command=self.runner.cancel, state='disabled')
+        self.cancel_button.grid(row=2, column=4, padx=5)
+        tk.Label(control_frame, text="Checkpoint every (turns):").grid(row=3, column=0, padx=5)
+        self.checkpoint_var = tk.IntVar(value=10)
+        self.checkpoint_entry = tk.Entry(control_frame, width=5, textvariable=self.checkpoint_var); self.checkpoint_entry.grid(row=3, column=1)
+        self.rewind_button = tk.Button(control_frame, text="Rewind to Checkpoint", command=self.rewind_campaign)
+        self.rewind_button.grid(row=3, column=2, padx=5)
+        self.mcts_var = tk.BooleanVar(value=False)
+        if era.kernel:  # the planning enemy plays its rollouts on the NumPy kernel
+            self.mcts_check = tk.Checkbutton(control_frame, text="Planning enemy (MCTS)", variable=self.mcts_var)
+            self.mcts_check.grid(row=3, column=3, padx=5)
+        tk.Label(control_frame, text="Fast-forward (turns):").grid(row=4, column=0, padx=5)
+        self.fast_var = tk.IntVar(value=500)
+        self.fast_entry = tk.Entry(control_frame, width=5, textvariable=self.fast_var); self.fast_entry.grid(row=4, column=1)
+        self.fast_button = tk.Button(control_frame, text="Fast-Forward", command=self.fast_forward)
+        self.fast_button.grid(row=4, column=2, padx=5)
+        self.init_advanced_parameters()
+
+    @property
+    def state(self):
+        return self.engine.state
+
+    @property
+    def logs(self):
+        return self.engine.logs
+
+    @property
+    def sim_data(self):
+        return self.engine.sim_data
+
+    def log(self, message, event_type="info"):
+        self.engine.log(message, event_type)
+        self.schedule_poll()
+
+    def schedule_poll(self):
+        if self.poll_id is None:
+            self.poll_id = self.root.after(self.POLL_MS, self.poll_events)
+
+    def poll_events(self):
+        """Dispatch queued engine events to the on_* handlers, within POLL_BUDGET per call."""
+        events = self.runner.events
+        deadline = time.perf_counter() + self.POLL_BUDGET
+        try:
+            while time.perf_counter() < deadline:
+                event = events.get_nowait()
+                kind = event[0]
+                if kind == "log":
+                    self.on_log(*event[1:])
+                elif kind == "turn":
+                    self.on_turn(*event[1:])
+                elif kind == "finish":
+                    self.on_finish(*event[1:])
+                elif kind == "error":
+                    self.fast_forward_from = None
+                    self.set_running(False)
+                    messagebox.showerror("Simulation Error", str(event[1]))
+        except queue.Empty:
+            pass
+        self.poll_id = None
+        if self.runner.running or not events.empty():
+            self.schedule_poll()
+
+    # Engine events, dispatched on the Tk thread
+    def on_log(self, message, event_type):
+        self.log_sink.write(message, event_type)
+
+    def clear_logs_graph(self):
+        self.resume_loaded = False
+        self.log_sink.clear()
+        self.logs.clear()
+        self.sim_data.clear()
+        self.reset_graph()
+        self.canvas.draw()
+        self.export_button.config(state='disabled')
+        self.log("Logs and graphs cleared.", event_type="event")
+        
+    def export_excel(self):
+        if not self.sim_data:
+            messagebox.showwarning("No Data", "No data available for export.")
+            return
+        filename = f"campaign_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        export_history(self.sim_data, filename)
+        self.log(f"Excel report exported to: {filename}", event_type="event")
+        messagebox.showinfo("Export Complete", f"Report saved as:\n{filename}")
+        
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        self.root.attributes('-fullscreen', self.fullscreen)
+        
+    def save_campaign(self):
+        file = filedialog.asksaveasfilename(defaultextension=SNAPSHOT_EXTENSION,
+                                            filetypes=[("Campaign snapshot", "*" + SNAPSHOT_EXTENSION)])
+        if file:
+            save_snapshot(self.engine, file)
+            self.log(f"Campaign saved ({file})", event_type="event")
+            
+    def load_campaign(self):
+        file = filedialog.askopenfilename(defaultextension=SNAPSHOT_EXTENSION,
+                                          filetypes=[("Campaign snapshot", "*" + SNAPSHOT_EXTENSION), ("JSON (old format)", "*.json")])
+        if not file:
+            return
+        if not zipfile.is_zipfile(file):  # .npz snapshots are zip archives, older saves are JSON
+            self.load_json_campaign(file)
+            return
+        try:
+            load_snapshot(file, self.engine)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Load Error", f"Could not load the campaign:\n{e}")
+            return
+        self.checkpoints.clear()
+        self.show_restored_campaign(f"Campaign loaded successfully (turn {self.engine.turn}), Run continues it.")
+
+    def rewind_campaign(self):
+        if not self.checkpoints.turns:
+            messagebox.showinfo("Rewind", "No checkpoint yet: run a campaign for at least one checkpoint interval.")
+            return
+        turn = simpledialog.askinteger("Rewind", f"Resume from turn ({', '.join(str(t) for t in self.checkpoints.turns)}):",
+                                       initialvalue=self.checkpoints.turns[-1], parent=self.root)
+        if turn is None:
+            return
+        try:
+            self.checkpoints.resume(turn)
+        except KeyError as e:
+            messagebox.showerror("Rewind", e.args[0])
+            return
+        self.show_restored_campaign(f"Rewound to turn {turn}, Run continues from there.")
+
+    def show_restored_campaign(self, message):
+        """Redisplay the log and graph of a loaded or rewound campaign; Run continues it from its last turn."""
+        self.log_sink.clear()
+        for k in range(len(self.logs)):
+            self.log_sink.write(self.logs.format(k), self.logs.category(k))
+        self.resume_loaded = True
+        self.update_graph(full=True)
+        self.export_button.config(state='normal' if self.sim_data else 'disabled')
+        self.log(message, event_type="event")
+
+    def load_json_campaign(self, file):
+        """Campaigns saved as JSON before snapshots: history and a partial state, not resumable."""
+        with open(file, "r") as f:
+            data = json.load(f)
+        self.sim_data.clear()
+        self.sim_data.extend(data["sim_data"])
+        loaded = data["state"]
+        self.state.resources = loaded["resources"]
+        for k, c in loaded["units"].items():
+            self.state.units[k].count = c
+        for k, c in loaded["enemy_units"].items():
+            self.state.enemy_units[k].count = c
+        self.state.morale = loaded["morale"]
+        self.state.enemy_morale = loaded["enemy_morale"]
+        self.state.fatigue = loaded["fatigue"]
+        self.state.supply = loaded["supply"]
+        self.state.leadership_quality = loaded["leadership_quality"]
+        self.state.enemy_ai.personality = loaded["enemy_ai"]
+        self.state.current_terrain = loaded["current_terrain"]
+        self.state.current_weather = loaded["current_weather"]
+        self.state.current_time = loaded["current_time"]
+        self.resume_loaded = False
+        self.update_graph(full=True)
+        self.log("Campaign loaded successfully.", event_type="event")
+            
+    def init_advanced_parameters(self):
+        self.state.init_state()
+        
+    def run_simulation(self, paused=False, fast=False):
+        if self.runner.running:
+            return
+        try:
+            turns = int((self.fast_var if fast else self.turns_var).get())
+            every = int(self.checkpoint_var.get())
+            if turns <= 0 or every <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Invalid number of turns or checkpoint interval, please enter positive integers.")
+            return
+        seed = self.seed_var.get().strip()
+        try:
+            seed = int(seed) if seed else None
+            if seed is not None and seed < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Invalid seed, please enter a non-negative integer or leave it empty.")
+            return
+        self.export_button.config(state='disabled')
+        # A fast-forward continues the current campaign, Run only a loaded one
+        if (self.resume_loaded or (fast and self.engine.turn > 0)) and self.engine.reopen():
+            # Continue the loaded snapshot where it stopped
+            self.resume_loaded = False
+            self.log(f"Resuming campaign at turn {self.engine.turn + 1}.", event_type="event")
+        else:
+            self.resume_loaded = False
+            self.log_sink.clear()
+            self.checkpoints.clear()
+            self.checkpoints.every = every
+            self.state.enemy_ai_factory = mcts_enemy_factory(budget_ms=self.MCTS_BUDGET_MS) if self.mcts_var.get() else EnhancedEnemyAI
+            if seed is None:
+                seed = np.random.SeedSequence().entropy
+            self.engine.reset(self.parse_recruit_dist(self.recruit_dist_var.get()), seed=seed)
+            self.log(f"Seed: {seed}", event_type="info")
+            self.reset_graph(turns)
+            self.canvas.draw()
+        self.fast_forward_from = None
+        if fast:
+            self.log(f"Fast-forwarding {turns} turns...", event_type="event")
+            self.fast_forward_from = (len(self.logs), self.engine.turn)
+        self.runner.start(turns, paused=paused, fast=fast)
+        self.set_running(True)
+        self.schedule_poll()
+
+    def fast_forward(self):
+        """Play the fast-forward turns (continuing the current campaign if any) and render only the result."""
+        self.run_simulation(fast=True)
+
+    def show_fast_forward(self, first_event, first_turn):
+        """Condensed log of a fast-forward: event counts per category, then the last turn and the end in full."""
+        logs = self.logs
+        counts = logs.category_counts(first_event)
+        self.log_sink.write(f"Turns {first_turn + 1} to {self.engine.turn} played: {len(logs) - first_event} events "
+                            f"({', '.join(f'{n} {category}' for category, n in sorted(counts.items()))}).", "event")
+        start = max(first_event, logs.turn_starts[-1])
+        for k in range(start, len(logs)):
+            self.log_sink.write(logs.format(k), logs.category(k))
+
+    def set_running(self, running):
+        idle = 'disabled' if running else 'normal'
+        for button in (self.run_button, self.fast_button, self.clear_button, self.save_button, self.load_button, self.rewind_button):
+            button.config(state=idle)
+        self.pause_button.config(state='normal' if running else 'disabled', text="Resume" if self.runner.paused and running else "Pause")
+        self.cancel_button.config(state='normal' if running else 'disabled')
+
+    def toggle_pause(self):
+        if self.runner.paused:
+            self.runner.resume()
+        else:
+            self.runner.pause()
+        self.pause_button.config(text="Resume" if self.runner.paused else "Pause")
+
+    def step_turn(self):
+        """Play one turn; starts a paused campaign when none is running."""
+        if not self.runner.running:
+            self.run_simulation(paused=True)
+            if not self.runner.running:
+                return
+        self.runner.step()
+        self.pause_button.config(text="Resume")
+
+    def on_turn(self, record, counts=None):
+        self.append_graph(record, counts)
+        if time.perf_counter() - self.last_draw >= 1.0 / self.GRAPH_FPS:
+            self.update_graph()
+
+    def on_finish(self, won=None, cancelled=False):
+        if self.fast_forward_from is not None:
+            self.show_fast_forward(*self.fast_forward_from)
+            self.fast_forward_from = None
+            self.update_graph(full=True)
+        else:
+            self.update_graph()
+        self.log_sink.flush()
+        self.set_running(False)
+        self.export_button.config(state='normal')
+
+    def parse_recruit_dist(self, dist):
+        return parse_recruit_dist(dist, self.era)
+
+    def reset_graph(self, horizon=10):
+        """Create the persistent artists once per campaign; turns only append to their data."""
+        ax = self.ax
+        ax.clear()
+        self.graph_turns = []
+        self.graph_series = {key: [] for key, _, _, _ in self.GRAPH_LINES}
+        self.graph_compo = []
+        self.lines = [ax.plot([], [], linestyle=style, color=color, label=label, animated=True)[0]
+                      for _, label, color, style in self.GRAPH_LINES]
+        self.areas = []
+        for color, label in zip(self.era.colors, self.era.roster.names):
+            area = PolyCollection([], facecolors=color, edgecolors=color, alpha=0.3, label=label, animated=True)
+            ax.add_collection(area)
+            self.areas.append(area)
+        ax.set_title("Forces / Morale / Fatigue / Supply / Actions / AI Evolution")
+        ax.set_xlabel("Turns")
+        ax.set_ylabel("Normalized Values")
+        ax.set_xlim(1, max(2, horizon))
+        ax.set_ylim(0, 1.2)
+        self.legend = ax.legend(loc='upper right')
+        self.legend.set_animated(True)  # drawn over the areas
+        self.background = None
+        self.last_draw = 0.0
+
+    def append_graph(self, record, counts=None):
+        self.graph_turns.append(record["turn"])
+        scale = self.era.force_scale  # Normalize max likely force size
+        values = (record["forces_total"] / scale, record["enemy_forces_total"] / scale,
+                  record["morale"], record["fatigue"], record["supply"], record.get("special_actions", 0),
+                  self.PERSONALITY_LEVEL.get(record.get("enemy_ai", "deceptive"), 0.5))
+        for (key, _, _, _), value in zip(self.GRAPH_LINES, values):
+            self.graph_series[key].append(value)
+        total_f = record["forces_total"] if record["forces_total"] > 0 else 1
+        counts = counts if counts is not None else self.state.units.counts
+        self.graph_compo.append([c / total_f for c in counts])
+
+    def update_graph(self, full=False):
+        """Push the buffered turns into the artists and blit them; full=True rebuilds from sim_data."""
+        if full:
+            history = self.sim_data
+            self.reset_graph(len(history))
+            levels = np.array([self.PERSONALITY_LEVEL.get(p, 0.5) for p in history.categories["enemy_ai"]])
+            scale = self.era.force_scale
+            values = (history["forces_total"] / scale, history["enemy_forces_total"] / scale, history["morale"],
+                      history["fatigue"], history["supply"], history["special_actions"], levels[history["enemy_ai"]])
+            self.graph_turns = history["turn"].tolist()
+            for (key, _, _, _), column in zip(self.GRAPH_LINES, values):
+                self.graph_series[key] = column.tolist()
+            # per-turn compositions are not saved, use the current one
+            totals = np.where(history["forces_total"] > 0, history["forces_total"], 1)
+            self.graph_compo = (np.array(self.state.units.counts, dtype=float) / totals[:, None]).tolist()
+        turns = np.array(self.graph_turns, dtype=float)
+        for line, (key, _, _, _) in zip(self.lines, self.GRAPH_LINES):
+            line.set_data(turns, self.graph_series[key])
+        if len(turns):
+            # Stacked composition areas, drawn as steps before each turn like fill_between(step="pre")
+            xs = np.repeat(turns, 2)[:-1]
+            tops = np.cumsum(np.array(self.graph_compo), axis=1)
+            bottom = np.zeros(len(xs))
+            for idx, area in enumerate(self.areas):
+                top = np.repeat(tops[:, idx], 2)[1:]
+                area.set_verts([np.column_stack([np.concatenate([xs, xs[::-1]]), np.concatenate([top, bottom[::-1]])])])
+                bottom = top
+            if turns[-1] > self.ax.get_xlim()[1]:
+                self.ax.set_xlim(1, 2 * turns[-1])
+                self.background = None
+        if full or self.background is None:
+            self.canvas.draw()  # on_draw captures the background and blits the artists
+        else:
+            self.blit()
+        self.last_draw = time.perf_counter()
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        for artist in self.areas + self.lines + [self.legend]:
+            self.ax.draw_artist(artist)
+
+    def blit(self):
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
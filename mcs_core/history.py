@@ -0,0 +1,143 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - columnar per-turn history
+#
+# One preallocated NumPy array per field instead of one dict per turn: numbers
+# are stored as int64/float64, terrain/weather/time/enemy personality as small
+# categorical codes and the action lists as codes into a shared vocabulary.
+# Columns are exposed as zero-copy views (history["morale"]) for plotting,
+# statistics and export; indexing by turn still returns the former record dict.
+
+import numpy as np
+
+from .state import CampaignState
+
+INT_FIELDS = ["turn", "forces_total", "enemy_forces_total", "special_actions"]
+FLOAT_FIELDS = ["morale", "enemy_morale", "fatigue", "supply"]
+RESOURCE_FIELDS = ["gold", "recruit_points", "fortification"]
+CATEGORICAL_FIELDS = {
+    "terrain": list(CampaignState.terrain_types),
+    "weather": list(CampaignState.weather_conditions),
+    "time": list(CampaignState.day_night_cycle),
+    "enemy_ai": ["aggressive", "defensive", "deceptive"],
+}
+RECORD_KEYS = ["turn", "forces_total", "enemy_forces_total", "morale", "enemy_morale", "fatigue", "supply",
+               "resources", "terrain", "weather", "time", "actions", "special_actions", "enemy_ai"]
+
+class TurnHistory:
+    """Append-only table of turn records with amortized O(1) appends."""
+
+    def __init__(self, capacity=64):
+        self.n = 0
+        self.capacity = capacity
+        self.columns = {}
+        for name in INT_FIELDS + RESOURCE_FIELDS:
+            self.columns[name] = np.zeros(capacity, dtype=np.int64)
+        for name in FLOAT_FIELDS:
+            self.columns[name] = np.zeros(capacity)
+        for name in CATEGORICAL_FIELDS:
+            self.columns[name] = np.zeros(capacity, dtype=np.int8)
+        self.categories = {name: list(values) for name, values in CATEGORICAL_FIELDS.items()}
+        self.category_codes = {name: {v: i for i, v in enumerate(values)} for name, values in self.categories.items()}
+        # actions of turn k: action_codes[action_offsets[k]:action_offsets[k + 1]]
+        self.action_names = []
+        self.action_ids = {}
+        self.action_codes = np.zeros(capacity, dtype=np.int16)
+        self.action_offsets = np.zeros(capacity + 1, dtype=np.int64)
+
+    def _grow(self, n_actions):
+        if self.n == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                self.columns[name] = np.resize(column, self.capacity)
+            self.action_offsets = np.resize(self.action_offsets, self.capacity + 1)
+        end = self.action_offsets[self.n] + n_actions
+        if end > len(self.action_codes):
+            self.action_codes = np.resize(self.action_codes, max(end, 2 * len(self.action_codes)))
+
+    def _code(self, codes, values, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, record):
+        actions = record.get("actions", ())
+        self._grow(len(actions))
+        k = self.n
+        columns = self.columns
+        for name in INT_FIELDS + FLOAT_FIELDS:
+            columns[name][k] = record.get(name, 0)
+        resources = record["resources"]
+        for name in RESOURCE_FIELDS:
+            columns[name][k] = resources[name]
+        for name in CATEGORICAL_FIELDS:
+            columns[name][k] = self._code(self.category_codes[name], self.categories[name], record.get(name, "unknown"))
+        start = self.action_offsets[k]
+        for i, action in enumerate(actions):
+            self.action_codes[start + i] = self._code(self.action_ids, self.action_names, action)
+        self.action_offsets[k + 1] = start + len(actions)
+        self.n = k + 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def clear(self):
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def column(self, name):
+        """Zero-copy view of a numeric or code column over the recorded turns."""
+        return self.columns[name][:self.n]
+
+    def labels(self, name):
+        """Categorical column decoded to strings."""
+        values = self.categories[name]
+        return [values[c] for c in self.column(name)]
+
+    def actions(self, k):
+        a, b = self.action_offsets[k], self.action_offsets[k + 1]
+        return [self.action_names[c] for c in self.action_codes[a:b]]
+
+    def record(self, k):
+        c = self.columns
+        return {
+            "turn": int(c["turn"][k]),
+            "forces_total": int(c["forces_total"][k]),
+            "enemy_forces_total": int(c["enemy_forces_total"][k]),
+            "morale": float(c["morale"][k]),
+            "enemy_morale": float(c["enemy_morale"][k]),
+            "fatigue": float(c["fatigue"][k]),
+            "supply": float(c["supply"][k]),
+            "resources": {name: int(c[name][k]) for name in RESOURCE_FIELDS},
+            "terrain": self.categories["terrain"][c["terrain"][k]],
+            "weather": self.categories["weather"][c["weather"][k]],
+            "time": self.categories["time"][c["time"][k]],
+            "actions": self.actions(k),
+            "special_actions": int(c["special_actions"][k]),
+            "enemy_ai": self.categories["enemy_ai"][c["enemy_ai"][k]],
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, str):
+            return self.column(index)
+        if isinstance(index, slice):
+            return [self.record(k) for k in range(*index.indices(self.n))]
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("turn index out of range")
+        return self.record(index)
+
+    def __iter__(self):
+        return (self.record(k) for k in range(self.n))
+
+    def to_records(self):
+        return [self.record(k) for k in range(self.n)]
+
+    def nbytes(self):
+        return (sum(c.nbytes for c in self.columns.values()) + self.action_codes.nbytes
+                + self.action_offsets.nbytes)
@@ -0,0 +1,387 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - vectorized NumPy kernel
+#
+# Simulates N independent campaigns in lockstep. Unit counts are (N, 7) integer
+# arrays in UNIT_ORDER, the scalar state (morale, fatigue, supply, gold, ...) is
+# held in (N,) arrays and terrain/weather/time/personality are small integer
+# codes. The rules mirror CampaignEngine.step(); the strategic advisors are not
+# played because they never change the state.
+
+import copy
+
+import numpy as np
+
+from .army import SPIES
+from .engine import UNIT_ORDER, DEFAULT_RECRUIT_DIST
+from .eras import MODERN
+from .rng import CampaignRNG
+from .rules import WEATHER_CONDITIONS, DAY_NIGHT_CYCLE
+
+TERRAIN_TYPES = list(MODERN.terrain_types)
+PERSONALITIES = ["aggressive", "defensive", "deceptive"]
+
+AGGRESSIVE, DEFENSIVE, DECEPTIVE = range(3)
+
+# Rule tables of the modern era, [side, terrain, weather, time(, unit)]
+RULES = MODERN.rules
+ATTACK_WEIGHTS = RULES.attack
+ATTACK_LOST = RULES.attack_lost
+ATTRITION = RULES.losses
+ENV_FATIGUE = RULES.fatigue
+POOR_WEATHER = np.isin(WEATHER_CONDITIONS, ["stormy", "foggy"])
+
+PLAYER_DEFAULTS = list(MODERN.units)
+ENEMY_DEFAULTS = list(MODERN.enemy_units)
+
+def check_era(era):
+    """Raise ValueError unless the kernel plays `era` (the built-in modern rules only)."""
+    if not era.kernel:
+        raise ValueError(f"The NumPy kernel only plays the built-in modern rules, not the {era.name} era"
+                         f"{' with custom rules' if era.name == MODERN.name else ''}.")
+
+def _trunc(x):
+    return np.trunc(x).astype(np.int64)
+
+def total_forces(units):
+    return units.sum(axis=1)
+
+def environment_effects(units, enemy_units, fatigue, terrain, weather, time):
+    fatigue += ENV_FATIGUE[terrain, weather, time]
+    for side, arr in enumerate((units, enemy_units)):
+        np.maximum(0, arr - ATTRITION[side, terrain, weather, time], out=arr)
+    return fatigue
+
+def calculate_morale(morale, fatigue, supply, leadership, spy_effectiveness, weather):
+    leadership_bonus = (leadership - 0.5) * 0.3
+    spy_bonus = (spy_effectiveness - 0.5) * 0.2
+    weather_penalty = np.where(POOR_WEATHER[weather], -0.1, 0.0)
+    morale = morale - fatigue * 0.5 + (supply - 0.5) * 0.4 + leadership_bonus + spy_bonus + weather_penalty
+    return np.clip(morale, 0, 1)
+
+def resolve_battle(units, enemy_units, fatigue, terrain, weather, time):
+    factor = 1 - fatigue * 0.5
+    player_power = np.einsum("nu,nu->n", units, ATTACK_WEIGHTS[0, terrain, weather, time]) * factor
+    enemy_power = np.einsum("nu,nu->n", enemy_units, ATTACK_WEIGHTS[1, terrain, weather, time]) * factor
+    player_power -= np.einsum("nu,nu->n", units, ATTACK_LOST[0, terrain, weather, time])
+    enemy_power -= np.einsum("nu,nu->n", enemy_units, ATTACK_LOST[1, terrain, weather, time])
+    return np.maximum(0, _trunc(player_power)), np.maximum(0, _trunc(enemy_power))
+
+def apply_losses(units, losses):
+    total = total_forces(units)
+    hit = (total > 0) & (losses > 0)
+    ratio = np.where(hit, np.minimum(1, losses / np.maximum(total, 1)), 0.0)
+    lost = _trunc(units * ratio[:, None])
+    np.maximum(0, units - lost, out=units)
+    return units
+
+def resource_management(units, gold, recruit_points, fortification, fatigue, recruit_dist):
+    recruit_gain = _trunc(recruit_points * 0.1)
+    gold_spent = recruit_gain * MODERN.recruit_cost
+    can_recruit = (gold >= gold_spent) & (recruit_gain > 0)
+    gold -= np.where(can_recruit, gold_spent, 0)
+    recruited = _trunc(recruit_gain[:, None] * recruit_dist / 100)
+    units += np.where(can_recruit[:, None], recruited, 0)
+    fortified = fortification > 0
+    maintained = fortified & (gold >= MODERN.fort_cost)
+    gold -= np.where(maintained, MODERN.fort_cost, 0)
+    fatigue = np.where(maintained, np.maximum(0, fatigue - 0.05), fatigue)
+    fatigue = np.where(fortified & ~maintained, fatigue + 0.05, fatigue)
+    return fatigue, can_recruit
+
+class CampaignBatch:
+    """N campaigns played in lockstep with the vectorized kernel.
+
+    Finished campaigns are moved out of the working arrays into `final`, so
+    the per-turn cost follows the number of campaigns still being fought.
+    Working arrays hold the rows listed in `ids`; use field() for (N,) views.
+
+    Random draws come from the named numpy streams of a CampaignRNG and are
+    made for all N campaigns every turn, so campaign i sees the same numbers
+    whatever happens to the others (common random numbers across batches).
+    With crn_period=p, rows i and i+p share their draws: laying out several
+    strategies as consecutive blocks of p rows plays them on the same p
+    random scenarios.
+    """
+
+    ROW_FIELDS = ["units", "enemy_units", "morale", "enemy_morale", "fatigue", "supply",
+                  "spy_effectiveness", "gold", "recruit_points", "fortification",
+                  "terrain", "weather", "time", "personality", "memory", "memory_count",
+                  "enemy_units_total", "leadership", "recruit_dist", "player_original_forces",
+                  "enemy_original_forces", "special_actions", "turns_played"]
+    HISTORY_KEYS = ["forces_total", "enemy_forces_total", "morale", "supply", "fatigue", "enemy_morale"]
+
+    def __init__(self, n, recruit_dist=None, rng=None, leadership=0.85, personality=None,
+                 units=None, enemy_units=None, memory_len=5, crn_period=None):
+        self.size = n
+        self.crn_period = crn_period or n
+        self.n = n
+        self.ids = np.arange(n)
+        self.rng = rng if isinstance(rng, CampaignRNG) else CampaignRNG(rng, kind="numpy")
+        dist = np.asarray(recruit_dist if recruit_dist is not None else DEFAULT_RECRUIT_DIST, dtype=float)
+        self.recruit_dist = np.broadcast_to(dist, (n, len(UNIT_ORDER))).copy()
+        self.units = np.tile(np.asarray(PLAYER_DEFAULTS if units is None else units, dtype=np.int64), (n, 1))
+        self.enemy_units = np.tile(np.asarray(ENEMY_DEFAULTS if enemy_units is None else enemy_units, dtype=np.int64), (n, 1))
+        self.leadership = np.full(n, leadership, dtype=float)
+        self.morale = np.full(n, 0.7)
+        self.enemy_morale = np.full(n, 0.6)
+        self.fatigue = np.zeros(n)
+        self.supply = np.ones(n)
+        self.spy_effectiveness = np.zeros(n)
+        self.gold = np.full(n, MODERN.resources["gold"], dtype=np.int64)
+        self.recruit_points = np.full(n, MODERN.resources["recruit_points"], dtype=np.int64)
+        self.fortification = np.zeros(n, dtype=np.int64)
+        if personality is None:
+            self.personality = self._integers("ai", len(PERSONALITIES)).astype(np.int8)
+        else:
+            self.personality = np.full(n, PERSONALITIES.index(personality), dtype=np.int8)
+        self.terrain = self._integers("environment", len(TERRAIN_TYPES)).astype(np.int8)
+        self.weather = self._integers("environment", len(WEATHER_CONDITIONS)).astype(np.int8)
+        self.time = self._integers("environment", len(DAY_NIGHT_CYCLE)).astype(np.int8)
+        self.memory_len = memory_len
+        self.memory = np.zeros((n, memory_len), dtype=bool)
+        self.memory_count = np.zeros(n, dtype=np.int64)
+        self.enemy_units_total = total_forces(self.enemy_units)
+        self.player_original_forces = total_forces(self.units)
+        self.enemy_original_forces = total_forces(self.enemy_units)
+        self.special_actions = np.zeros(n, dtype=np.int64)
+        self.turns_played = np.zeros(n, dtype=np.int64)
+        self.final = {f: getattr(self, f).copy() for f in self.ROW_FIELDS}
+        self.turn = 0
+
+    @classmethod
+    def from_state(cls, state, n, turn=0, recruit_dist=None, rng=None):
+        """n copies of a CampaignState whose last completed turn is `turn` (rollouts of a planner).
+        To finish a turn already under way, set batch.turn to it and call battle()."""
+        check_era(state.era)
+        ai = state.enemy_ai
+        batch = cls(n, recruit_dist, rng, leadership=state.leadership_quality, personality=ai.personality,
+                    units=list(state.units.counts), enemy_units=list(state.enemy_units.counts), memory_len=ai.memory_len)
+        for name in ("morale", "enemy_morale", "fatigue", "supply", "spy_effectiveness"):
+            getattr(batch, name)[:] = getattr(state, name)
+        for name in ("gold", "recruit_points", "fortification"):
+            getattr(batch, name)[:] = state.resources[name]
+        batch.terrain[:] = TERRAIN_TYPES.index(state.current_terrain)
+        batch.weather[:] = WEATHER_CONDITIONS.index(state.current_weather)
+        batch.time[:] = DAY_NIGHT_CYCLE.index(state.current_time)
+        # The memory is a ring indexed by turn: outcome of turn t in slot (t - 1) % memory_len
+        for age, outcome in enumerate(reversed(ai.memory), 1):
+            batch.memory[:, (turn - age) % ai.memory_len] = outcome["player_win"]
+        batch.memory_count[:] = len(ai.memory)
+        batch.enemy_units_total[:] = state.enemy_units_total
+        batch.player_original_forces[:] = state.player_original_forces
+        batch.enemy_original_forces[:] = state.enemy_original_forces
+        batch.final = {f: getattr(batch, f).copy() for f in cls.ROW_FIELDS}
+        batch.turn = turn
+        return batch
+
+    def copy(self):
+        """Independent copy of the working arrays; the random streams are shared."""
+        other = copy.copy(self)
+        for f in self.ROW_FIELDS:
+            setattr(other, f, getattr(self, f).copy())
+        other.final = {f: values.copy() for f, values in self.final.items()}
+        other.ids = self.ids.copy()
+        return other
+
+    def _rows(self):
+        return self.ids if self.crn_period == self.size else self.ids % self.crn_period
+
+    def _random(self, stream):
+        return getattr(self.rng, stream).random(self.crn_period)[self._rows()]
+
+    def _uniform(self, stream, lo, hi):
+        return getattr(self.rng, stream).uniform(lo, hi, self.crn_period)[self._rows()]
+
+    def _integers(self, stream, hi):
+        return getattr(self.rng, stream).integers(0, hi, self.crn_period)[self._rows()]
+
+    def field(self, name):
+        out = self.final[name].copy()
+        out[self.ids] = getattr(self, name)
+        return out
+
+    @property
+    def active(self):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.ids] = True
+        return mask
+
+    @property
+    def forces_total(self):
+        return total_forces(self.field("units"))
+
+    @property
+    def enemy_forces_total(self):
+        return total_forces(self.field("enemy_units"))
+
+    def values(self, key):
+        """(N,) values of a history key, finished campaigns included."""
+        if key == "forces_total":
+            return self.forces_total
+        if key == "enemy_forces_total":
+            return self.enemy_forces_total
+        return self.field(key)
+
+    @property
+    def won(self):
+        return self.forces_total > self.enemy_forces_total
+
+    def decide_personality(self):
+        full = self.memory_count >= self.memory_len
+        win_rate = self.memory.mean(axis=1)
+        shifted = np.where(win_rate > 0.7, AGGRESSIVE, np.where(win_rate < 0.3, DEFENSIVE, DECEPTIVE))
+        self.personality = np.where(full, shifted, self.personality).astype(np.int8)
+
+    def sun_tzu_advanced_tactics(self, turn, player_forces):
+        em = self.enemy_morale
+        ef = total_forces(self.enemy_units)
+        actions = np.zeros(self.n, dtype=np.int64)
+        if turn % 3 == 0:
+            distract = em > 0.7
+            em = np.where(distract, em - 0.1, em)
+            actions += distract
+        retreat_route = (player_forces > ef * 1.2) & (em < 0.4)
+        em = np.where(retreat_route, em + 0.05, em)
+        actions += retreat_route
+        if turn % 4 == 0:
+            target_supply = ef > player_forces
+            ef = np.where(target_supply, ef - _trunc(ef * 0.05), ef)
+            actions += target_supply
+        if turn % 5 == 0:
+            feign = (ef > player_forces) & (em > 0.5)
+            ambush = feign & (self._random("combat") > 0.5)
+            ef = np.where(ambush, ef - _trunc(ef * 0.1), ef)
+            actions += 2 * feign
+        self.enemy_morale = np.clip(em, 0, 1)
+        self.enemy_units_total = np.maximum(0, ef)
+        return actions
+
+    def supply_line_event(self):
+        chance = 0.1 + self.enemy_units[:, SPIES] / 2000
+        disrupted = (self._random("espionage") < chance) & (self.supply < 0.6)
+        penalty = self._uniform("espionage", 0.1, 0.2)
+        self.fatigue = np.where(disrupted, np.minimum(self.fatigue + penalty, 1.0), self.fatigue)
+
+    def advanced_spy_operations(self):
+        spies = self.units[:, SPIES]
+        has_spies = spies > 0
+        sabotage = has_spies & (self._random("espionage") < 0.2 * (spies / 100))
+        damage = self._uniform("espionage", 0.05, 0.15)
+        self.supply = np.where(sabotage, np.maximum(0, self.supply - damage), self.supply)
+        self.enemy_morale = np.where(sabotage, np.maximum(0, self.enemy_morale - 0.05), self.enemy_morale)
+        misinformation = has_spies & (self._random("espionage") < 0.25 * (spies / 100))
+        self.enemy_morale = np.where(misinformation, np.maximum(0, self.enemy_morale - 0.07), self.enemy_morale)
+        self.spy_effectiveness = np.minimum(1.0, spies / 150)
+        return sabotage.astype(np.int64) + misinformation + ~has_spies
+
+    def _retire(self, still_active):
+        done = ~still_active
+        done_ids = self.ids[done]
+        for f in self.ROW_FIELDS:
+            arr = getattr(self, f)
+            self.final[f][done_ids] = arr[done]
+            setattr(self, f, arr[still_active])
+        self.ids = self.ids[still_active]
+        self.n = len(self.ids)
+        return done_ids
+
+    def step(self, avoid=None, feint=None):
+        """Play one turn for every campaign still running; return the ids that finished."""
+        if self.n == 0:
+            return self.ids
+        self.begin_turn()
+        return self.battle(avoid, feint)
+
+    def begin_turn(self):
+        """Steps 1-6 of a turn: environment, supply line, tactics, spies, resources and morale."""
+        self.turns_played += 1
+        self.turn += 1
+        turn = self.turn
+
+        if turn % 3 == 0:
+            self.weather = self._integers("environment", len(WEATHER_CONDITIONS)).astype(np.int8)
+        if turn % 2 == 0:
+            self.time = (1 - self.time).astype(np.int8)
+        terrain_change = self._random("environment") < 0.1
+        new_terrain = self._integers("environment", len(TERRAIN_TYPES))
+        self.terrain = np.where(terrain_change, new_terrain, self.terrain).astype(np.int8)
+
+        # 1-4. Environment, supply line, Sun Tzu tactics, spies
+        self.fatigue = environment_effects(self.units, self.enemy_units, self.fatigue, self.terrain,
+                                           self.weather, self.time)
+        self.supply_line_event()
+        actions = self.sun_tzu_advanced_tactics(turn, total_forces(self.units))
+        actions += self.advanced_spy_operations()
+
+        # 5-6. Resources and morale
+        self.fatigue, _ = resource_management(self.units, self.gold, self.recruit_points,
+                                              self.fortification, self.fatigue, self.recruit_dist)
+        self.morale = calculate_morale(self.morale, self.fatigue, self.supply, self.leadership,
+                                       self.spy_effectiveness, self.weather)
+        self.special_actions = actions
+
+    def battle(self, avoid=None, feint=None):
+        """Steps 7-11 of the turn; avoid/feint (bool or (n,) arrays) replace the personality-driven
+        enemy behaviour. Returns the ids of the campaigns that finished."""
+        turn = self.turn
+        # 7. Battle and enemy behaviour
+        player_power, enemy_power = resolve_battle(self.units, self.enemy_units, self.fatigue, self.terrain,
+                                                   self.weather, self.time)
+        self.decide_personality()
+        if avoid is None:
+            avoid = self.personality == DEFENSIVE
+        if feint is None:
+            feint = (self.personality == DECEPTIVE) | (self._random("ai") < 0.1)
+        enemy_power = np.where(avoid, enemy_power * 0.8, enemy_power)
+        player_power = np.where(feint, player_power * 0.9, player_power)
+
+        # 8. Losses
+        player_ahead = player_power > enemy_power
+        enemy_losses = np.where(player_ahead, _trunc((player_power - enemy_power) * 0.1), _trunc(player_power * 0.05))
+        player_losses = np.where(player_ahead, _trunc(enemy_power * 0.05), _trunc((enemy_power - player_power) * 0.1))
+        apply_losses(self.units, player_losses)
+        apply_losses(self.enemy_units, enemy_losses)
+
+        # 9. Fatigue and supply consumption
+        fatigue_gain = 0.05 + player_losses / MODERN.loss_fatigue
+        self.fatigue = np.minimum(1, self.fatigue + fatigue_gain)
+        self.supply = np.maximum(0, self.supply - (0.1 + fatigue_gain * 0.5))
+
+        # 10. Battle aftermath
+        pop_support_change = (enemy_losses - player_losses) / 10000
+        self.recruit_points = np.maximum(50, self.recruit_points + _trunc(pop_support_change * 50))
+        self.gold = np.where(self.fatigue > 0.8, np.maximum(0, self.gold - MODERN.unrest_gold), self.gold)
+
+        # 11. Enemy AI memory
+        self.memory[:, (turn - 1) % self.memory_len] = player_losses < enemy_losses
+        self.memory_count = np.minimum(self.memory_count + 1, self.memory_len)
+
+        still_active = (total_forces(self.units) > 0) & (total_forces(self.enemy_units) > 0)
+        if still_active.all():
+            return self.ids[:0]
+        return self._retire(still_active)
+
+    def _history_values(self, key, src, rows=slice(None)):
+        if key == "forces_total":
+            return total_forces(src["units"][rows])
+        if key == "enemy_forces_total":
+            return total_forces(src["enemy_units"][rows])
+        return src[key][rows]
+
+    def run(self, turns, record=True):
+        """Play up to `turns` turns; return per-turn (turns, N) history arrays if record is set.
+
+        Finished campaigns keep their final values for the remaining turns.
+        """
+        history = {k: np.zeros((turns, self.size)) for k in self.HISTORY_KEYS} if record else None
+        for t in range(turns):
+            done_ids = self.step()
+            if record:
+                current = {f: getattr(self, f) for f in ("units", "enemy_units", *self.HISTORY_KEYS[2:])}
+                for k in self.HISTORY_KEYS:
+                    history[k][t, self.ids] = self._history_values(k, current)
+                    if len(done_ids):
+                        history[k][t:, done_ids] = self._history_values(k, self.final, done_ids)
+            if self.n == 0:
+                break
+        return history
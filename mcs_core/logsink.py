@@ -0,0 +1,68 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - batched log sink for the Tk front ends
+#
+# Log lines are buffered as (message, event_type) records and written to the
+# Text widget with a single insert per flush, instead of one insert, tag_config,
+# scroll and update per line. A flush happens as soon as the last one is older
+# than `interval_ms` (checked on every write, so long synchronous runs keep
+# scrolling) and on a root.after timer for the tail of a burst. A caller that
+# plays its whole campaign inside a button callback (MCS_001) sets
+# process_events, so each flush also handles input and the window stays
+# responsive. Only widget methods are called: this module does not import
+# tkinter.
+
+import time
+
+class TextLogSink:
+    def __init__(self, root, widget, colors=None, interval_ms=100, process_events=False):
+        self.root = root
+        # root.update() runs the event loop (input included), update_idletasks() only redraws
+        self.refresh = root.update if process_events else root.update_idletasks
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.buffer = []
+        self.timer = None
+        self.last_flush = time.perf_counter()
+        # Tags are configured once; unknown event types keep the default color
+        for tag, color in (colors or {}).items():
+            widget.tag_config(tag, foreground=color)
+
+    def write(self, message, event_type="info"):
+        self.buffer.append((message, event_type))
+        if (time.perf_counter() - self.last_flush) * 1000 >= self.interval_ms:
+            self.flush()
+        elif self.timer is None:
+            self.timer = self.root.after(self.interval_ms, self._on_timer)
+
+    def _on_timer(self):
+        self.timer = None
+        self.flush()
+
+    def flush(self):
+        self.last_flush = time.perf_counter()
+        if not self.buffer:
+            return
+        # Consecutive lines with the same tag become one (text, tag) pair
+        chunks = []
+        text, tag = [], self.buffer[0][1]
+        for message, event_type in self.buffer:
+            if event_type != tag:
+                chunks += ("".join(text), tag)
+                text, tag = [], event_type
+            text.append(message + "\n")
+        chunks += ("".join(text), tag)
+        self.buffer.clear()
+        w = self.widget
+        w.configure(state='normal')
+        w.insert("end", *chunks)
+        w.see("end")
+        w.configure(state='disabled')
+        self.refresh()
+
+    def clear(self):
+        """Drop the pending lines and empty the widget."""
+        self.buffer.clear()
+        w = self.widget
+        w.configure(state='normal')
+        w.delete('1.0', "end")
+        w.configure(state='disabled')
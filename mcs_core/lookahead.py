@@ -0,0 +1,155 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - lookahead search for the Chess advisor
+#
+# Depth-limited expectimax over simulated turns. The player picks one of the
+# candidate actions (max node), then the enemy behaviour and the outcome of a
+# feint are chance nodes weighted by the enemy personality. A turn is played on
+# an aggregate model of the engine's battle: total forces, attack per unit,
+# morale, fatigue and supply, with the same loss, fatigue and supply rules.
+# Positions are cached in a transposition table keyed on a discretized state,
+# and the search deepens one ply at a time until max_depth or the node budget
+# (positions searched, so a seeded run gives the same advice on any machine; a
+# millisecond budget can be added with budget_ms); an iteration cut short by the
+# budget is discarded.
+
+import time
+from collections import namedtuple
+
+# (total forces, enemy total forces, morale, enemy morale, fatigue, supply)
+Position = namedtuple("Position", "forces enemy_forces morale enemy_morale fatigue supply")
+
+PLAYER_ACTIONS = ("concentrate", "fortify", "retreat", "feint", "coordinated_attack")
+# Preferred when expected values tie (e.g. every action leads to the same terminal position)
+DEFENSIVE_ACTIONS = ("fortify", "retreat")
+OPEN_TERRAIN = ("accessible", "open")
+
+SearchResult = namedtuple("SearchResult", "action value values depth nodes tt_hits ms complete")
+
+class TurnModel:
+    """One simulated turn of the aggregate battle model, from the player's side."""
+
+    def __init__(self, attack_per_unit, enemy_attack_per_unit, original_forces, enemy_original_forces,
+                 terrain="open", weather="clear", time="day", enemy_personality="deceptive", leadership=0.85):
+        self.attack = attack_per_unit
+        self.enemy_attack = enemy_attack_per_unit
+        self.original = max(1, original_forces)
+        self.enemy_original = max(1, enemy_original_forces)
+        self.open_terrain = terrain in OPEN_TERRAIN
+        self.poor_visibility = time == "night" or weather in ("foggy", "stormy")
+        self.leadership_bonus = (leadership - 0.5) * 0.3
+        # Enemy behaviour (avoid, feint) and its probability, as in EnhancedEnemyAI.adjust_behavior
+        p_feint = 1.0 if enemy_personality == "deceptive" else 0.1
+        avoid = enemy_personality == "defensive"
+        self.enemy_behaviours = [((avoid, True), p_feint)] + ([((avoid, False), 1 - p_feint)] if p_feint < 1 else [])
+
+    def outcomes(self, action):
+        """(player power factor, enemy power factor, fatigue change, morale change, supply change, probability)."""
+        if action == "concentrate":
+            return [(1.15 if self.open_terrain else 1.05, 1.0, 0.02, 0.0, 0.0, 1.0)]
+        if action == "fortify":
+            return [(0.9, 0.85, -0.03, 0.0, 0.0, 1.0)]
+        if action == "retreat":
+            return [(0.3, 0.3, -0.05, -0.05, 0.05, 1.0)]
+        if action == "feint":
+            # Like the engine's ambushes: works one time out of two
+            return [(1.0, 0.8, 0.01, 0.02, 0.0, 0.5), (0.9, 1.0, 0.01, -0.02, 0.0, 0.5)]
+        if action == "coordinated_attack":
+            return [(1.05 if self.poor_visibility else 1.2, 1.0, 0.04, 0.0, 0.0, 1.0)]
+        raise ValueError(f"Unknown action '{action}'")
+
+    def transitions(self, action):
+        """(probability, player factor, enemy factor, d_fatigue, d_morale, d_supply) over the action
+        outcomes and the enemy behaviours, the avoid/feint effects folded into the factors."""
+        return [(p * q, pf * (0.9 if feint else 1.0), ef * (0.8 if avoid else 1.0), df, dm, ds)
+                for pf, ef, df, dm, ds, p in self.outcomes(action)
+                for (avoid, feint), q in self.enemy_behaviours]
+
+    def play(self, pos, player_factor, enemy_factor, d_fatigue, d_morale, d_supply):
+        forces, enemy_forces, morale, enemy_morale, fatigue, supply = pos
+        factor = 1 - fatigue * 0.5
+        # Better morale makes the player's attacks more effective
+        player_power = forces * self.attack * factor * player_factor * (0.9 + 0.2 * morale)
+        enemy_power = enemy_forces * self.enemy_attack * factor * enemy_factor
+        if player_power > enemy_power:
+            enemy_losses = (player_power - enemy_power) * 0.1
+            player_losses = enemy_power * 0.05
+        else:
+            player_losses = (enemy_power - player_power) * 0.1
+            enemy_losses = player_power * 0.05
+        # Losses are taken as a fraction of the army, like Army.remove_fraction
+        new_forces = forces - player_losses if player_losses < forces else 0.0
+        new_enemy_forces = enemy_forces - enemy_losses if enemy_losses < enemy_forces else 0.0
+        fatigue_gain = 0.05 + player_losses / 30000
+        fatigue = min(1.0, max(0.0, fatigue + fatigue_gain + d_fatigue))
+        supply = min(1.0, max(0.0, supply - (0.1 + fatigue_gain * 0.5) + d_supply))
+        morale = min(1.0, max(0.0, morale - fatigue * 0.5 + (supply - 0.5) * 0.4 + self.leadership_bonus + d_morale))
+        enemy_morale = min(1.0, max(0.0, enemy_morale + (-0.03 if player_losses < enemy_losses else 0.03)))
+        return Position(new_forces, new_enemy_forces, morale, enemy_morale, fatigue, supply)
+
+    def evaluate(self, pos):
+        """Player's standing: force ratio balance, morale and fatigue."""
+        if pos.forces <= 0:
+            return -10.0
+        if pos.enemy_forces <= 0:
+            return 10.0
+        return (pos.forces / self.original - pos.enemy_forces / self.enemy_original
+                + 0.2 * (pos.morale - pos.enemy_morale) - 0.1 * pos.fatigue + 0.05 * pos.supply)
+
+    def key(self, pos):
+        """Discretized position for the transposition table."""
+        return (round(pos.forces / self.original * 50), round(pos.enemy_forces / self.enemy_original * 50),
+                round(pos.morale * 20), round(pos.enemy_morale * 20), round(pos.fatigue * 20), round(pos.supply * 20))
+
+class ExpectimaxSearch:
+    def __init__(self, model, actions=PLAYER_ACTIONS, max_depth=3, max_nodes=20000, budget_ms=None):
+        self.model = model
+        self.actions = actions
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.budget_ms = budget_ms
+        self.transitions = {a: model.transitions(a) for a in actions}
+        self.table = {}
+        self.nodes = 0
+        self.tt_hits = 0
+
+    def run(self, pos):
+        """Best action at `pos` with its expected value and the search statistics."""
+        start = time.perf_counter()
+        self.node_limit = self.max_nodes
+        self.deadline = start + self.budget_ms / 1000 if self.budget_ms is not None else float("inf")
+        best = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                values = {a: self.q_value(pos, a, depth) for a in self.actions}
+            except TimeoutError:
+                break
+            best = (depth, values)
+        if best is None:
+            # Not even one ply within the budget: finish it anyway, the advice needs a value
+            self.node_limit = self.deadline = float("inf")
+            best = (1, {a: self.q_value(pos, a, 1) for a in self.actions})
+        depth, values = best
+        action = max(self.actions, key=lambda a: (values[a], a in DEFENSIVE_ACTIONS))
+        return SearchResult(action, values[action], values, depth, self.nodes, self.tt_hits,
+                            (time.perf_counter() - start) * 1000, depth == self.max_depth)
+
+    def q_value(self, pos, action, depth):
+        """Expected value of playing `action` then searching depth - 1 more turns."""
+        play = self.model.play
+        return sum(p * self.value(play(pos, pf, ef, df, dm, ds), depth - 1)
+                   for p, pf, ef, df, dm, ds in self.transitions[action])
+
+    def value(self, pos, depth):
+        self.nodes += 1
+        if depth == 0 or pos.forces <= 0 or pos.enemy_forces <= 0:
+            return self.model.evaluate(pos)
+        key = (self.model.key(pos), depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            self.tt_hits += 1
+            return cached
+        if self.nodes > self.node_limit or (self.nodes & 255 == 0 and time.perf_counter() > self.deadline):
+            raise TimeoutError
+        best = max(self.q_value(pos, a, depth) for a in self.actions)
+        self.table[key] = best
+        return best
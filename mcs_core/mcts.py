@@ -0,0 +1,142 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - Monte Carlo tree search enemy AI
+#
+# MCTSEnemyAI replaces the personality rule of EnhancedEnemyAI.adjust_behavior
+# by a time-budgeted search over the enemy's battle choices: attack, avoid
+# (fight at 80% to limit losses) or feint (cut the player's power by 10%).
+# The tree is open loop: a node is a sequence of enemy choices and chance is
+# drawn again by every simulation. A simulation copies the current state into
+# the NumPy kernel, plays the choices of the selected path, then the usual
+# personality rules up to `horizon` turns, for `rollouts` campaigns at once;
+# its value is the enemy's share of the surviving forces. After the battle the
+# subtree of the choice played becomes the new root, so the search carries
+# over from one turn to the next.
+#
+#   engine = CampaignEngine(seed=1, enemy_ai_factory=mcts_enemy_factory(budget_ms=20))
+
+import functools
+import math
+import time
+
+import numpy as np
+
+from .kernel import CampaignBatch, check_era
+from .rng import CampaignRNG
+from .state import EnhancedEnemyAI
+
+# choice: (avoid, feint)
+ACTIONS = {"attack": (False, False), "avoid": (True, False), "feint": (False, True)}
+ACTION_NAMES = list(ACTIONS)
+
+class Node:
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}
+
+class MCTSEnemyAI(EnhancedEnemyAI):
+    """Enemy AI planning its battle choice with MCTS.
+
+    budget_ms bounds the search of each turn; iterations, when given, replaces
+    the time budget by a fixed number of simulations (reproducible runs).
+    The player is assumed to keep recruiting like its current army
+    (last_player_distribution) unless recruit_dist is given. Rollouts are
+    played by the NumPy kernel, so the state must be of an era it plays.
+    """
+
+    def __init__(self, personality, memory_len=5, rng=None, state=None, budget_ms=20, iterations=None,
+                 horizon=8, rollouts=16, exploration=1.4, recruit_dist=None):
+        if state is not None:
+            check_era(state.era)
+        super().__init__(personality, memory_len, rng, state)
+        self.budget_ms = budget_ms
+        self.iterations = iterations
+        self.horizon = horizon
+        self.rollouts = rollouts
+        self.exploration = exploration
+        self.recruit_dist = recruit_dist
+        self.turn = 0
+        self.root = None
+        self.last_search = {}
+
+    def reset_plan(self, turn=0):
+        """Forget the tree, e.g. after the state was restored at `turn`."""
+        self.turn = turn
+        self.root = None
+
+    def adjust_behavior(self, player_forces, enemy_forces, morale):
+        self.decide_personality()  # still reported in the log and the history
+        self.turn += 1
+        action = self.search()
+        avoid, feint = ACTIONS[action]
+        return {"confidence": action == "attack", "avoid": avoid, "feint": feint}
+
+    def search(self):
+        start = time.perf_counter()
+        if self.root is None:
+            self.root = Node()
+        # One draw of the enemy stream per turn, however many simulations the budget allows
+        rollout_rng = CampaignRNG(self.rng.getrandbits(64), kind="numpy")
+        dist = self.recruit_dist or [100 * x for x in self.last_player_distribution]
+        base = CampaignBatch.from_state(self.state, self.rollouts, self.turn - 1, dist, rollout_rng)
+        base.turn = self.turn  # the battle of this turn is next
+        deadline = start + self.budget_ms / 1000
+        n = 0
+        while (n < self.iterations if self.iterations is not None
+               else n < len(ACTIONS) or time.perf_counter() < deadline):
+            self.simulate(base)
+            n += 1
+        children = self.root.children
+        best = max(children, key=lambda a: children[a].visits)
+        self.last_search = {"iterations": n, "ms": (time.perf_counter() - start) * 1000,
+                            "visits": {a: c.visits for a, c in children.items()},
+                            "values": {a: c.value / c.visits for a, c in children.items()}}
+        self.root = children[best]  # reused next turn
+        return best
+
+    def select(self, node):
+        log_visits = math.log(node.visits)
+        c = self.exploration
+        return max(ACTION_NAMES, key=lambda a: node.children[a].value / node.children[a].visits
+                   + c * math.sqrt(log_visits / node.children[a].visits))
+
+    def simulate(self, base):
+        node = self.root
+        path = [node]
+        actions = []
+        while len(actions) < self.horizon:
+            untried = [a for a in ACTION_NAMES if a not in node.children]
+            if untried:
+                action = untried[0]
+                node.children[action] = Node()
+            else:
+                action = self.select(node)
+            node = node.children[action]
+            path.append(node)
+            actions.append(action)
+            if untried:
+                break
+        batch = base.copy()
+        batch.battle(*ACTIONS[actions[0]])
+        for action in actions[1:]:
+            batch.step(*ACTIONS[action])
+        for _ in range(self.horizon - len(actions)):
+            batch.step()
+        value = self.evaluate(batch)
+        for node in path:
+            node.visits += 1
+            node.value += value
+
+    def evaluate(self, batch):
+        """Mean enemy share of the surviving forces (relative to the starting armies), in [0, 1]."""
+        state = self.state
+        player = batch.forces_total / max(1, state.player_original_forces)
+        enemy = batch.enemy_forces_total / max(1, state.enemy_original_forces)
+        both = player + enemy
+        return float(np.mean(np.where(both > 0, enemy / np.where(both > 0, both, 1), 0.5)))
+
+def mcts_enemy_factory(**options):
+    """enemy_ai_factory for CampaignState/CampaignEngine building MCTSEnemyAI(**options)."""
+    return functools.partial(MCTSEnemyAI, **options)
@@ -0,0 +1,149 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - recruitment distribution optimizer
+#
+# Searches the 7-way recruitment split (integer percentages summing to 100)
+# that maximizes the win probability against a given enemy personality, by
+# successive halving over candidates sampled on the simplex. Every round plays
+# all surviving splits on the same random scenarios (common random numbers),
+# keeps the best fraction and gives the survivors more campaigns; wins from
+# earlier rounds are kept, so no simulation is thrown away.
+#
+# Usage: python -m mcs_core.optimize --personality aggressive --candidates 1024 --turns 50 --seed 1
+
+import argparse
+import json
+import math
+
+import numpy as np
+
+from .engine import UNIT_ORDER, DEFAULT_RECRUIT_DIST
+from .kernel import CampaignBatch, PERSONALITIES
+from .rng import CampaignRNG, as_seed_sequence
+
+def to_percentages(weights):
+    """Round simplex weights to integer percentages summing to 100 (largest remainder)."""
+    weights = np.asarray(weights, dtype=float)
+    raw = weights / weights.sum(axis=-1, keepdims=True) * 100
+    floor = np.floor(raw).astype(np.int64)
+    missing = 100 - floor.sum(axis=-1)
+    order = np.argsort(-(raw - floor), axis=-1, kind="stable")
+    rank = np.argsort(order, axis=-1, kind="stable")
+    return floor + (rank < missing[..., None])
+
+def sample_splits(n, rng, concentration=1.0, include=()):
+    """n distinct candidate splits: the `include` splits followed by Dirichlet samples."""
+    seen = set()
+    splits = []
+    for split in include:
+        key = tuple(int(x) for x in split)
+        if key not in seen and sum(key) == 100:
+            seen.add(key)
+            splits.append(key)
+    attempts = 0
+    while len(splits) < n and attempts < 100:
+        attempts += 1
+        block = to_percentages(rng.dirichlet(np.full(len(UNIT_ORDER), concentration), size=2 * n))
+        for row in block:
+            key = tuple(int(x) for x in row)
+            if key not in seen:
+                seen.add(key)
+                splits.append(key)
+                if len(splits) == n:
+                    break
+    return np.array(splits[:n], dtype=float)
+
+def evaluate_splits(splits, campaigns, turns, seed_seq, personality=None, max_rows=200000):
+    """Win counts of every split over the same `campaigns` random scenarios."""
+    wins = np.zeros(len(splits), dtype=np.int64)
+    per_batch = max(1, max_rows // campaigns)
+    for start in range(0, len(splits), per_batch):
+        chunk = splits[start:start + per_batch]
+        # A fresh copy of seed_seq per chunk: every chunk replays the same scenarios
+        rng = CampaignRNG(as_seed_sequence(seed_seq), kind="numpy")
+        batch = CampaignBatch(len(chunk) * campaigns, recruit_dist=np.repeat(chunk, campaigns, axis=0),
+                              rng=rng, personality=personality, crn_period=campaigns)
+        batch.run(turns, record=False)
+        wins[start:start + len(chunk)] = batch.won.reshape(len(chunk), campaigns).sum(axis=1)
+    return wins
+
+def optimize_recruitment(personality=None, n_candidates=1024, turns=50, campaigns=32, eta=3,
+                         seed=None, candidates=None, concentration=1.0, max_rows=200000, top=10):
+    """Successive halving over recruitment splits; returns the best split and the search trace.
+
+    personality fixes the enemy's starting personality (None draws it per campaign).
+    Each round keeps the best 1/eta of the splits and multiplies their campaigns by eta.
+    """
+    if personality is not None and personality not in PERSONALITIES:
+        raise ValueError(f"Unknown enemy personality: {personality}")
+    root = np.random.SeedSequence(seed)
+    sampler_seq, rounds_seq = root.spawn(2)
+    if candidates is None:
+        include = [DEFAULT_RECRUIT_DIST, [100 // len(UNIT_ORDER) + (i < 100 % len(UNIT_ORDER)) for i in range(len(UNIT_ORDER))]]
+        candidates = sample_splits(n_candidates, np.random.default_rng(sampler_seq), concentration, include)
+    splits = np.asarray(candidates, dtype=float)
+    alive = np.arange(len(splits))
+    wins = np.zeros(len(splits), dtype=np.int64)
+    plays = np.zeros(len(splits), dtype=np.int64)
+    n_rounds = max(1, math.ceil(math.log(len(splits), eta))) if len(splits) > 1 else 1
+    trace = []
+    for r, round_seq in enumerate(rounds_seq.spawn(n_rounds)):
+        budget = campaigns * eta ** r
+        wins[alive] += evaluate_splits(splits[alive], budget, turns, round_seq, personality, max_rows)
+        plays[alive] += budget
+        rate = wins[alive] / plays[alive]
+        order = np.argsort(-rate, kind="stable")
+        trace.append({"round": r + 1, "candidates": len(alive), "campaigns_each": int(budget),
+                      "best_win_probability": float(rate[order[0]])})
+        keep = max(1, len(alive) // eta)
+        alive = alive[order[:keep]]
+        if len(alive) == 1:
+            break
+
+    rate = np.where(plays > 0, wins / np.maximum(plays, 1), 0.0)
+    ranked = np.lexsort((-rate, -plays))[:top]
+    best = alive[np.argmax(rate[alive])]
+    p = rate[best]
+    return {
+        "personality": personality,
+        "turns": turns,
+        "seed": seed,
+        "entropy": root.entropy,
+        "best_split": [int(x) for x in splits[best]],
+        "win_probability": float(p),
+        "standard_error": float(math.sqrt(p * (1 - p) / plays[best])),
+        "campaigns": int(plays[best]),
+        "total_campaigns": int(plays.sum()),
+        "rounds": trace,
+        "leaderboard": [{"split": [int(x) for x in splits[i]], "win_probability": float(rate[i]),
+                         "campaigns": int(plays[i])} for i in ranked],
+    }
+
+def format_split(split):
+    return "/".join(str(x) for x in split)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the recruitment split that maximizes the win probability")
+    parser.add_argument("--personality", choices=PERSONALITIES, default=None)
+    parser.add_argument("--candidates", type=int, default=1024)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--campaigns", type=int, default=32, help="campaigns per candidate in the first round")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta of the candidates each round")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+    if min(args.candidates, args.turns, args.campaigns) <= 0 or args.eta < 2:
+        parser.error("--candidates, --turns and --campaigns must be positive and --eta at least 2")
+    result = optimize_recruitment(args.personality, args.candidates, args.turns, args.campaigns, args.eta, args.seed)
+    for r in result["rounds"]:
+        print(f"Round {r['round']}: {r['candidates']} splits x {r['campaigns_each']} campaigns, "
+              f"best win probability {r['best_win_probability']:.3f}")
+    print(f"Best split vs {result['personality'] or 'any'} enemy: {format_split(result['best_split'])} "
+          f"win probability {result['win_probability']:.3f} +/- {result['standard_error']:.3f} "
+          f"({result['campaigns']} campaigns, {result['total_campaigns']} simulated)")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f)
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - sharded (multi-process) batch execution
+#
+# A batch is cut into fixed-size shards. Every shard gets its own child of one
+# numpy SeedSequence, plays its campaigns and folds them into StreamingStats;
+# only those reducers travel back to the parent. Because the shard plan depends
+# on the campaign count and shard size only, a given seed gives the same result
+# whatever the number of worker processes.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import CampaignEngine
+from .kernel import CampaignBatch, PLAYER_DEFAULTS, ENEMY_DEFAULTS
+from .stats import StreamingStats
+from .rng import CampaignRNG
+
+DEFAULT_SHARD_SIZE = 10000
+# Gold never grows, so an army can recruit at most starting gold / 5 men.
+FORCE_BOUND = 1.25 * (max(sum(PLAYER_DEFAULTS), sum(ENEMY_DEFAULTS)) + 2000 // 5)
+METRIC_RANGES = {
+    "forces_total": (0, FORCE_BOUND, True),
+    "enemy_forces_total": (0, FORCE_BOUND, True),
+    "morale": (0, 1, False),
+    "supply": (0, 1, False),
+}
+
+class ShardResult:
+    def __init__(self, turns, bins=256):
+        self.n = 0
+        self.wins = 0
+        self.length = StreamingStats(1, 0, turns + 1, bins=turns + 1, discrete=True)
+        self.trajectories = {k: StreamingStats(turns, lo, hi, bins, discrete)
+                             for k, (lo, hi, discrete) in METRIC_RANGES.items()}
+
+    def merge(self, other):
+        self.n += other.n
+        self.wins += other.wins
+        self.length.merge(other.length)
+        for k, stats in self.trajectories.items():
+            stats.merge(other.trajectories[k])
+        return self
+
+def plan_shards(n_campaigns, shard_size=DEFAULT_SHARD_SIZE):
+    full, rest = divmod(n_campaigns, shard_size)
+    return [shard_size] * full + ([rest] if rest else [])
+
+def _simulate_kernel_shard(size, turns, recruit_dist, seed_seq, result):
+    batch = CampaignBatch(size, recruit_dist=recruit_dist, rng=CampaignRNG(seed_seq, kind="numpy"))
+    for t in range(turns):
+        batch.step()
+        if batch.n == 0:
+            # every campaign is over: the remaining turns repeat the final values
+            for k, stats in result.trajectories.items():
+                values = batch.values(k)
+                for rest in range(t, turns):
+                    stats.add(rest, values)
+            break
+        for k, stats in result.trajectories.items():
+            stats.add(t, batch.values(k))
+    result.wins += int(batch.won.sum())
+    result.length.add(0, batch.field("turns_played"))
+
+def _simulate_engine_shard(size, turns, recruit_dist, seed_seq, result):
+    matrices = {k: np.zeros((size, turns)) for k in result.trajectories}
+    lengths = np.zeros(size)
+    for i, campaign_seed in enumerate(seed_seq.spawn(size)):
+        engine = CampaignEngine(recruit_dist=recruit_dist, advisors=False, seed=campaign_seed)
+        result.wins += engine.run(turns)
+        history = engine.sim_data
+        n = lengths[i] = len(history)
+        for k, matrix in matrices.items():
+            values = history[k]
+            matrix[i, :n] = values
+            matrix[i, n:] = values[-1]
+    for k, stats in result.trajectories.items():
+        stats.update(matrices[k])
+    result.length.add(0, lengths)
+
+SHARD_BACKENDS = {"numpy": _simulate_kernel_shard, "engine": _simulate_engine_shard}
+
+def simulate_shard(task):
+    size, turns, recruit_dist, seed_seq, backend = task
+    result = ShardResult(turns)
+    result.n = size
+    SHARD_BACKENDS[backend](size, turns, recruit_dist, seed_seq, result)
+    return result
+
+def run_sharded(n_campaigns, turns, recruit_dist, seed=None, backend="numpy",
+                workers=1, shard_size=DEFAULT_SHARD_SIZE):
+    """Play the batch shard by shard (in `workers` processes) and return (ShardResult, SeedSequence)."""
+    root = np.random.SeedSequence(seed)
+    sizes = plan_shards(n_campaigns, shard_size)
+    tasks = [(size, turns, recruit_dist, child, backend) for size, child in zip(sizes, root.spawn(len(sizes)))]
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    total = ShardResult(turns)
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            total.merge(simulate_shard(task))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            for shard in pool.map(simulate_shard, tasks):
+                total.merge(shard)
+    return total, root
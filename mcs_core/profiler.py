@@ -0,0 +1,217 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - per-phase profiling of the turn loop
+#
+# A PhaseProfiler attached to a CampaignEngine (engine.profiler) records the
+# wall time, the call count and, optionally, the memory allocated by each of
+# the 13 phases of a turn and by the subsystems inside them (enemy AI, Chess
+# and Go advisors, history, observers). Frames form stacks such as
+# turn;battle;enemy_ai. The results are exported as a collapsed-stack file
+# (one "stack self_microseconds" line per stack, the input of flamegraph.pl,
+# speedscope or inferno) and as a per-turn timing table (CSV, one column per
+# phase). Engines without a profiler use engine.NULL_PROFILER, whose hooks do
+# nothing.
+#
+# Allocations are measured with tracemalloc (net bytes kept and peak bytes
+# reached inside the frame); tracing slows the turn down several times, so the
+# times of an allocation run only compare with each other.
+#
+# Usage: python -m mcs_core.profiler --turns 500 --seed 1 --collapsed turns.folded --table turns.csv [--allocations]
+
+import argparse
+import csv
+import time
+import tracemalloc
+
+from .engine import CampaignEngine, parse_recruit_dist
+
+PHASES = ("environment", "supply_line", "tactics", "spies", "resources", "morale", "battle",
+          "losses", "fatigue", "aftermath", "ai_learning", "recommendations", "logging")
+ROOT = "turn"
+
+class FrameStats:
+    __slots__ = ("seconds", "calls", "allocated", "peak")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.allocated = 0  # net bytes still allocated when the frame was left, summed over the calls
+        self.peak = 0  # largest growth over the starting memory in one call
+
+class PhaseProfiler:
+    """Wall time, calls and allocations per stack of frames.
+
+    A turn is the root frame; phase(name) closes the running phase and opens the
+    next one, enter(name)/leave() nest a subsystem inside the current frame.
+    """
+
+    def __init__(self, allocations=False):
+        self.allocations = allocations
+        self.stats = {}  # stack (tuple of frame names) -> FrameStats
+        self.turns = []  # (turn, {phase: seconds}, total seconds)
+        self.stack = []  # open frames: [stack, start time, start memory, peak memory]
+        self.turn = None
+        self.turn_phases = None
+        self.started_tracing = False
+
+    def reset(self):
+        self.stats.clear()
+        self.turns.clear()
+
+    def memory(self):
+        if not self.allocations:
+            return 0, 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        return tracemalloc.get_traced_memory()
+
+    def stop(self):
+        """Stop tracemalloc if this profiler started it."""
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def enter(self, name):
+        stack = self.stack
+        path = stack[-1][0] + (name,) if stack else (name,)
+        current = 0
+        if self.allocations:
+            current, peak = self.memory()
+            if stack:
+                stack[-1][3] = max(stack[-1][3], peak)
+            tracemalloc.reset_peak()
+        stack.append([path, time.perf_counter(), current, current])
+
+    def leave(self):
+        end = time.perf_counter()
+        path, start, start_memory, peak_memory = self.stack.pop()
+        stats = self.stats.get(path)
+        if stats is None:
+            stats = self.stats[path] = FrameStats()
+        stats.seconds += end - start
+        stats.calls += 1
+        if self.allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            peak_memory = max(peak_memory, peak)
+            stats.allocated += current - start_memory
+            stats.peak = max(stats.peak, peak_memory - start_memory)
+            if self.stack:
+                self.stack[-1][3] = max(self.stack[-1][3], peak_memory)
+        if len(path) == 2 and self.turn_phases is not None:
+            self.turn_phases[path[1]] = self.turn_phases.get(path[1], 0.0) + end - start
+        return end - start
+
+    def start_turn(self, turn):
+        while self.stack:
+            self.leave()
+        self.turn = turn
+        self.turn_phases = {}
+        self.enter(ROOT)
+
+    def phase(self, name):
+        while len(self.stack) > 1:
+            self.leave()
+        self.enter(name)
+
+    def end_turn(self):
+        if not self.stack:
+            return
+        while len(self.stack) > 1:
+            self.leave()
+        total = self.leave()
+        self.turns.append((self.turn, self.turn_phases, total))
+        self.turn_phases = None
+
+    def self_seconds(self):
+        """{stack: seconds spent in the frame itself, its sub-frames excluded}."""
+        own = {path: s.seconds for path, s in self.stats.items()}
+        for path, s in self.stats.items():
+            if len(path) > 1 and path[:-1] in own:
+                own[path[:-1]] -= s.seconds
+        return own
+
+    def collapsed(self):
+        """Collapsed-stack lines "turn;battle;enemy_ai 1234", values in microseconds of self time."""
+        lines = []
+        for path, seconds in sorted(self.self_seconds().items()):
+            us = int(round(seconds * 1e6))
+            if us > 0:
+                lines.append(f"{';'.join(path)} {us}")
+        return lines
+
+    def write_collapsed(self, path):
+        with open(path, "w") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+
+    def phase_names(self):
+        names = [p for p in PHASES if (ROOT, p) in self.stats]
+        return names + sorted(path[1] for path in self.stats if len(path) == 2 and path[1] not in PHASES)
+
+    def write_table(self, path):
+        """Per-turn timing table: turn, total and one column per phase, in milliseconds."""
+        names = self.phase_names()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["turn", "total_ms"] + [n + "_ms" for n in names])
+            for turn, phases, total in self.turns:
+                writer.writerow([turn, f"{total * 1000:.4f}"] + [f"{phases.get(n, 0.0) * 1000:.4f}" for n in names])
+
+    def summary(self):
+        """Frames ordered like the turn loop: total ms, calls, mean us per call, share of the turn time, KB."""
+        root = self.stats.get((ROOT,))
+        turn_seconds = root.seconds if root else 0.0
+        order = {name: i for i, name in enumerate(PHASES)}
+        paths = sorted(self.stats, key=lambda p: [(order.get(n, len(PHASES)), n) for n in p])
+        header = f"{'frame':36s} {'total ms':>10s} {'calls':>8s} {'us/call':>10s} {'share':>7s}"
+        if self.allocations:
+            header += f" {'net KB':>10s} {'peak KB':>10s}"
+        lines = [header]
+        for path in paths:
+            s = self.stats[path]
+            share = s.seconds / turn_seconds if turn_seconds else 0.0
+            line = (f"{'  ' * (len(path) - 1) + path[-1]:36s} {s.seconds * 1000:10.2f} {s.calls:8d} "
+                    f"{s.seconds / s.calls * 1e6:10.2f} {share:7.1%}")
+            if self.allocations:
+                line += f" {s.allocated / 1024:10.1f} {s.peak / 1024:10.1f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+def profile_campaigns(turns, campaigns=1, seed=None, recruit_dist=None, advisors=True, allocations=False):
+    """Play `campaigns` campaigns of up to `turns` turns under a PhaseProfiler and return it."""
+    profiler = PhaseProfiler(allocations=allocations)
+    engine = CampaignEngine(recruit_dist=recruit_dist, advisors=advisors, seed=seed)
+    engine.profiler = profiler
+    try:
+        for c in range(campaigns):
+            if c:
+                engine.reset(seed=None if seed is None else seed + c)
+            engine.run(turns)
+    finally:
+        profiler.stop()
+    return profiler
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the phases of the campaign turn loop")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--campaigns", type=int, default=1)
+    parser.add_argument("--recruit", default=None, help="recruitment split, e.g. 40/20/10/10/10/5/5")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-advisors", dest="advisors", action="store_false", help="skip the Chess and Go recommendations")
+    parser.add_argument("--allocations", action="store_true", help="also trace memory allocations (slower)")
+    parser.add_argument("--collapsed", default=None, help="write a collapsed-stack file for flame graphs")
+    parser.add_argument("--table", default=None, help="write the per-turn timing table (CSV)")
+    args = parser.parse_args(argv)
+    if args.turns <= 0 or args.campaigns <= 0:
+        parser.error("--turns and --campaigns must be positive")
+    recruit = parse_recruit_dist(args.recruit) if args.recruit else None
+    profiler = profile_campaigns(args.turns, args.campaigns, args.seed, recruit, args.advisors, args.allocations)
+    print(f"{len(profiler.turns)} turns profiled")
+    print(profiler.summary())
+    if args.collapsed:
+        profiler.write_collapsed(args.collapsed)
+    if args.table:
+        profiler.write_table(args.table)
+    return profiler
+
+if __name__ == "__main__":
+    main()
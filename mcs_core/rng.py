@@ -0,0 +1,71 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - seedable per-subsystem random streams
+#
+# Every source of chance draws from its own named stream, all children of one
+# numpy SeedSequence. Runs are reproducible from a single seed, worker shards
+# never share a stream, and two strategies played with the same seed see the
+# same weather, spy rolls and ambushes (common random numbers), because turning
+# one subsystem on or off no longer shifts the draws of the others.
+
+import random
+
+import numpy as np
+
+STREAMS = ("environment", "espionage", "combat", "ai", "advisors")
+
+def as_seed_sequence(seed):
+    """SeedSequence for `seed`; a SeedSequence is copied, so spawning from the
+    result never advances the caller's own and the same seed always gives the
+    same children."""
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key, pool_size=seed.pool_size,
+                                      n_children_spawned=seed.n_children_spawned)
+    return np.random.SeedSequence(seed)
+
+class CampaignRNG:
+    """Named random streams: environment (terrain, weather, time), espionage
+    (spy operations, supply-line sabotage), combat (ambushes), ai (enemy
+    personality and feints) and advisors (Chess/Go recommendations).
+
+    kind="python" gives random.Random streams for CampaignEngine,
+    kind="numpy" gives numpy Generators for the vectorized kernel.
+    """
+
+    def __init__(self, seed=None, kind="python"):
+        self.kind = kind
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """(Re)seed every stream in place, so objects holding a stream keep working."""
+        self.seed_seq = as_seed_sequence(seed)
+        for name, child in zip(STREAMS, self.seed_seq.spawn(len(STREAMS))):
+            if self.kind == "numpy":
+                fresh = np.random.default_rng(child)
+                stream = getattr(self, name, None)
+                if stream is None:
+                    setattr(self, name, fresh)
+                else:
+                    stream.bit_generator.state = fresh.bit_generator.state
+            else:
+                value = int.from_bytes(child.generate_state(4).tobytes(), "little")
+                stream = getattr(self, name, None)
+                if stream is None:
+                    setattr(self, name, random.Random(value))
+                else:
+                    stream.seed(value)
+
+    @property
+    def entropy(self):
+        return self.seed_seq.entropy
+
+    def getstate(self):
+        if self.kind == "numpy":
+            return {name: getattr(self, name).bit_generator.state for name in STREAMS}
+        return {name: getattr(self, name).getstate() for name in STREAMS}
+
+    def setstate(self, state):
+        for name in STREAMS:
+            if self.kind == "numpy":
+                getattr(self, name).bit_generator.state = state[name]
+            else:
+                getattr(self, name).setstate(state[name])
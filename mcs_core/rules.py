@@ -0,0 +1,127 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - data-driven terrain, weather and unit rules
+#
+# The rules that depend on the terrain, the weather, the time of day and the
+# unit type are declared in a rule file (JSON, or TOML on Python 3.11+) instead
+# of being branches of the engine: the terrains and their passability, attack
+# multipliers (air superiority), attack lost to the ground (vehicles in
+# difficult terrain), attrition (rain) and fatigue (night). load_rules()
+# compiles a file once into dense terrain x weather x time x unit arrays; a
+# battle reads the weights of the current cell and takes one dot product per
+# army, and the NumPy kernel indexes the same arrays for N campaigns at once.
+# A scenario adds a terrain or a modifier by editing the file, e.g.
+#
+#   {"terrains": {"jungle": {"passability": 0.4}},
+#    "battle": [{"terrain": ["jungle"], "units": ["tank"], "attack_lost": 0.5}],
+#    "environment": [{"weather": ["stormy"], "units": ["aircraft"], "player": 10, "enemy": 10}]}
+#
+# Usage: CampaignEngine(era=MODERN.with_rules("my_rules.toml"))
+
+import json
+import os
+
+import numpy as np
+
+WEATHER_CONDITIONS = ("clear", "rainy", "foggy", "windy", "stormy")
+DAY_NIGHT_CYCLE = ("day", "night")
+RULES_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+class RuleCell:
+    """Rules of one (terrain, weather, time) cell, as tuples for the scalar engine."""
+
+    __slots__ = ("weights", "lost", "losses", "fatigue")
+
+    def __init__(self, weights, lost, losses, fatigue):
+        self.weights = weights  # (player, enemy) attack weight per unit
+        self.lost = lost  # (player, enemy) attack lost per unit, None when nothing is lost
+        self.losses = losses  # [(unit index, player losses, enemy losses)]
+        self.fatigue = fatigue
+
+class Rules:
+    """Rule file compiled against the rosters of an era."""
+
+    def __init__(self, spec, roster, enemy_roster, source="rules"):
+        if roster.keys != enemy_roster.keys:
+            raise ValueError(f"{source}: both sides must have the same unit types.")
+        self.source = source
+        self.roster = roster
+        terrains = spec.get("terrains")
+        if not terrains:
+            raise ValueError(f"{source}: no terrains.")
+        self.terrain_types = tuple(terrains)
+        self.terrain_index = {t: i for i, t in enumerate(self.terrain_types)}
+        self.weather_index = {w: i for i, w in enumerate(WEATHER_CONDITIONS)}
+        self.time_index = {t: i for i, t in enumerate(DAY_NIGHT_CYCLE)}
+        self.passability = np.array([float((terrains[t] or {}).get("passability", 1.0)) for t in self.terrain_types])
+        self.advice = dict(spec.get("advice", {}))
+
+        shape = (len(self.terrain_types), len(WEATHER_CONDITIONS), len(DAY_NIGHT_CYCLE), len(roster))
+        multiplier = np.ones(shape)
+        lost = np.zeros(shape)
+        self.losses = np.zeros((2,) + shape, dtype=np.int64)  # [side, terrain, weather, time, unit]
+        self.fatigue = np.zeros(shape[:3])
+        for rule in spec.get("battle", []):
+            cells = self.select(rule)
+            multiplier[cells] *= float(rule.get("attack", 1.0))
+            lost[cells] += float(rule.get("attack_lost", 0.0))
+        for rule in spec.get("environment", []):
+            cells = self.select(rule)
+            self.losses[0][cells] += int(rule.get("player", 0))
+            self.losses[1][cells] += int(rule.get("enemy", 0))
+            if "fatigue" in rule:
+                self.fatigue[self.select(rule, units=False)] += float(rule["fatigue"])
+        attack = np.array([roster.attack, enemy_roster.attack], dtype=float)[:, None, None, None, :]
+        self.attack = attack * multiplier  # [side, terrain, weather, time, unit]
+        self.attack_lost = attack * lost
+        self.cells = {}
+
+    def names(self, rule, key, index, kind):
+        names = rule.get(key)
+        if names is None:
+            return list(index.values())
+        if isinstance(names, str):
+            names = [names]
+        unknown = [n for n in names if n not in index]
+        if unknown:
+            raise ValueError(f"{self.source}: unknown {kind} {', '.join(map(repr, unknown))}.")
+        return [index[n] for n in names]
+
+    def select(self, rule, units=True):
+        """np.ix_ index of the cells (and unit types) a rule applies to; a missing key selects them all."""
+        axes = [self.names(rule, "terrain", self.terrain_index, "terrain"),
+                self.names(rule, "weather", self.weather_index, "weather"),
+                self.names(rule, "time", self.time_index, "time of day")]
+        if units:
+            axes.append(self.names(rule, "units", self.roster.index, "unit type"))
+        return np.ix_(*axes)
+
+    def cell(self, terrain, weather, time):
+        key = (terrain, weather, time)
+        cell = self.cells.get(key)
+        if cell is None:
+            t, w, h = self.terrain_index[terrain], self.weather_index[weather], self.time_index[time]
+            lost = self.attack_lost[:, t, w, h]
+            losses = self.losses[:, t, w, h]
+            cell = self.cells[key] = RuleCell(
+                tuple(tuple(side.tolist()) for side in self.attack[:, t, w, h]),
+                tuple(tuple(side.tolist()) for side in lost) if lost.any() else None,
+                [(int(i), int(losses[0, i]), int(losses[1, i])) for i in np.flatnonzero(losses.any(axis=0))],
+                float(self.fatigue[t, w, h]))
+        return cell
+
+def read_rule_file(path):
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ImportError("TOML rule files need Python 3.11 or later (tomllib); use a JSON rule file.")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+def load_rules(path, roster, enemy_roster):
+    """Compile the rule file `path` (a bare name is looked up in mcs_core/data) for the given rosters."""
+    if not os.path.exists(path) and os.path.dirname(path) == "":
+        path = os.path.join(RULES_DIR, path)
+    return Rules(read_rule_file(path), roster, enemy_roster, source=os.path.basename(path))
@@ -0,0 +1,109 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - background campaign runner
+#
+# Plays a CampaignEngine in a worker thread. The engine callbacks become events
+# on a thread-safe queue that the front end drains from its own thread
+# (root.after in the Tk GUI), so the window never waits for the simulation.
+# A run can be paused, resumed, advanced one turn at a time or cancelled. A fast
+# run (fast-forward) posts no log or turn events: the engine only records its
+# events, and the front end renders the result once the "finish" event comes.
+
+import queue
+import threading
+
+class CampaignRunner:
+    """Worker-thread driver of a CampaignEngine.
+
+    Queued events: ("log", message, event_type), ("turn", record, unit_counts),
+    ("finish", won, cancelled) and ("error", exception).
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.events = queue.Queue()
+        self.thread = None
+        self.paused = False
+        self.cancelled = False
+        self.fast = False
+        self._steps = 0
+        self._cond = threading.Condition()
+        engine.add_observer(self)
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    # Engine observer hooks, called from the thread driving the engine
+    def on_log(self, message, event_type):
+        self.events.put(("log", message, event_type))
+
+    def on_turn(self, record):
+        if self.fast:
+            return
+        # The counts are copied here: the GUI must not read the live state while the worker mutates it
+        self.events.put(("turn", record, list(self.engine.state.units.counts)))
+
+    # Controls, called from the GUI thread
+    def start(self, turns, paused=False, fast=False):
+        if self.running:
+            raise RuntimeError("A campaign is already running.")
+        self.paused = paused
+        self.cancelled = False
+        self.fast = fast
+        self.engine.quiet = fast
+        self._steps = 0
+        self.thread = threading.Thread(target=self._run, args=(turns,), daemon=True)
+        self.thread.start()
+
+    def pause(self):
+        with self._cond:
+            self.paused = True
+
+    def resume(self):
+        with self._cond:
+            self.paused = False
+            self._cond.notify_all()
+
+    def step(self):
+        """Play exactly one more turn, then stay paused."""
+        with self._cond:
+            self.paused = True
+            self._steps += 1
+            self._cond.notify_all()
+
+    def cancel(self):
+        with self._cond:
+            self.cancelled = True
+            self._cond.notify_all()
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _wait_turn(self):
+        """Block while paused; False once the run is cancelled."""
+        with self._cond:
+            while self.paused and not self._steps and not self.cancelled:
+                self._cond.wait()
+            if self._steps:
+                self._steps -= 1
+            return not self.cancelled
+
+    def _run(self, turns):
+        engine = self.engine
+        try:
+            if engine.turn == 0:
+                engine.start()
+            for _ in range(turns):
+                if engine.finished or not self._wait_turn():
+                    break
+                engine.step()
+            if self.cancelled:
+                engine.log("Simulation cancelled by the user.", event_type="defeat")
+            won = engine.finish()
+        except Exception as e:
+            self.events.put(("error", e))
+            return
+        finally:
+            engine.quiet = False
+        self.events.put(("finish", won, self.cancelled))
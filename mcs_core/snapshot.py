@@ -0,0 +1,193 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - binary campaign snapshots
+#
+# A snapshot is a NumPy .npz archive holding the complete state of a
+# CampaignEngine: its era, unit counts, resources, morale, fatigue, supply, spy
+# effectiveness, original force totals, environment, the enemy AI with its
+# memory, the territory board of the Go advisor, the state of every random
+# stream, the per-turn history and the event log. Scalars go to a JSON header
+# (format name, version, fields), everything sized by the campaign length goes
+# to flat arrays, so loading is a few array reads. A loaded engine continues exactly as the saved one would have.
+
+import json
+
+import numpy as np
+
+from .army import Army
+from .engine import CampaignEngine, advisor_names
+from .eras import ERAS
+from .events import CATEGORIES, category_id
+from .rng import STREAMS
+from .territory import TerritoryGrid
+
+SNAPSHOT_FORMAT = "mcs-snapshot"
+SNAPSHOT_VERSION = 3  # 2: territory board of the Go advisor, 3: era and advisor names
+SNAPSHOT_EXTENSION = ".mcs"
+
+STATE_FIELDS = ["leadership_quality", "fatigue", "supply", "morale", "enemy_morale", "spy_effectiveness",
+                "current_terrain", "current_weather", "current_time", "enemy_units_total",
+                "enemy_original_forces", "player_original_forces"]
+
+def capture(engine):
+    """(header, arrays) describing the complete state of `engine`."""
+    state = engine.state
+    ai = state.enemy_ai
+    rng = state.rng
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "era": engine.era.name,
+        "engine": {"turn": engine.turn, "finished": engine.finished,
+                   "recruit_dist": list(engine.recruit_dist), "advisors": list(engine.advisors)},
+        "state": {name: getattr(state, name) for name in STATE_FIELDS},
+        "resources": dict(state.resources),
+        "roster": [list(state.units.roster.keys), list(state.enemy_units.roster.keys)],
+        "enemy_ai": {"personality": ai.personality, "memory_len": ai.memory_len},
+        "rng": {"kind": rng.kind, "entropy": rng.seed_seq.entropy, "spawn_key": list(rng.seed_seq.spawn_key)},
+        "history": {"categories": engine.sim_data.categories, "actions": engine.sim_data.action_names},
+        "events": {"categories": list(CATEGORIES)},
+    }
+    arrays = {
+        "units": np.array(state.units.counts, dtype=np.int64),
+        "enemy_units": np.array(state.enemy_units.counts, dtype=np.int64),
+        "ai_memory_win": np.array([m["player_win"] for m in ai.memory], dtype=bool),
+        "ai_memory_dist": np.array([m["player_dist"] for m in ai.memory], dtype=float).reshape(len(ai.memory), len(state.units)),
+        "ai_last_dist": np.array(ai.last_player_distribution, dtype=float),
+    }
+    grid = engine.go_ia.grid
+    if grid is not None:
+        for name, values in grid.getstate().items():
+            arrays["go_" + name] = values
+    if rng.kind == "numpy":
+        header["rng"]["state"] = rng.getstate()
+    else:
+        # random.Random state: (version, 624 words + position, next gaussian)
+        gauss = {}
+        for name, (_, words, gauss_next) in rng.getstate().items():
+            arrays["rng_" + name] = np.array(words, dtype=np.uint32)
+            gauss[name] = gauss_next
+        header["rng"]["gauss"] = gauss
+
+    history = engine.sim_data
+    n = len(history)
+    for name, column in history.columns.items():
+        arrays["history_" + name] = column[:n]
+    arrays["history_action_offsets"] = history.action_offsets[:n + 1]
+    arrays["history_action_codes"] = history.action_codes[:history.action_offsets[n]]
+
+    logs = engine.logs
+    arrays["events_codes"] = np.frombuffer(logs.codes, dtype=np.int16)
+    arrays["events_values"] = np.frombuffer(logs.values, dtype=np.float64)
+    arrays["events_texts"] = np.array(logs.texts, dtype=str)
+    arrays["events_turn_starts"] = np.frombuffer(logs.turn_starts, dtype=np.int64)
+    arrays["events_turn_numbers"] = np.frombuffer(logs.turn_numbers, dtype=np.int32)
+    arrays["events_override_index"] = np.array(list(logs.category_overrides), dtype=np.int64)
+    arrays["events_override_category"] = np.array(list(logs.category_overrides.values()), dtype=np.int16)
+    return header, arrays
+
+def restore(engine, header, arrays):
+    """Load a captured state into `engine` in place (observers and streams are kept)."""
+    if header.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError("Not a campaign snapshot.")
+    if header.get("version", 0) > SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshot version {header['version']} is newer than the supported version {SNAPSHOT_VERSION}.")
+    state = engine.state
+    rng = state.rng
+    # Older snapshots are all modern campaigns
+    if header.get("era", "modern") != engine.era.name:
+        raise ValueError(f"Snapshot of a campaign of the {header['era']} era, expected the {engine.era.name} era.")
+    if header["roster"] != [list(state.units.roster.keys), list(state.enemy_units.roster.keys)]:
+        raise ValueError("Snapshot unit types do not match this campaign.")
+    if header["state"]["current_terrain"] not in engine.era.terrain_types:
+        raise ValueError(f"Snapshot terrain '{header['state']['current_terrain']}' is not a terrain of this campaign's rules.")
+    if header["rng"]["kind"] != rng.kind:
+        raise ValueError(f"Snapshot random streams are of kind '{header['rng']['kind']}', expected '{rng.kind}'.")
+
+    saved = header["rng"]
+    rng.seed_seq = np.random.SeedSequence(saved["entropy"], spawn_key=tuple(saved["spawn_key"]),
+                                          n_children_spawned=len(STREAMS))
+    if rng.kind == "numpy":
+        rng.setstate(saved["state"])
+    else:
+        rng.setstate({name: (3, tuple(int(w) for w in arrays["rng_" + name]), saved["gauss"][name])
+                      for name in STREAMS})
+
+    for name, value in header["state"].items():
+        setattr(state, name, value)
+    state.resources = dict(header["resources"])
+    state.units = Army(state.units.roster, arrays["units"].tolist())
+    state.enemy_units = Army(state.enemy_units.roster, arrays["enemy_units"].tolist())
+    # Updated in place, so the engine keeps its kind of enemy AI
+    ai = state.enemy_ai
+    ai.personality = header["enemy_ai"]["personality"]
+    ai.memory_len = header["enemy_ai"]["memory_len"]
+    ai.memory = [{"player_win": bool(win), "player_dist": dist}
+                 for win, dist in zip(arrays["ai_memory_win"].tolist(), arrays["ai_memory_dist"].tolist())]
+    ai.last_player_distribution = arrays["ai_last_dist"].tolist()
+
+    saved = header["engine"]
+    engine.turn = saved["turn"]
+    engine.finished = saved["finished"]
+    engine.recruit_dist = list(saved["recruit_dist"])
+    engine.advisors = advisor_names(saved["advisors"])  # a flag before version 3
+    if hasattr(ai, "reset_plan"):
+        ai.reset_plan(engine.turn)  # planning AIs drop their search tree
+    # Version 1 snapshots have no territory board: a new one is deployed on the next turn
+    engine.go_ia.reset()
+    if "go_terrain" in arrays:
+        engine.go_ia.grid = TerritoryGrid(*engine.go_ia.grid_size)
+        engine.go_ia.grid.setstate({name[3:]: values for name, values in arrays.items() if name.startswith("go_")})
+
+    history = engine.sim_data
+    n = len(arrays["history_turn"])
+    history.__init__(capacity=max(64, n))
+    for name, column in history.columns.items():
+        column[:n] = arrays["history_" + name]
+    history.categories = {name: list(values) for name, values in header["history"]["categories"].items()}
+    history.category_codes = {name: {v: i for i, v in enumerate(values)} for name, values in history.categories.items()}
+    history.action_names = list(header["history"]["actions"])
+    history.action_ids = {name: i for i, name in enumerate(history.action_names)}
+    codes = arrays["history_action_codes"]
+    history.action_codes = np.resize(codes, max(64, 2 * len(codes))) if len(codes) else history.action_codes
+    history.action_offsets[:n + 1] = arrays["history_action_offsets"]
+    history.n = n
+
+    logs = engine.logs
+    logs.clear()
+    logs.codes.frombytes(arrays["events_codes"].astype(np.int16).tobytes())
+    logs.values.frombytes(arrays["events_values"].astype(np.float64).tobytes())
+    logs.texts = arrays["events_texts"].tolist()
+    logs.turn_starts = type(logs.turn_starts)("q", arrays["events_turn_starts"].tolist())
+    logs.turn_numbers = type(logs.turn_numbers)("i", arrays["events_turn_numbers"].tolist())
+    # Category ids are positions in CATEGORIES, which may have grown differently in this process
+    names = header["events"]["categories"]
+    logs.category_overrides = {k: category_id(names[c]) for k, c in
+                               zip(arrays["events_override_index"].tolist(), arrays["events_override_category"].tolist())}
+    return engine
+
+def engine_for(header):
+    """New CampaignEngine of the era and advisors of a snapshot header."""
+    era = header.get("era", "modern")
+    if era not in ERAS:
+        raise ValueError(f"Unknown campaign era '{era}'.")
+    return CampaignEngine(advisors=header.get("engine", {}).get("advisors", True), era=ERAS[era])
+
+def save_snapshot(engine, file, compress=True):
+    """Write `engine` to `file` (a path or a binary file object)."""
+    header, arrays = capture(engine)
+    arrays["header"] = np.array(json.dumps(header))
+    if isinstance(file, str):
+        # np.savez would append ".npz" to a path
+        with open(file, "wb") as f:
+            (np.savez_compressed if compress else np.savez)(f, **arrays)
+    else:
+        (np.savez_compressed if compress else np.savez)(file, **arrays)
+
+def load_snapshot(file, engine=None):
+    """Read a snapshot into `engine` (a new CampaignEngine by default) and return it."""
+    with np.load(file, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    header = json.loads(str(arrays.pop("header")))
+    if engine is None:
+        engine = engine_for(header)
+    return restore(engine, header, arrays)
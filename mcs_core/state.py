@@ -0,0 +1,102 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - campaign state and enemy AI (no GUI dependencies)
+
+import random
+
+from .army import UnitType, Army
+from .eras import MODERN
+from .rng import CampaignRNG
+from .rules import WEATHER_CONDITIONS, DAY_NIGHT_CYCLE
+
+class EnhancedEnemyAI:
+    def __init__(self, personality, memory_len=5, rng=None, state=None):
+        self.personality = personality
+        self.rng = rng or random.Random()
+        self.state = state  # the CampaignState it fights in, for planning AIs
+        self.memory_len = memory_len
+        self.memory = []
+        self.default_distribution = list((state.era if state is not None else MODERN).ai_distribution)
+        self.last_player_distribution = list(self.default_distribution)
+
+    def observe_outcome(self, player_win, player_dist):
+        self.memory.append({'player_win': player_win, 'player_dist': player_dist})
+        if len(self.memory) > self.memory_len:
+            self.memory.pop(0)
+        self.last_player_distribution = player_dist
+
+    def decide_personality(self):
+        n = len(self.memory)
+        if n < self.memory_len: return
+        wins = [m['player_win'] for m in self.memory]
+        win_rate = sum(wins) / n
+        if win_rate > 0.7:
+            self.personality = "aggressive"
+        elif win_rate < 0.3:
+            self.personality = "defensive"
+        else:
+            self.personality = "deceptive"
+
+    def suggest_enemy_recruit(self):
+        p = self.last_player_distribution
+        max_index = p.index(max(p))
+        weights = list(p)
+        if max_index == 0:
+            weights[:3] = [p[0]*0.7, p[1]+0.1, p[2]+0.2]
+        elif max_index == 1:
+            weights[:4] = [p[0]+0.1, p[1]*0.7, p[2], p[3]+0.2]
+        elif max_index == 2:
+            weights[:4] = [p[0]+0.2, p[1], p[2]*0.7, p[3]+0.1]
+        norm = sum(weights)
+        if norm == 0:
+            return list(self.default_distribution)
+        return [round(x/norm, 2) for x in weights]
+
+    def adjust_behavior(self, player_forces, enemy_forces, morale):
+        self.decide_personality()
+        return {
+            "confidence": self.personality == "aggressive",
+            "avoid": self.personality == "defensive",
+            "feint": self.personality == "deceptive" or self.rng.random() < 0.1
+        }
+
+class CampaignState:
+    # Shared by every state; only the current terrain/weather/time are per campaign.
+    # The class terrains are the modern era's, a state uses those of its era.
+    terrain_types = MODERN.terrain_types
+    weather_conditions = WEATHER_CONDITIONS
+    day_night_cycle = DAY_NIGHT_CYCLE
+
+    def __init__(self, rng=None, seed=None, enemy_ai_factory=None, era=None):
+        self.rng = rng or CampaignRNG(seed)
+        self.era = era or MODERN
+        self.terrain_types = self.era.terrain_types
+        # Called as factory(personality, rng=..., state=...), e.g. mcs_core.mcts.MCTSEnemyAI
+        self.enemy_ai_factory = enemy_ai_factory or EnhancedEnemyAI
+        self.init_state()
+
+    def init_state(self, units=None, enemy_units=None, leadership=0.85, personality=None):
+        """New campaign; `units` and `enemy_units` are starting counts in roster order (the era's by default)."""
+        era = self.era
+        self.units = Army(era.roster, units or era.units)
+        self.enemy_units = Army(era.enemy_roster, enemy_units or era.enemy_units)
+        self.leadership_quality = leadership
+        self.resources = dict(era.resources)
+        self.enemy_ai = self.enemy_ai_factory(personality or self.rng.ai.choice(["aggressive", "defensive", "deceptive"]),
+                                              rng=self.rng.ai, state=self)
+        self.fatigue = 0.0
+        self.supply = 1.0
+        self.morale = 0.7
+        self.enemy_morale = 0.6
+        self.spy_effectiveness = 0.0
+        env = self.rng.environment
+        self.current_terrain = env.choice(self.terrain_types)
+        self.current_weather = env.choice(self.weather_conditions)
+        self.current_time = env.choice(self.day_night_cycle)
+        self.enemy_units_total = self.enemy_units.total()
+        self.enemy_original_forces = self.enemy_units_total
+        self.player_original_forces = self.units.total()
+
+    def calculate_total_forces(self, units_dict):
+        if isinstance(units_dict, Army):
+            return units_dict.total()
+        return sum(unit.count for unit in units_dict.values())
@@ -0,0 +1,117 @@
+# Author(s): Dr. Patrick Lemoine
+# Sun Tzu Campaign Simulator - mergeable streaming statistics
+#
+# Batch runs never keep per-campaign histories: each shard folds its campaigns
+# into these reducers and the shards are merged afterwards. Means and variances
+# use Chan's parallel update; percentiles come from fixed-edge histograms so two
+# shards can be merged by adding their counts. The number of observations equal
+# to the minimum is kept too: many campaigns end on the same value (an army of
+# 0), and spreading them over their bin would report values nobody ended at.
+
+import numpy as np
+
+class StreamingStats:
+    """Count/mean/variance/min/max and a histogram for `length` parallel series.
+
+    Percentiles interpolate linearly inside their bin, between the observed
+    min and max; a percentile falling on the observations equal to the minimum
+    is that minimum. Discrete series (unit counts, turn numbers) binned one
+    value per bin report that value instead.
+    """
+
+    def __init__(self, length, lo, hi, bins=256, discrete=False):
+        self.length = length
+        self.discrete = discrete
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = bins
+        self.count = np.zeros(length, dtype=np.int64)
+        self.mean = np.zeros(length)
+        self.m2 = np.zeros(length)
+        self.min = np.full(length, np.inf)
+        self.max = np.full(length, -np.inf)
+        self.at_min = np.zeros(length, dtype=np.int64)  # observations equal to min
+        # bin 0 is underflow, bin bins+1 is overflow
+        self.hist = np.zeros((length, bins + 2), dtype=np.int64)
+
+    def _bin(self, values):
+        scaled = (values - self.lo) / (self.hi - self.lo) * self.bins
+        return np.clip(np.floor(scaled).astype(np.int64) + 1, 0, self.bins + 1)
+
+    def _combine(self, index, n, mean, m2, vmin, vmax, at_min):
+        count = self.count[index]
+        new_min = np.minimum(self.min[index], vmin)
+        self.at_min[index] = (np.where(self.min[index] == new_min, self.at_min[index], 0)
+                              + np.where(vmin == new_min, at_min, 0))
+        total = count + n
+        delta = mean - self.mean[index]
+        safe_total = np.maximum(total, 1)
+        self.mean[index] = self.mean[index] + delta * n / safe_total
+        self.m2[index] = self.m2[index] + m2 + delta * delta * count * n / safe_total
+        self.count[index] = total
+        self.min[index] = new_min
+        self.max[index] = np.maximum(self.max[index], vmax)
+
+    def add(self, index, values):
+        """Fold the values observed for series `index` (e.g. one turn) into the stats."""
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        mean = values.mean()
+        vmin = values.min()
+        self._combine(index, values.size, mean, ((values - mean) ** 2).sum(), vmin, values.max(),
+                      np.count_nonzero(values == vmin))
+        self.hist[index] += np.bincount(self._bin(values), minlength=self.bins + 2)
+
+    def update(self, matrix):
+        """Fold an (n, length) block of observations into every series at once."""
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.shape[0] == 0:
+            return
+        mean = matrix.mean(axis=0)
+        m2 = ((matrix - mean) ** 2).sum(axis=0)
+        vmin = matrix.min(axis=0)
+        self._combine(slice(None), matrix.shape[0], mean, m2, vmin, matrix.max(axis=0),
+                      np.count_nonzero(matrix == vmin, axis=0))
+        flat = self._bin(matrix) + np.arange(self.length) * (self.bins + 2)
+        self.hist += np.bincount(flat.ravel(), minlength=self.length * (self.bins + 2)).reshape(self.hist.shape)
+
+    def merge(self, other):
+        self._combine(slice(None), other.count, other.mean, other.m2, other.min, other.max, other.at_min)
+        self.hist += other.hist
+        return self
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / np.maximum(self.count, 1))
+
+    def percentile(self, q):
+        """Histogram estimate of the q-th percentile of every series, clamped to [min, max]."""
+        width = (self.hi - self.lo) / self.bins
+        rows = np.arange(self.length)
+        cum = np.cumsum(self.hist, axis=1)
+        target = q / 100.0 * self.count
+        idx = np.argmax(cum >= np.maximum(target, 1)[:, None], axis=1)
+        below = np.where(idx > 0, cum[rows, idx - 1], 0)
+        in_bin = self.hist[rows, idx]
+        edge = self.lo + (idx - 1) * width
+        if self.discrete and width <= 1:
+            return np.clip(edge, self.min, self.max)
+        # The observations equal to the minimum sit at its left end, the others spread up to the next edge
+        holds_min = self.min >= edge
+        below = np.where(holds_min, below + self.at_min, below)
+        in_bin = np.where(holds_min, in_bin - self.at_min, in_bin)
+        left = np.maximum(edge, self.min)
+        right = np.minimum(edge + width, self.max)
+        frac = np.clip((target - below) / np.maximum(in_bin, 1), 0, 1)
+        estimate = np.where(target <= self.at_min, self.min, left + frac * (right - left))
+        return np.clip(estimate, self.min, self.max)
+
+    def summary(self, percentiles, index=None):
+        pick = (lambda a: float(a[index])) if index is not None else (lambda a: a.tolist())
+        result = {"mean": pick(self.mean)}
+        if index is not None:
+            result["std"] = pick(self.std)
+        for p in percentiles:
+            result[f"p{p}"] = pick(self.percentile(p))
+        return result
@@ -0,0 +1,13 @@
+from mcs_core.advisors import ChessSunTzuAI
+
+def test_no_search_once_the_army_is_destroyed():
+    chess = ChessSunTzuAI()
+    advice = chess.recommend(0, 3000, 0.2, "open", "clear", "day", [])
+    assert [a.action for a in advice] == ["fortify"]
+    assert chess.last_search is None
+
+def test_tied_values_prefer_defensive_actions():
+    chess = ChessSunTzuAI()
+    advice = chess.recommend(1, 300000, 0.2, "open", "clear", "day", [])
+    assert set(chess.last_search.values.values()) == {-10.0}
+    assert [a.action for a in advice] == ["fortify", "retreat"]
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mcs_core import army
+from mcs_core.army import Army
+from mcs_core.eras import MODERN
+
+CAMPAIGNS = """
+from mcs_core import army
+from mcs_core.engine import CampaignEngine
+from mcs_core.eras import ERAS
+assert army.CHECK_TOTALS
+for era in ERAS.values():
+    for seed in range(5):
+        CampaignEngine(seed=seed, era=era).run(30)
+"""
+
+def test_seeded_campaigns_keep_the_totals_in_sync():
+    env = dict(os.environ, MCS_CHECK_TOTALS="1")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", CAMPAIGNS], env=env, cwd=root, check=True)
+
+def test_writing_counts_directly_is_detected(monkeypatch):
+    monkeypatch.setattr(army, "CHECK_TOTALS", True)
+    units = Army(MODERN.roster, MODERN.units)
+    units.set_count(0, 10)
+    units.remove_fraction(0.5)
+    assert units.total() == sum(units.counts)
+    units.counts[1] += 7
+    with pytest.raises(AssertionError, match="out of sync"):
+        units.total()
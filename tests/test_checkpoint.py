@@ -0,0 +1,48 @@
+from mcs_core.checkpoint import CheckpointStore
+from mcs_core.engine import CampaignEngine
+
+def campaign(turns, every=5, seed=7):
+    """A seeded campaign lasting well past `turns`, checkpointed every `every` turns."""
+    engine = CampaignEngine(advisors=False, seed=seed)
+    store = CheckpointStore(engine, every=every)
+    engine.start()
+    for _ in range(turns):
+        engine.step()
+    assert not engine.finished
+    return engine, store
+
+def test_resume_replays_like_an_uninterrupted_run():
+    reference, _ = campaign(30)
+    engine, store = campaign(20)
+    store.resume(10)
+    assert engine.turn == 10
+    assert store.turns == [5, 10]
+    for _ in range(20):
+        engine.step()
+    assert list(engine.logs) == list(reference.logs)
+    assert list(engine.state.units.counts) == list(reference.state.units.counts)
+
+def test_forks_without_a_seed_keep_the_saved_streams():
+    reference, _ = campaign(30)
+    _, store = campaign(20)
+    a, b = store.fork(10, n=2)
+    for _ in range(20):
+        a.step()
+    # Playing one fork leaves the other and the checkpoint untouched
+    assert b.turn == 10
+    for _ in range(20):
+        b.step()
+    assert list(a.logs) == list(b.logs) == list(reference.logs)
+    c, = store.fork(10)
+    assert c.turn == 10 and len(c.logs) < len(a.logs)
+
+def test_seeded_forks_play_different_futures():
+    _, store = campaign(20)
+    forks = store.fork(10, n=4, seed=11)
+    again = store.fork(10, n=4, seed=11)
+    for engine in forks + again:
+        for _ in range(20):
+            engine.step()
+    logs = [list(engine.logs) for engine in forks]
+    assert len({tuple(log) for log in logs}) == len(forks)
+    assert logs == [list(engine.logs) for engine in again]
@@ -0,0 +1,11 @@
+from mcs_core.engine import parse_recruit_dist, DEFAULT_RECRUIT_DIST
+from mcs_core.eras import ANCIENT
+
+def test_recruit_dist_is_scaled_to_100():
+    assert parse_recruit_dist("2/1/1/0/0/0/0") == [50, 25, 25, 0, 0, 0, 0]
+    assert parse_recruit_dist("60/40", ANCIENT) == [60, 40, 0, 0]
+
+def test_unreadable_recruit_dist_falls_back_to_the_default():
+    assert parse_recruit_dist("40/x/10") == DEFAULT_RECRUIT_DIST
+    assert parse_recruit_dist(None) == DEFAULT_RECRUIT_DIST
+    assert parse_recruit_dist("a/b", ANCIENT) == list(ANCIENT.recruit_dist)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from mcs_core.batch import run_batch
+from mcs_core.kernel import CampaignBatch
+
+def test_kernel_matches_the_engine_statistics():
+    kernel = run_batch(20000, 50, seed=1)
+    engine = run_batch(600, 50, seed=1, backend="engine")
+    # Seeded, so the check is exact; the tolerances are about four standard errors of the engine sample
+    assert abs(kernel["win_probability"] - engine["win_probability"]) < 0.08
+    assert abs(kernel["final_forces"]["mean"] - engine["final_forces"]["mean"]) < 300
+    assert abs(kernel["final_enemy_forces"]["mean"] - engine["final_enemy_forces"]["mean"]) < 300
+    assert abs(kernel["campaign_length"]["mean"] - engine["campaign_length"]["mean"]) < 3
+
+def test_finished_campaigns_move_to_final():
+    batch = CampaignBatch(200, rng=2)
+    done = []
+    while not done or batch.n == 200:
+        done = batch.step().tolist()
+    assert batch.n == 200 - len(done)
+    assert not set(done) & set(batch.ids.tolist())
+    kept = batch.field("units")[done].copy()
+    assert ((kept.sum(axis=1) == 0) | (batch.field("enemy_units")[done].sum(axis=1) == 0)).all()
+    for _ in range(5):
+        batch.step()
+    # Finished campaigns keep their final state while the others play on
+    assert np.array_equal(batch.field("units")[done], kept)
+    assert not batch.active[done].any()
+
+def test_blocks_sharing_random_numbers_play_like_separate_batches():
+    dists = [[40, 20, 10, 10, 10, 5, 5], [20, 20, 20, 10, 10, 10, 10], [10, 10, 10, 10, 20, 20, 20]]
+    shared = CampaignBatch(3 * 50, recruit_dist=np.repeat(dists, 50, axis=0), rng=3, crn_period=50)
+    shared.run(40, record=False)
+    for k, dist in enumerate(dists):
+        alone = CampaignBatch(50, recruit_dist=dist, rng=3)
+        alone.run(40, record=False)
+        block = slice(50 * k, 50 * (k + 1))
+        for name in ("units", "enemy_units", "morale", "supply", "turns_played"):
+            assert np.array_equal(shared.field(name)[block], alone.field(name)), name
@@ -0,0 +1,49 @@
+from mcs_core.logsink import TextLogSink
+
+class FakeRoot:
+    def __init__(self):
+        self.calls = []
+
+    def update(self):
+        self.calls.append("update")
+
+    def update_idletasks(self):
+        self.calls.append("update_idletasks")
+
+    def after(self, ms, callback):
+        return "timer"
+
+class FakeText:
+    def __init__(self):
+        self.text = ""
+
+    def tag_config(self, tag, **options):
+        pass
+
+    def configure(self, **options):
+        pass
+
+    def insert(self, index, *chunks):
+        self.text += "".join(chunks[::2])
+
+    def see(self, index):
+        pass
+
+def test_flush_writes_the_buffered_lines_in_one_insert():
+    root, widget = FakeRoot(), FakeText()
+    sink = TextLogSink(root, widget, interval_ms=10000)
+    sink.write("turn 1", "battle")
+    sink.write("turn 2", "battle")
+    sink.write("supply", "warning")
+    assert widget.text == ""
+    sink.flush()
+    assert widget.text == "turn 1\nturn 2\nsupply\n"
+    assert root.calls == ["update_idletasks"]
+
+def test_synchronous_callers_process_events_on_flush():
+    root, widget = FakeRoot(), FakeText()
+    sink = TextLogSink(root, widget, interval_ms=0, process_events=True)
+    sink.write("turn 1")
+    sink.write("turn 2")
+    assert widget.text == "turn 1\nturn 2\n"
+    assert root.calls == ["update", "update"]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from mcs_core.engine import CampaignEngine
+from mcs_core.eras import ANCIENT, MODERN
+from mcs_core.kernel import CampaignBatch
+from mcs_core.state import CampaignState
+from mcs_core.mcts import mcts_enemy_factory
+
+def assert_same_batch(a, b):
+    assert np.array_equal(a.ids, b.ids)
+    for name in CampaignBatch.ROW_FIELDS:
+        assert np.array_equal(a.field(name), b.field(name)), name
+
+def test_split_turn_plays_like_step():
+    stepped, split = CampaignBatch(64, rng=5), CampaignBatch(64, rng=5)
+    for _ in range(30):
+        stepped.step()
+        split.begin_turn()
+        split.battle()
+        assert_same_batch(stepped, split)
+
+def test_split_turn_plays_like_step_with_enemy_choices():
+    stepped, split = CampaignBatch(64, rng=5), CampaignBatch(64, rng=5)
+    choices = np.random.default_rng(0)
+    for _ in range(30):
+        avoid, feint = choices.random(stepped.n) < 0.5, choices.random(stepped.n) < 0.5
+        stepped.step(avoid, feint)
+        split.begin_turn()
+        split.battle(avoid, feint)
+        assert_same_batch(stepped, split)
+
+def test_mcts_with_fixed_iterations_is_reproducible():
+    runs = []
+    for _ in range(2):
+        engine = CampaignEngine(advisors=False, seed=7,
+                                enemy_ai_factory=mcts_enemy_factory(iterations=30, horizon=4, rollouts=8))
+        engine.start()
+        searches = []
+        for _ in range(6):
+            engine.step()
+            searches.append(engine.state.enemy_ai.last_search["visits"])
+        runs.append((list(engine.logs), searches))
+    assert runs[0] == runs[1]
+
+@pytest.mark.parametrize("era", [ANCIENT, MODERN.with_rules("modern_rules.json")], ids=["ancient", "custom_rules"])
+def test_mcts_rejects_eras_the_kernel_does_not_play(era):
+    with pytest.raises(ValueError, match="NumPy kernel"):
+        CampaignEngine(seed=1, era=era, enemy_ai_factory=mcts_enemy_factory(iterations=5))
+    with pytest.raises(ValueError, match="NumPy kernel"):
+        CampaignBatch.from_state(CampaignState(seed=1, era=era), 4)
@@ -0,0 +1,10 @@
+import numpy as np
+
+from mcs_core.optimize import evaluate_splits
+
+def test_identical_splits_score_identically_with_or_without_chunks():
+    splits = np.array([[40, 20, 10, 10, 10, 5, 5]] * 4, dtype=float)
+    whole = evaluate_splits(splits, 50, 20, np.random.SeedSequence(1))
+    chunked = evaluate_splits(splits, 50, 20, np.random.SeedSequence(1), max_rows=50)
+    assert len(set(whole.tolist())) == 1
+    assert whole.tolist() == chunked.tolist()
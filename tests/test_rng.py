@@ -0,0 +1,15 @@
+import numpy as np
+
+from mcs_core.rng import CampaignRNG
+
+def test_same_seed_sequence_gives_same_draws():
+    ss = np.random.SeedSequence(1234)
+    for kind in ("python", "numpy"):
+        a, b = CampaignRNG(ss, kind=kind), CampaignRNG(ss, kind=kind)
+        assert a.environment.random() == b.environment.random()
+        assert a.combat.random() == b.combat.random()
+
+def test_seeding_does_not_advance_the_callers_sequence():
+    ss = np.random.SeedSequence(1234)
+    CampaignRNG(ss)
+    assert ss.n_children_spawned == 0
@@ -0,0 +1,105 @@
+import json
+import random
+
+import pytest
+
+from mcs_core.army import Army
+from mcs_core.engine import CampaignEngine
+from mcs_core.eras import ANCIENT, MODERN
+from mcs_core.rules import RULES_DIR, WEATHER_CONDITIONS, DAY_NIGHT_CYCLE
+
+DIFFICULT = ["difficult", "entangling", "hemmed-in"]
+
+def old_modern_battle(state):
+    """resolve_battle of MCS_005 before the rule files."""
+    powers = []
+    for army in (state.units, state.enemy_units):
+        power = 0
+        for ut in army.values():
+            p = ut.attack * ut.count * (1 - state.fatigue * 0.5)
+            if ut.special.get("air_superiority"):
+                p *= 1.2
+            power += p
+        if state.current_terrain in DIFFICULT:
+            for ut in ["mechanized_infantry", "tank", "artillery"]:
+                power -= army[ut].attack * army[ut].count * 0.3
+        powers.append(max(0, int(power)))
+    return tuple(powers)
+
+def old_ancient_battle(state):
+    """resolve_battle of MCS_002 before the rule files."""
+    powers = []
+    for army, morale in ((state.units, state.morale), (state.enemy_units, state.enemy_morale)):
+        power = 0
+        for ut in army.values():
+            power += ut.attack * ut.count * (1 - state.fatigue * 0.5)
+        power *= 1 + morale * 0.3
+        if state.current_terrain in DIFFICULT:
+            for ut in ["cavalry", "archers"]:
+                power -= army[ut].attack * army[ut].count * 0.3
+        powers.append(max(0, int(power)))
+    return tuple(powers)
+
+# The modern tables fold air superiority into the attack weights, so the float sums are taken in
+# another order and a power can be truncated one unit apart (about 0.6% of random states)
+@pytest.mark.parametrize("era, old_battle, tolerance", [(MODERN, old_modern_battle, 1), (ANCIENT, old_ancient_battle, 0)],
+                         ids=["modern", "ancient"])
+def test_compiled_rules_play_the_old_battles(era, old_battle, tolerance):
+    engine = CampaignEngine(era=era, seed=1)
+    state = engine.state
+    rng = random.Random(2)
+    for _ in range(5000):
+        state.units = Army(era.roster, [rng.randint(0, 6000) for _ in era.roster.keys])
+        state.enemy_units = Army(era.enemy_roster, [rng.randint(0, 6000) for _ in era.roster.keys])
+        state.fatigue = rng.choice([0.0, 1.0, rng.random()])
+        state.morale, state.enemy_morale = rng.random(), rng.random()
+        state.current_terrain = rng.choice(era.terrain_types)
+        state.current_weather = rng.choice(WEATHER_CONDITIONS)
+        state.current_time = rng.choice(DAY_NIGHT_CYCLE)
+        new, old = engine.resolve_battle(), old_battle(state)
+        assert abs(new[0] - old[0]) <= tolerance and abs(new[1] - old[1]) <= tolerance, (new, old)
+
+def rule_file(tmp_path, changes):
+    with open(f"{RULES_DIR}/modern_rules.json") as f:
+        spec = json.load(f)
+    for key, value in changes.items():
+        if key == "terrains":
+            spec[key] = {**spec[key], **value} if value else {}  # new terrains, or none at all
+        else:
+            spec[key] = spec.get(key, []) + value
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(spec))
+    return str(path)
+
+@pytest.mark.parametrize("changes, message", [
+    ({"battle": [{"terrain": ["swamp"], "attack": 0.5}]}, "unknown terrain 'swamp'"),
+    ({"battle": [{"units": ["cavalry"], "attack": 1.1}]}, "unknown unit type 'cavalry'"),
+    ({"environment": [{"weather": ["snowy"], "fatigue": 0.1}]}, "unknown weather 'snowy'"),
+    ({"terrains": {}}, "no terrains"),
+], ids=["terrain", "unit", "weather", "empty"])
+def test_unknown_names_in_a_rule_file_are_rejected(tmp_path, changes, message):
+    with pytest.raises(ValueError, match=message):
+        MODERN.with_rules(rule_file(tmp_path, changes))
+
+def test_a_new_terrain_plays_through_the_engine(tmp_path):
+    era = MODERN.with_rules(rule_file(tmp_path, {
+        "terrains": {"jungle": {"passability": 0.4}},
+        "battle": [{"terrain": ["jungle"], "units": ["tank"], "attack_lost": 0.5}],
+    }))
+    assert era.terrain_types[-1] == "jungle"
+    engine = CampaignEngine(era=era, seed=3)
+    engine.start()
+    state = engine.state
+    state.current_terrain = "jungle"
+    # Half the tanks' attack is lost in the jungle
+    tank = era.roster.index["tank"]
+    player_power, _ = engine.resolve_battle()
+    tanks = state.units.counts[tank] * era.roster.attack[tank]
+    engine.state.units.set_count(tank, 0)
+    assert abs(player_power - engine.resolve_battle()[0] - tanks * 0.5) <= 1
+    engine.state.units.set_count(tank, 500)
+    for _ in range(20):
+        engine.step()
+    assert engine.turn == 20 or engine.finished
+    terrains = set(engine.sim_data.labels("terrain"))
+    assert "jungle" in terrains and terrains <= set(era.terrain_types)
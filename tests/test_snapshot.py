@@ -0,0 +1,52 @@
+import io
+
+import numpy as np
+import pytest
+
+from mcs_core.engine import CampaignEngine
+from mcs_core.eras import ANCIENT, MODERN
+from mcs_core.rng import CampaignRNG
+from mcs_core.snapshot import capture, restore, save_snapshot, load_snapshot
+from mcs_core.state import CampaignState
+
+def played(era, turns, seed=7):
+    engine = CampaignEngine(seed=seed, era=era)
+    engine.start()
+    for _ in range(turns):
+        engine.step()
+    return engine
+
+@pytest.mark.parametrize("era", [MODERN, ANCIENT], ids=lambda era: era.name)
+def test_loaded_campaign_continues_like_the_saved_one(era):
+    engine = played(era, 4)
+    file = io.BytesIO()
+    save_snapshot(engine, file)
+    file.seek(0)
+    loaded = load_snapshot(file)
+    assert loaded.era is era
+    assert list(loaded.logs) == list(engine.logs)
+    for e in (engine, loaded):
+        for _ in range(6):
+            e.step()
+    assert list(loaded.logs) == list(engine.logs)
+    assert list(loaded.state.units.counts) == list(engine.state.units.counts)
+    assert list(loaded.state.enemy_units.counts) == list(engine.state.enemy_units.counts)
+    assert np.array_equal(loaded.sim_data.columns["forces_total"][:len(loaded.sim_data)],
+                          engine.sim_data.columns["forces_total"][:len(engine.sim_data)])
+
+def test_loading_into_another_era_is_rejected():
+    header, arrays = capture(played(MODERN, 2))
+    with pytest.raises(ValueError, match="era"):
+        restore(CampaignEngine(era=ANCIENT), header, arrays)
+
+def test_loading_another_roster_is_rejected():
+    header, arrays = capture(played(MODERN, 2))
+    header["roster"][0] = header["roster"][0][::-1]
+    with pytest.raises(ValueError, match="unit types"):
+        restore(CampaignEngine(), header, arrays)
+
+def test_loading_another_rng_kind_is_rejected():
+    header, arrays = capture(played(MODERN, 2))
+    engine = CampaignEngine(state=CampaignState(rng=CampaignRNG(1, kind="numpy")))
+    with pytest.raises(ValueError, match="kind"):
+        restore(engine, header, arrays)
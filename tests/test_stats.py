@@ -0,0 +1,38 @@
+import numpy as np
+
+from mcs_core.stats import StreamingStats
+
+def test_percentiles_interpolate_inside_the_bin():
+    values = np.random.default_rng(3).uniform(100, 900, 20000)
+    stats = StreamingStats(1, 0, 1000, bins=32)
+    stats.add(0, values)
+    width = 1000 / 32
+    for q in (5, 25, 50, 75, 95):
+        assert abs(stats.percentile(q)[0] - np.percentile(values, q)) < width / 4
+
+def test_observations_at_the_minimum_are_reported_exactly():
+    # A third of the armies destroyed, the others spread over the first bin and beyond
+    values = np.r_[np.zeros(1000), np.random.default_rng(4).integers(1, 3000, 2000)]
+    stats = StreamingStats(1, 0, 3000, bins=100, discrete=True)
+    stats.add(0, values)
+    assert stats.percentile(5)[0] == stats.percentile(30)[0] == 0
+    assert 0 < stats.percentile(40)[0] < 3000
+
+def test_merged_shards_give_the_same_percentiles():
+    values = np.random.default_rng(5).normal(500, 150, (3000, 4)).clip(0, 1000)
+    whole = StreamingStats(4, 0, 1000)
+    whole.update(values)
+    merged = StreamingStats(4, 0, 1000)
+    for block in np.array_split(values, 5):
+        shard = StreamingStats(4, 0, 1000)
+        shard.update(block)
+        merged.merge(shard)
+    for q in (5, 50, 95):
+        assert np.allclose(whole.percentile(q), merged.percentile(q))
+
+def test_discrete_series_with_unit_bins_report_observed_values():
+    lengths = np.random.default_rng(6).integers(1, 51, 500)
+    stats = StreamingStats(1, 0, 51, bins=51, discrete=True)
+    stats.add(0, lengths)
+    for q in (5, 50, 95):
+        assert stats.percentile(q)[0] in set(lengths.tolist())
@@ -0,0 +1,59 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from mcs_core.territory import TerritoryGrid
+
+def groups(grid, side):
+    """{frozenset of sectors: group id} of one side (ids differ between incremental and rebuilt boards)."""
+    labels = grid.labels[side]
+    return {frozenset(np.flatnonzero(labels == g).tolist()): g for g in np.unique(labels[labels >= 0]).tolist()}
+
+def assert_same_analysis(grid, rebuilt):
+    for side in (0, 1):
+        assert np.array_equal(grid.masks[side], rebuilt.masks[side])
+        assert set(groups(grid, side)) == set(groups(rebuilt, side))
+        assert {frozenset(c) for c in grid.members[side].values()} == set(groups(rebuilt, side))
+        assert np.array_equal(grid.front[side], rebuilt.front[side])
+    ours, theirs = groups(grid, 1), groups(rebuilt, 1)
+    assert {cells: grid.liberties[g] for cells, g in ours.items()} == {cells: rebuilt.liberties[g] for cells, g in theirs.items()}
+    assert np.allclose(grid.influence_map, rebuilt.influence_map)
+    assert grid.contact_cells == rebuilt.contact_cells
+    assert grid.frontier_cells == rebuilt.frontier_cells
+    assert grid.weak_cells == rebuilt.weak_cells
+    assert grid.territory == rebuilt.territory
+
+@pytest.mark.parametrize("size, options, seeds", [
+    (12, {"incremental_from": 0}, 8),  # the Go advisor's board, which rebuilds by default
+    (48, {"incremental_from": 0}, 4),
+    (80, {}, 2),  # large enough to be incremental by default
+], ids=["12x12", "48x48", "80x80"])
+def test_incremental_analysis_matches_rebuild(monkeypatch, size, options, seeds):
+    rebuilds = []
+    rebuild = TerritoryGrid.rebuild
+    monkeypatch.setattr(TerritoryGrid, "rebuild", lambda grid: (rebuilds.append(grid), rebuild(grid))[1])
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        grid = TerritoryGrid(size, size, rng=rng, **options)
+        player, enemy = rng.randint(2000, 20000), rng.randint(2000, 20000)
+        for _ in range(40):
+            # Mostly losses, sometimes recruits
+            player = max(0, int(player * rng.uniform(0.85, 1.05)))
+            enemy = max(0, int(enemy * rng.uniform(0.85, 1.05)))
+            grid.update(player, enemy)
+            rebuilt = copy.deepcopy(grid)
+            rebuilt.rebuild()
+            assert_same_analysis(grid, rebuilt)
+        # Only the deployment rebuilt the board
+        assert sum(g is grid for g in rebuilds) == 1
+
+def test_small_boards_are_rebuilt_every_turn(monkeypatch):
+    rebuilds = []
+    rebuild = TerritoryGrid.rebuild
+    monkeypatch.setattr(TerritoryGrid, "rebuild", lambda grid: (rebuilds.append(grid), rebuild(grid))[1])
+    grid = TerritoryGrid(rng=random.Random(1))
+    for turn in range(10):
+        grid.update(10000 - 300 * turn, 9000 - 200 * turn)
+    assert len(rebuilds) == 10